@@ -0,0 +1,196 @@
+import copy
+import asyncio
+from functools import partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from DriverRep import DriverRep
+from DriverRepDB import DriverRepDB
+
+
+# Общая основа асинхронных фасадов: вызовы репозитория выполняются в собственном
+# ограниченном пуле потоков, а одинаковые одновременные чтения объединяются в один вызов.
+# Присоединившиеся к чужому вызову получают собственную копию результата, поэтому
+# изменение полученного объекта Driver одним вызывающим не видно другим.
+# Обходы (см. _iterate) выполняются в отдельном наборе из max_iterations однопоточных
+# исполнителей: одновременных обходов не больше max_iterations, остальные ждут свободного.
+class _AsyncRepository:
+    def __init__(self, repository, max_workers, thread_name_prefix, max_iterations=None):
+        self._repository = repository
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._in_flight = {}  # (метод, аргументы) -> выполняющийся future
+        self._iteration_executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'{thread_name_prefix}-iter')
+            for _ in range(max_iterations or max_workers)
+        ]
+        self._free_iteration_executors = asyncio.Queue()
+        for executor in self._iteration_executors:
+            self._free_iteration_executors.put_nowait(executor)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.close()
+
+    # Остановить пулы потоков (дождавшись начатых вызовов)
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for executor in self._iteration_executors:
+            executor.shutdown(wait=True)
+
+    def _run(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(getattr(self._repository, method), *args))
+
+    # Чтение: если такой же вызов уже выполняется, ждём его результат
+    async def _read(self, method, *args):
+        key = (method, args)
+        future = self._in_flight.get(key)
+        joined = future is not None
+        if not joined:
+            future = self._run(method, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(partial(self._forget, key))
+        # shield: отмена одного из ожидающих не отменяет общий вызов
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result) if joined else result
+
+    def _forget(self, key, future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    # Запись: чтения, начатые до неё, больше не объединяются с новыми
+    async def _write(self, method, *args):
+        self._in_flight.clear()
+        return await self._run(method, *args)
+
+    # Асинхронный обход синхронного генератора порциями. Генератор держит курсор подключения
+    # своего потока (см. DatabaseConnection), поэтому весь обход, включая закрытие генератора,
+    # идёт в одном потоке: обход занимает однопоточный исполнитель до своего конца.
+    # Брошенный обход (break в async for) закрывает генератор при закрытии асинхронного итератора.
+    async def _iterate(self, iterator, batch_size):
+        loop = asyncio.get_running_loop()
+        executor = await self._free_iteration_executors.get()
+        try:
+            while True:
+                batch = await loop.run_in_executor(executor, lambda: list(islice(iterator, batch_size)))
+                if not batch:
+                    return
+                for item in batch:
+                    yield item
+        finally:
+            try:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    await asyncio.shield(loop.run_in_executor(executor, close))
+            finally:
+                self._free_iteration_executors.put_nowait(executor)
+
+
+# Асинхронный фасад DriverRepDB. Подключения к базе у каждого потока пула свои
+# (см. DatabaseConnection), поэтому чтения выполняются параллельно.
+class AsyncDriverRepDB(_AsyncRepository):
+    def __init__(self, driver_rep_db: DriverRepDB, max_workers=4, max_iterations=None):
+        super(AsyncDriverRepDB, self).__init__(driver_rep_db, max_workers, 'driver-rep-db', max_iterations)
+
+    async def get_by_id(self, driver_id):
+        return await self._read('get_by_id', driver_id)
+
+    async def get_k_n_short_list(self, k, n):
+        return await self._read('get_k_n_short_list', k, n)
+
+    async def get_short_list_page(self, n, token=None, order_by='driver_id'):
+        return await self._read('get_short_list_page', n, token, order_by)
+
+    async def get_count(self):
+        return await self._read('get_count')
+
+    async def search(self, query, limit=20):
+        return await self._read('search', query, limit)
+
+    async def get_by_license_plate(self, license_plate):
+        return await self._read('get_by_license_plate', license_plate)
+
+    async def get_by_driver_license(self, driver_license):
+        return await self._read('get_by_driver_license', driver_license)
+
+    async def get_by_insurance_policy(self, insurance_policy):
+        return await self._read('get_by_insurance_policy', insurance_policy)
+
+    # Асинхронный итератор (async for); аргументы проверяются сразу при вызове
+    def iter_drivers(self, where=None, order_by='driver_id', batch_size=1000, as_tuples=False):
+        iterator = self._repository.iter_drivers(where, order_by, batch_size, as_tuples)
+        return self._iterate(iterator, batch_size)
+
+    async def add_driver(self, driver):
+        return await self._write('add_driver', driver)
+
+    async def update_driver(self, driver_id, new_driver):
+        return await self._write('update_driver', driver_id, new_driver)
+
+    async def delete_driver(self, driver_id):
+        return await self._write('delete_driver', driver_id)
+
+    async def add_many(self, drivers, chunk_size=1000, commit_every_chunk=False):
+        return await self._write('add_many', drivers, chunk_size, commit_every_chunk)
+
+    async def update_many(self, updates, chunk_size=1000, commit_every_chunk=False):
+        return await self._write('update_many', updates, chunk_size, commit_every_chunk)
+
+    async def delete_many(self, driver_ids, chunk_size=1000, commit_every_chunk=False):
+        return await self._write('delete_many', driver_ids, chunk_size, commit_every_chunk)
+
+
+# Асинхронный фасад DriverRep. Сам DriverRep не потокобезопасен, поэтому по умолчанию
+# все вызовы выполняются по очереди в одном потоке, не блокируя цикл событий.
+class AsyncDriverRep(_AsyncRepository):
+    def __init__(self, driver_rep: DriverRep, max_workers=1):
+        super(AsyncDriverRep, self).__init__(driver_rep, max_workers, 'driver-rep')
+
+    async def get_by_id(self, driver_id):
+        return await self._read('get_by_id', driver_id)
+
+    async def get_k_n_short_list(self, k, n):
+        return await self._read('get_k_n_short_list', k, n)
+
+    async def get_range(self, field, low=None, high=None):
+        return await self._read('get_range', field, low, high)
+
+    async def get_k_n_sorted_short_list(self, field, k, n, low=None, high=None, reverse=False):
+        return await self._read('get_k_n_sorted_short_list', field, k, n, low, high, reverse)
+
+    async def get_count(self):
+        return await self._read('get_count')
+
+    async def search(self, query, limit=20):
+        return await self._read('search', query, limit)
+
+    async def get_by_license_plate(self, license_plate):
+        return await self._read('get_by_license_plate', license_plate)
+
+    async def get_by_driver_license(self, driver_license):
+        return await self._read('get_by_driver_license', driver_license)
+
+    async def get_by_insurance_policy(self, insurance_policy):
+        return await self._read('get_by_insurance_policy', insurance_policy)
+
+    async def sort_by_field(self, field):
+        return await self._write('sort_by_field', field)
+
+    async def create_index(self, field):
+        return await self._write('create_index', field)
+
+    async def drop_index(self, field):
+        return await self._write('drop_index', field)
+
+    async def add_driver(self, driver):
+        return await self._write('add_driver', driver)
+
+    async def update_driver(self, driver_id, new_driver):
+        return await self._write('update_driver', driver_id, new_driver)
+
+    async def delete_driver(self, driver_id):
+        return await self._write('delete_driver', driver_id)
+
+    async def compact(self):
+        return await self._write('compact')
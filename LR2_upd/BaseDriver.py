@@ -1,6 +1,9 @@
 import re
 
 class BaseDriver:
+    # Поля хранятся в слотах, без __dict__ у каждого экземпляра
+    __slots__ = ('__driver_id', '__last_name', '__first_name', '__patronymic', '__experience')
+
     def __init__(self, driver_id, last_name, first_name, patronymic, experience):
         self.__driver_id = None
         self.set_driver_id(driver_id)
@@ -9,11 +12,67 @@ class BaseDriver:
         self.set_patronymic(patronymic)
         self.set_experience(experience)
 
+    # Заполнение полей без проверки (для данных, уже проверенных при сохранении)
+    def _assign_trusted(self, driver_id, last_name, first_name, patronymic, experience):
+        self.__driver_id = driver_id
+        self.__last_name = last_name
+        self.__first_name = first_name
+        self.__patronymic = patronymic
+        self.__experience = experience
+
+    # Поля для пакетной проверки: поле -> (метод валидации, сообщение об ошибке).
+    # PATTERN_FIELDS: поле -> скомпилированный шаблон, которым столбец строк проверяется целиком.
+    FIELD_VALIDATORS = {
+        'driver_id': ('validate_driver_id', "ID должно быть положительным числом."),
+        'last_name': ('validate_last_name', "Строка не может быть пустой."),
+        'first_name': ('validate_first_name', "Строка не может быть пустой."),
+        'patronymic': ('validate_patronymic', "Строка не может быть пустой."),
+        'experience': ('validate_experience', "Стаж не может быть меньше 0."),
+    }
+    OPTIONAL_FIELDS = ('driver_id',)
+    PATTERN_FIELDS = {}
+
     # Общий метод валидации
     @staticmethod
     def validate(value, validation_function):
         return validation_function(value)
 
+    # Пакетная проверка записей (словарей) по столбцам, без создания объектов.
+    # Возвращает отчёт {номер записи: {поле: сообщение об ошибке}} только для некорректных записей.
+    @classmethod
+    def validate_many(cls, records):
+        report = {}
+        rows = []
+        for row, record in enumerate(records):
+            if isinstance(record, dict):
+                rows.append((row, record))
+            else:
+                report[row] = {'record': "Запись должна быть словарём."}
+        missing = object()
+        for field, (validator_name, message) in cls.FIELD_VALIDATORS.items():
+            validator = getattr(cls, validator_name)
+            optional = field in cls.OPTIONAL_FIELDS
+            column = [record.get(field, missing) for _, record in rows]
+            # Столбец проверяется одним проходом; отчёт строится только для ошибок
+            pattern = cls.PATTERN_FIELDS.get(field)
+            try:
+                if pattern is None:
+                    raise TypeError
+                bad = [i for i, match in enumerate(map(pattern.fullmatch, column)) if match is None]
+            except TypeError:  # В столбце есть не строки - проверяем по одному значению
+                bad = [i for i, value in enumerate(column)
+                       if not (optional and value is None) and (value is missing or not validator(value))]
+            for i in bad:
+                value = column[i]
+                if value is missing:
+                    if optional:
+                        continue
+                    error = f"Отсутствует обязательный ключ: '{field}'."
+                else:
+                    error = message.format(value)
+                report.setdefault(rows[i][0], {})[field] = error
+        return report
+
     # Статические методы валидации
     @staticmethod
     def validate_driver_id(driver_id):
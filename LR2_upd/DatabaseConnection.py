@@ -1,20 +1,75 @@
+import os
 import sqlite3
+import threading
 
-# Класс для управления подключением к базе данных (Singleton)
+# Пул подключений к базам данных SQLite.
+# Для каждого файла базы создаётся свой пул (можно работать с несколькими базами сразу),
+# а каждый поток получает собственное подключение, поэтому читатели не ждут друг друга.
+# Подключения завершившихся потоков переиспользуются новыми потоками.
+# Для ':memory:' у каждого потока получается отдельная база в памяти.
 class DatabaseConnection:
-    _instance = None
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # Настройки каждого нового подключения
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",       # Читатели не блокируются писателем
+        "PRAGMA synchronous=NORMAL",     # В режиме WAL безопасно и без fsync на каждую транзакцию
+        "PRAGMA cache_size=-16000",      # Кэш страниц ~16 МБ
+        "PRAGMA mmap_size=268435456",    # Чтение через mmap до 256 МБ
+        "PRAGMA busy_timeout=5000",      # Ожидание блокировки вместо немедленной ошибки
+    )
 
     def __new__(cls, db_path):
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            cls._instance._initialize(db_path)
-        return cls._instance
+        key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = super(DatabaseConnection, cls).__new__(cls)
+                pool._initialize(db_path, key)
+                cls._pools[key] = pool
+        return pool
 
-    # Инициализация подключения
-    def _initialize(self, db_path):
+    # Инициализация пула
+    def _initialize(self, db_path, key):
         self.db_path = db_path
-        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.connection.row_factory = sqlite3.Row
+        self._key = key
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owners = {}  # поток -> его подключение
+
+    # Открывает новое подключение с настройками PRAGMAS
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    # Выдаёт потоку подключение: свободное (от завершившегося потока) или новое
+    def _checkout(self):
+        current = threading.current_thread()
+        with self._lock:
+            for thread, connection in list(self._owners.items()):
+                if not thread.is_alive():
+                    del self._owners[thread]
+                    if connection.in_transaction:
+                        connection.rollback()
+                    self._owners[current] = connection
+                    return connection
+        connection = self._connect()
+        with self._lock:
+            self._owners[current] = connection
+        return connection
+
+    # Подключение текущего потока
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._checkout()
+            self._local.connection = connection
+        return connection
 
     # Возвращает курсор для выполнения SQL-запросов
     def get_cursor(self):
@@ -24,10 +79,38 @@ class DatabaseConnection:
     def commit(self):
         self.connection.commit()
 
-    # Закрывает соединение с базой данных и сбрасывает экземпляр класса.
+    # Отменяет незафиксированные изменения
+    def rollback(self):
+        self.connection.rollback()
+
+    # Начинает транзакцию с блокировкой записи (BEGIN IMMEDIATE). Если на подключении потока
+    # осталась незавершённая транзакция (её изменения никому не подтверждались фиксацией),
+    # она откатывается: иначе BEGIN завершился бы ошибкой, а блокировка оставалась бы у потока.
+    def begin_immediate(self):
+        connection = self.connection
+        if connection.in_transaction:
+            connection.rollback()
+        connection.execute("BEGIN IMMEDIATE")
+
+    # Закрывает все подключения пула и удаляет пул
     def close(self):
-        self.connection.close()
-        DatabaseConnection._instance = None
+        with self._lock:
+            connections = list(self._owners.values())
+            self._owners.clear()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+        with DatabaseConnection._pools_lock:
+            if DatabaseConnection._pools.get(self._key) is self:
+                del DatabaseConnection._pools[self._key]
+
+    # Закрывает пулы всех баз данных
+    @classmethod
+    def close_all(cls):
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close()
     
     # Проверяет, существует ли таблица в базе данных
     def table_exists(self, table_name):
@@ -59,6 +142,9 @@ class DatabaseConnection:
                     license_plate TEXT NOT NULL
                 );
             """)
+            # Госномер, удостоверение и полис не повторяются (индексы те же, что создаёт DriverRepDB)
+            for field in ('license_plate', 'driver_license', 'insurance_policy'):
+                cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_drivers_{field} ON drivers ({field})")
             self.commit()
             print("Таблица 'drivers' успешно создана.")
         else:
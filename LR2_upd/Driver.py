@@ -2,7 +2,19 @@ import re
 import json
 from BaseDriver import BaseDriver
 
+# Шаблоны проверки полей компилируются один раз при импорте
+PHONE_NUMBER_PATTERN = re.compile(r'((8|\+7)[\- ]?)?(\(?\d{3}\)?[\- ]?)?[\d\- ]{7,10}')
+BIRTHDAY_PATTERN = re.compile(r'\d{2}\.\d{2}\.\d{4}')
+DOCUMENT_NUMBER_PATTERN = re.compile(r"^\d{2} \d{2} \d{6}$")
+INSURANCE_POLICY_PATTERN = re.compile(r"^\d{3} \d{12}$")
+LICENSE_PLATE_PATTERN = re.compile(r"^[А-Я]{1}\d{3}[А-Я]{2}\s?\d{2,3}$")
+
 class Driver(BaseDriver):
+    __slots__ = (
+        '__phone_number', '__birthday', '__driver_license',
+        '__vehicle_title', '__insurance_policy', '__license_plate',
+    )
+
     def __init__(self, last_name, first_name, patronymic, experience, phone_number, birthday, driver_license, vehicle_title, insurance_policy, license_plate, driver_id = None):
         super(Driver, self).__init__(driver_id=driver_id, last_name=last_name, first_name=first_name, patronymic=patronymic, experience=experience)
         self.set_phone_number(phone_number) # Номер телефона
@@ -17,7 +29,15 @@ class Driver(BaseDriver):
     def from_json(cls, data_json):
         try:
             data = json.loads(data_json)
-            return Driver(
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Ошибка синтаксиса JSON: {e}")
+        return cls.from_dict(data)
+
+    # Классовый метод создания водителя из словаря (без промежуточного JSON)
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            return cls(
                 driver_id=data.get('driver_id'),
                 last_name=data['last_name'],
                 first_name=data['first_name'],
@@ -33,45 +53,94 @@ class Driver(BaseDriver):
             )
         except KeyError as e:
             raise ValueError(f"Отсутствует обязательный ключ в JSON: {e}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Ошибка синтаксиса JSON: {e}")
         except Exception as e:
             raise ValueError(f"Некорректные данные в JSON: {e}")
 
+    # Классовый метод создания водителя из строки таблицы drivers (порядок столбцов таблицы)
+    # без повторной проверки: данные уже были проверены при записи в хранилище
+    @classmethod
+    def from_row(cls, row):
+        driver = cls.__new__(cls)
+        driver._assign_trusted(*row)
+        return driver
+
+    # Классовый метод создания водителя из словаря собственного хранилища без повторной проверки
+    @classmethod
+    def from_trusted_dict(cls, data):
+        try:
+            return cls.from_row((
+                data.get('driver_id'), data['last_name'], data['first_name'], data['patronymic'],
+                data['experience'], data['phone_number'], data['birthday'], data['driver_license'],
+                data['vehicle_title'], data['insurance_policy'], data['license_plate'],
+            ))
+        except KeyError as e:
+            raise ValueError(f"Отсутствует обязательный ключ в JSON: {e}")
+        except Exception as e:
+            raise ValueError(f"Некорректные данные в JSON: {e}")
+
+    def _assign_trusted(self, driver_id, last_name, first_name, patronymic, experience, phone_number, birthday,
+                        driver_license, vehicle_title, insurance_policy, license_plate):
+        super(Driver, self)._assign_trusted(driver_id, last_name, first_name, patronymic, experience)
+        self.__phone_number = phone_number
+        self.__birthday = birthday
+        self.__driver_license = driver_license
+        self.__vehicle_title = vehicle_title
+        self.__insurance_policy = insurance_policy
+        self.__license_plate = license_plate
+
+    # Поля для пакетной проверки: поле -> (метод валидации, сообщение об ошибке)
+    FIELD_VALIDATORS = {
+        **BaseDriver.FIELD_VALIDATORS,
+        'phone_number': ('validate_phone_number', "Номер телефона '{}' некорректен."),
+        'birthday': ('validate_birthday', "{} должна быть в формате 'ДД.ММ.ГГГГ'."),
+        'driver_license': ('validate_driver_license', "{} должен быть в формате 'XX XX XXXXXX'."),
+        'vehicle_title': ('validate_vehicle_title', "{} должен быть в формате 'XX XX XXXXXX'."),
+        'insurance_policy': ('validate_insurance_policy', "{} должен быть в формате 'XXX XXXXXXXXXXXX'."),
+        'license_plate': ('validate_license_plate', "{} должен быть в формате 'Х111ХХ 111'."),
+    }
+    PATTERN_FIELDS = {
+        'phone_number': PHONE_NUMBER_PATTERN,
+        'birthday': BIRTHDAY_PATTERN,
+        'driver_license': DOCUMENT_NUMBER_PATTERN,
+        'vehicle_title': DOCUMENT_NUMBER_PATTERN,
+        'insurance_policy': INSURANCE_POLICY_PATTERN,
+        'license_plate': LICENSE_PLATE_PATTERN,
+    }
+
     # Статические методы валидации
     @staticmethod
     def validate_phone_number(phone_number):
-        if not isinstance(phone_number, str) or not re.fullmatch(r'((8|\+7)[\- ]?)?(\(?\d{3}\)?[\- ]?)?[\d\- ]{7,10}', phone_number):
+        if not isinstance(phone_number, str) or not PHONE_NUMBER_PATTERN.fullmatch(phone_number):
             return False
         return True
 
     @staticmethod
     def validate_birthday(birthday):
-        if not isinstance(birthday, str) or not re.fullmatch(r'\d{2}\.\d{2}\.\d{4}', birthday):
+        if not isinstance(birthday, str) or not BIRTHDAY_PATTERN.fullmatch(birthday):
             return False
         return True
 
     @staticmethod
     def validate_driver_license(driver_license):
-        if not isinstance(driver_license, str) or not re.fullmatch(r"^\d{2} \d{2} \d{6}$", driver_license):
+        if not isinstance(driver_license, str) or not DOCUMENT_NUMBER_PATTERN.fullmatch(driver_license):
             return False
         return True
 
     @staticmethod
     def validate_vehicle_title(vehicle_title):
-        if not isinstance(vehicle_title, str) or not re.fullmatch(r"^\d{2} \d{2} \d{6}$", vehicle_title):
+        if not isinstance(vehicle_title, str) or not DOCUMENT_NUMBER_PATTERN.fullmatch(vehicle_title):
             return False
         return True
 
     @staticmethod
     def validate_insurance_policy(insurance_policy):
-        if not isinstance(insurance_policy, str) or not re.fullmatch(r"^\d{3} \d{12}$", insurance_policy):
+        if not isinstance(insurance_policy, str) or not INSURANCE_POLICY_PATTERN.fullmatch(insurance_policy):
             return False
         return True
 
     @staticmethod
     def validate_license_plate(license_plate):
-        if not isinstance(license_plate, str) or not re.fullmatch(r"^[А-Я]{1}\d{3}[А-Я]{2}\s?\d{2,3}$", license_plate):
+        if not isinstance(license_plate, str) or not LICENSE_PLATE_PATTERN.fullmatch(license_plate):
             return False
         return True
 
@@ -91,6 +160,23 @@ class Driver(BaseDriver):
             
         )
 
+    # Представление объекта в виде словаря (формат хранения в файлах)
+    def to_dict(self):
+        return {
+            'driver_id': self.get_driver_id(),
+            'last_name': self.get_last_name(),
+            'first_name': self.get_first_name(),
+            'patronymic': self.get_patronymic(),
+            'experience': self.get_experience(),
+
+            'phone_number': self.get_phone_number(),
+            'birthday': self.get_birthday(),
+            'driver_license': self.get_driver_license(),
+            'vehicle_title': self.get_vehicle_title(),
+            'insurance_policy': self.get_insurance_policy(),
+            'license_plate': self.get_license_plate(),
+        }
+
     # Вывод краткой версии объекта
     @property
     def short_version(self):
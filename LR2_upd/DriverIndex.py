@@ -0,0 +1,253 @@
+import re
+import heapq
+from bisect import bisect_left, bisect_right, insort
+
+
+# Преобразование значения поля в ключ сортировки.
+# Дата рождения хранится как 'ДД.ММ.ГГГГ' и сравнивается хронологически.
+def _birthday_key(birthday):
+    day, month, year = birthday.split('.')
+    return year, month, day
+
+
+INDEX_KEYS = {
+    'birthday': _birthday_key,
+}
+
+
+# Отсортированный вторичный индекс по полю Driver: список пар (ключ, driver_id),
+# поддерживаемый бисекцией при каждом добавлении, изменении и удалении
+class SortedIndex:
+    def __init__(self, field):
+        self.field = field
+        self._getter = f'get_{field}'
+        self._key = INDEX_KEYS.get(field, lambda value: value)
+        self._entries = []
+        self._by_id = {}  # driver_id -> запись индекса, чтобы удалять без пересчёта ключа
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, driver):
+        return self._key(getattr(driver, self._getter)()), driver.get_driver_id()
+
+    # Построить индекс за один проход по парам (driver_id, значение поля)
+    def build(self, items):
+        self._by_id = {driver_id: (self._key(value), driver_id) for driver_id, value in items}
+        self._entries = sorted(self._by_id.values())
+
+    def add(self, driver):
+        entry = self._entry(driver)
+        self._by_id[driver.get_driver_id()] = entry
+        insort(self._entries, entry)
+
+    def remove(self, driver_id):
+        entry = self._by_id.pop(driver_id, None)
+        if entry is None:
+            return
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    # ID водителей в порядке поля, значение которого лежит в [low, high] (границы включительно).
+    # start/stop задают срез внутри найденного диапазона.
+    def ids_in_range(self, low=None, high=None, start=0, stop=None, reverse=False):
+        lo = 0 if low is None else bisect_left(self._entries, (self._key(low),))
+        hi = len(self._entries) if high is None else bisect_right(self._entries, (self._key(high), float('inf')))
+        if reverse:
+            first = lo if stop is None else max(lo, hi - stop)
+            return [driver_id for _, driver_id in reversed(self._entries[first:max(first, hi - start)])]
+        last = hi if stop is None else min(hi, lo + stop)
+        return [driver_id for _, driver_id in self._entries[lo + start:last]]
+
+
+# Поля ФИО, по которым ведётся поиск
+NAME_FIELDS = ('last_name', 'first_name', 'patronymic')
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+# Слова строки для поиска: без учёта регистра, «ё» равна «е»
+def name_tokens(text):
+    return [token.casefold().replace('ё', 'е') for token in TOKEN_PATTERN.findall(text)]
+
+
+# Индекс поиска по началу слов фамилии, имени и отчества: отсортированный список ключей
+# (слово, номер поля) и для каждого ключа - отсортированный список ID водителей. Все слова
+# с заданным началом идут в списке ключей подряд, а их списки ID сливаются в порядке возрастания.
+# Ранжирование (как в DriverRepDB.search): сначала водители, у которых первое слово запроса -
+# фамилия целиком, затем - начало фамилии, затем остальные; при равенстве - по ID.
+class NameIndex:
+    def __init__(self):
+        self._keys = []
+        self._ids = {}  # (слово, номер поля) -> отсортированные ID
+        self._words = {}  # driver_id -> кортежи слов по полям
+
+    def __len__(self):
+        return len(self._words)
+
+    # Построить индекс за один проход; fields - {поле: пары (driver_id, значение)} для NAME_FIELDS
+    def build(self, fields):
+        tokens = {}  # Одинаковые имена разбираются на слова один раз
+        words = {}
+        for field_no, field in enumerate(NAME_FIELDS):
+            for driver_id, value in fields[field]:
+                field_words = tokens.get(value)
+                if field_words is None:
+                    field_words = tokens[value] = tuple(set(name_tokens(value)))
+                words.setdefault(driver_id, [()] * len(NAME_FIELDS))[field_no] = field_words
+        self._ids = {}
+        for driver_id, field_words in words.items():
+            for field_no, word_list in enumerate(field_words):
+                for word in word_list:
+                    self._ids.setdefault((word, field_no), []).append(driver_id)
+        for ids in self._ids.values():
+            ids.sort()
+        self._keys = sorted(self._ids)
+        self._words = {driver_id: tuple(field_words) for driver_id, field_words in words.items()}
+
+    def add(self, driver):
+        driver_id = driver.get_driver_id()
+        names = (driver.get_last_name(), driver.get_first_name(), driver.get_patronymic())
+        self._words[driver_id] = tuple(tuple(set(name_tokens(name))) for name in names)
+        for field_no, word_list in enumerate(self._words[driver_id]):
+            for word in word_list:
+                ids = self._ids.get((word, field_no))
+                if ids is None:
+                    insort(self._keys, (word, field_no))
+                    self._ids[(word, field_no)] = [driver_id]
+                else:
+                    insort(ids, driver_id)
+
+    def remove(self, driver_id):
+        for field_no, word_list in enumerate(self._words.pop(driver_id, ())):
+            for word in word_list:
+                ids = self._ids[(word, field_no)]
+                del ids[bisect_left(ids, driver_id)]
+                if not ids:
+                    del self._ids[(word, field_no)]
+                    del self._keys[bisect_left(self._keys, (word, field_no))]
+
+    # Списки ID для слов, начинающихся с token (exact - только само слово), в поле field_no или во всех
+    def _runs(self, token, field_no=None, exact=False):
+        runs = []
+        i = bisect_left(self._keys, (token,))
+        while i < len(self._keys) and self._keys[i][0].startswith(token):
+            word, key_field = self._keys[i]
+            if (not exact or word == token) and (field_no is None or key_field == field_no):
+                runs.append(self._ids[self._keys[i]])
+            i += 1
+        return runs
+
+    def _has_prefix(self, driver_id, token):
+        return any(word.startswith(token) for word_list in self._words[driver_id] for word in word_list)
+
+    # Ступень ранжирования водителя по первому слову запроса
+    def _tier(self, driver_id, first):
+        last_name_words = self._words[driver_id][0]
+        if first in last_name_words:
+            return 0
+        return 1 if any(word.startswith(first) for word in last_name_words) else 2
+
+    # ID не более limit водителей, у которых каждое слово запроса является началом
+    # какого-либо слова ФИО, в порядке ранжирования
+    def search(self, query, limit=20):
+        if limit <= 0:
+            raise ValueError("Число результатов поиска должно быть положительным.")
+        tokens = name_tokens(query)
+        if not tokens:
+            return []
+        first, others = tokens[0], set(tokens[1:])
+
+        def matches(driver_id):
+            return all(self._has_prefix(driver_id, token) for token in others)
+
+        # Обход по первому слову останавливается, набрав limit водителей, - в среднем после
+        # limit * len(self) / sizes[rarest] проверок. Если реже встречающееся слово даёт меньше
+        # кандидатов, они берутся по нему целиком (например, слово, которого нет ни у кого)
+        sizes = {token: sum(map(len, self._runs(token))) for token in others | {first}}
+        rarest = min(sizes, key=sizes.get)
+        if sizes[rarest] < min(sizes[first], limit * len(self) / max(sizes[rarest], 1)):
+            candidates = {driver_id for ids in self._runs(rarest) for driver_id in ids}
+            return heapq.nsmallest(
+                limit, (driver_id for driver_id in candidates if self._has_prefix(driver_id, first) and matches(driver_id)),
+                key=lambda driver_id: (self._tier(driver_id, first), driver_id))
+
+        # Иначе ступени обходятся по возрастанию ID до набора limit водителей. Каждая следующая
+        # ступень включает предыдущую; повторно водители не проверяются (проверка от ступени не зависит)
+        found = []
+        seen = set()
+        for runs in (self._runs(first, 0, exact=True), self._runs(first, 0), self._runs(first)):
+            for driver_id in heapq.merge(*runs):
+                if driver_id in seen:
+                    continue
+                seen.add(driver_id)
+                if matches(driver_id):
+                    found.append(driver_id)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+
+# Поля, значения которых не могут повторяться у разных водителей
+UNIQUE_FIELDS = ('license_plate', 'driver_license', 'insurance_policy')
+
+
+# Индекс уникального поля: словарь значение -> driver_id.
+# В данных, записанных до появления индекса, значения могут повторяться: такие водители
+# хранятся в _duplicates и находятся по значению, пока за ним остаётся хоть один водитель.
+class UniqueIndex:
+    def __init__(self, field):
+        self.field = field
+        self._getter = f'get_{field}'
+        self._ids = {}
+        self._values = {}  # driver_id -> значение, чтобы удалять без обращения к объекту
+        self._duplicates = {}  # значение -> остальные ID с этим значением
+
+    def __len__(self):
+        return len(self._values)
+
+    def value(self, driver):
+        return getattr(driver, self._getter)()
+
+    def build(self, items):
+        self._ids = {}
+        self._values = {}
+        self._duplicates = {}
+        for driver_id, value in items:
+            self._insert(driver_id, value)
+
+    def _insert(self, driver_id, value):
+        self._values[driver_id] = value
+        if self._ids.setdefault(value, driver_id) != driver_id:
+            self._duplicates.setdefault(value, []).append(driver_id)
+
+    # ID водителя с таким значением или None
+    def get(self, value):
+        return self._ids.get(value)
+
+    # ID другого водителя, которому уже принадлежит значение поля driver, или None.
+    # Значение, которое уже есть у самого водителя driver_id, не считается повтором.
+    def conflict(self, driver, driver_id=None):
+        value = self.value(driver)
+        holder = self._ids.get(value)
+        if holder is None or holder == driver_id or driver_id in self._duplicates.get(value, ()):
+            return None
+        return holder
+
+    def add(self, driver):
+        self._insert(driver.get_driver_id(), self.value(driver))
+
+    def remove(self, driver_id):
+        if driver_id not in self._values:
+            return
+        value = self._values.pop(driver_id)
+        duplicates = self._duplicates.get(value)
+        if self._ids.get(value) == driver_id:
+            if duplicates:
+                self._ids[value] = duplicates.pop(0)
+            else:
+                del self._ids[value]
+        elif duplicates and driver_id in duplicates:
+            duplicates.remove(driver_id)
+        if duplicates == []:
+            del self._duplicates[value]
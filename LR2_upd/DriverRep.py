@@ -1,8 +1,64 @@
+import os
 import json
 import yaml
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from itertools import chain, islice
 from abc import ABC, abstractmethod
 from DriverRepDB import DriverRepDB
 from Driver import Driver
+from DriverIndex import SortedIndex, NameIndex, UniqueIndex, NAME_FIELDS, UNIQUE_FIELDS
+from DriverTable import DriverTable
+from LRUCache import LRUCache
+from Metrics import instrument
+
+# Потоковый разбор JSON-массива: элементы декодируются по одному из буфера,
+# который дочитывается из файла порциями, поэтому весь список в памяти не строится
+def iter_json_array(file, chunk_size=1 << 16):
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    state = 'start'  # start -> first -> value -> sep -> value ... -> ']'
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                if state == 'start':
+                    return  # Пустой файл
+                raise json.JSONDecodeError("Неожиданный конец JSON-массива", buffer, pos)
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise json.JSONDecodeError("Ожидался JSON-массив", buffer, pos)
+            pos, state = pos + 1, 'first'
+        elif state == 'first':
+            if char == ']':
+                return
+            state = 'value'
+        elif state == 'sep':
+            if char == ']':
+                return
+            if char != ',':
+                raise json.JSONDecodeError("Ожидалась ',' или ']'", buffer, pos)
+            pos, state = pos + 1, 'value'
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # Число, упёршееся в конец буфера или в недочитанный хвост, может быть обрезано
+            if end is None or (not eof and (end == len(buffer) or buffer[end] not in ',] \t\r\n')):
+                chunk = file.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield item
+            pos, state = end, 'sep'
 
 # Абстрактный класс для стратегии обработки файлов
 class DriverRepStrategy(ABC):
@@ -14,6 +70,18 @@ class DriverRepStrategy(ABC):
     def write(self, file_path, data): # Запись данных в файл
         pass
 
+    # Поочерёдная выдача объектов Driver из файла.
+    # factory - способ создания объекта из словаря (с проверкой полей или без неё).
+    def iter_drivers(self, file_path, factory=Driver.from_dict):
+        for item in self.read(file_path):
+            yield factory(item)
+
+    # Ленивое открытие файла без чтения всех записей (см. DriverRepBinary).
+    # Возвращает объект с интерфейсом упорядоченного словаря driver_id -> Driver
+    # или None, если стратегия так не умеет.
+    def open_table(self, file_path, factory=Driver.from_dict):
+        return None
+
 # Стратегия обработки JSON файлов
 class JSONStrategy(DriverRepStrategy):
     def read(self, file_path):
@@ -27,6 +95,17 @@ class JSONStrategy(DriverRepStrategy):
         with open(file_path, 'w', encoding='utf-8') as file:
             json.dump(data, file, ensure_ascii=False, indent=4)
 
+    # Потоковая загрузка: водители создаются по мере разбора массива.
+    # Синтаксическая ошибка в середине файла выбрасывает json.JSONDecodeError.
+    def iter_drivers(self, file_path, factory=Driver.from_dict, chunk_size=1 << 16):
+        try:
+            file = open(file_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with file:
+            for item in iter_json_array(file, chunk_size):
+                yield factory(item)
+
 # Стратегия обработки YAML файлов
 class YAMLStrategy(DriverRepStrategy):
     def read(self, file_path):
@@ -40,88 +119,480 @@ class YAMLStrategy(DriverRepStrategy):
         with open(file_path, 'w', encoding='utf-8') as file:
             yaml.safe_dump(data, file, allow_unicode=True, sort_keys=False)
 
-# Класс дря работы с коллекцией объектов Driver, используя стратегии обработки файлов
+# Класс дря работы с коллекцией объектов Driver, используя стратегии обработки файлов.
+# В режиме журнала (journal=True) изменения не переписывают весь файл, а дописываются
+# короткими записями в файл '<file_path>.journal', который проигрывается при загрузке
+# и периодически сворачивается в новый снимок основного файла.
+# Водители хранятся в упорядоченном словаре driver_id -> Driver, поэтому поиск, замена
+# и удаление по ID выполняются за O(1). Счётчик следующего ID хранится в '<file_path>.meta'.
+# Для полей из indexes поддерживаются отсортированные вторичные индексы (см. DriverIndex).
+# Госномер, удостоверение и полис уникальны: повторы отклоняются по словарным индексам.
+# При columnar=True водители хранятся по столбцам в DriverTable, что заметно экономит память.
+# Записи собственного файла и журнала загружаются без повторной проверки полей;
+# verify_on_load=True включает полную проверку при загрузке.
 class DriverRep:
-    def __init__(self, file_path, file_handler: DriverRepStrategy):
+    def __init__(self, file_path, file_handler: DriverRepStrategy, journal=False, compact_threshold=1000, indexes=(),
+                 columnar=False, verify_on_load=False):
         self.file_path = file_path
         self.file_handler = file_handler
-        self.drivers = []
+        self.journal = journal
+        self.journal_path = f"{file_path}.journal"
+        self.compact_threshold = compact_threshold
+        self.meta_path = f"{file_path}.meta"
+        self.columnar = columnar
+        self._from_storage = Driver.from_dict if verify_on_load else Driver.from_trusted_dict
+        self._journal_size = 0
+        self._drivers = {}
+        self._next_id = 1
+        self._indexes = {}
+        self._name_index = None  # Индекс поиска по ФИО (строится при первом поиске)
+        self._unique_indexes = None  # Индексы уникальных полей (строятся при первом обращении)
         self._read_from_file()
+        for field in indexes:
+            self.create_index(field)
+
+    # Водители в текущем порядке. Возвращается кортеж: изменения через него
+    # (append, remove) раньше меняли хранилище, а теперь должны падать с ошибкой,
+    # а не молча теряться. Изменять коллекцию - через add_driver/update_driver/delete_driver.
+    @property
+    def drivers(self):
+        return tuple(self._drivers.values())
 
     # Чтение данных из файла с использованием стратегии.
     def _read_from_file(self):
-        data = self.file_handler.read(self.file_path)  # Получаем список словарей
-        # Преобразуем каждый словарь в строку JSON и передаём в Driver.from_json
-        self.drivers = [Driver.from_json(json.dumps(item)) for item in data]
+        self._drivers = self._new_store()
+        self._next_id = self._read_next_id()
+        table = self.file_handler.open_table(self.file_path, self._from_storage)
+        if table is not None:
+            self._drivers = table
+            self._next_id = max(self._next_id, table.max_id() + 1)
+        else:
+            self._load_drivers()
+        # Журнал проигрывается всегда, даже если репозиторий открыт без него
+        self._replay_journal()
+        if self._journal_size >= self.compact_threshold:
+            self.compact()
+
+    # Полная загрузка водителей, которых стратегия выдаёт по одному
+    def _load_drivers(self):
+        without_id = []
+        try:
+            # Стратегия выдаёт объекты Driver по одному, без промежуточного списка словарей
+            for driver in self.file_handler.iter_drivers(self.file_path, self._from_storage):
+                driver_id = driver.get_driver_id()
+                if driver_id is None:
+                    without_id.append(driver)
+                    continue
+                self._drivers[driver_id] = driver
+                self._next_id = max(self._next_id, driver_id + 1)
+        except json.JSONDecodeError:
+            self._drivers = self._new_store()  # Повреждённый файл, как и раньше, читается как пустой
+            without_id = []
+        for driver in without_id:  # Записи без ID получают новый ID
+            driver.set_driver_id(self._allocate_id())
+            self._drivers[driver.get_driver_id()] = driver
+
+    # Пустое хранилище driver_id -> Driver: упорядоченный словарь или колоночная таблица
+    def _new_store(self):
+        return DriverTable() if self.columnar else {}
+
+    # Пары (driver_id, значение поля) по всей коллекции
+    def _field_items(self, field):
+        if isinstance(self._drivers, DriverTable):
+            return self._drivers.field_items(field)
+        getter = f'get_{field}'
+        return ((driver.get_driver_id(), getattr(driver, getter)()) for driver in self._drivers.values())
 
     # Запись данных в файл с использованием стратегии.
+    # Снимок пишется во временный файл и атомарно подменяет основной.
     def _write_to_file(self):
-        self.file_handler.write(self.file_path, [driver.full_version for driver in self.drivers])
+        tmp_path = f"{self.file_path}.tmp"
+        self.file_handler.write(tmp_path, [driver.to_dict() for driver in self._drivers.values()])
+        close = getattr(self._drivers, 'close', None)
+        if close is not None:
+            close()  # Отображённый в память файл нельзя подменять, пока он открыт
+        os.replace(tmp_path, self.file_path)
+        table = self.file_handler.open_table(self.file_path, self._from_storage)
+        if table is not None:
+            self._drivers = table
+        with open(self.meta_path, 'w', encoding='utf-8') as file:
+            json.dump({'next_id': self._next_id}, file)
+
+    # Чтение сохранённого счётчика следующего ID
+    def _read_next_id(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as file:
+                return int(json.load(file)['next_id'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return 1
+
+    # Выдать новый ID за O(1)
+    def _allocate_id(self):
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    # Проигрывание журнала изменений поверх загруженного снимка.
+    # Записи идемпотентны, поэтому повторное проигрывание (например, после сбоя
+    # между записью снимка и очисткой журнала) не меняет результат.
+    # Запись, оборванная при сбое, отрезается от файла: иначе следующая запись журнала
+    # дописалась бы в ту же строку и при следующей загрузке тоже была бы потеряна.
+    def _replay_journal(self):
+        self._journal_size = 0
+        try:
+            with open(self.journal_path, 'rb+') as file:
+                end = 0  # Конец последней целой записи
+                position = 0
+                for line in file:
+                    position += len(line)
+                    if not line.endswith(b"\n"):
+                        break  # Оборванная запись (всегда последняя)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Испорченная строка в середине журнала
+                    self._apply_record(record)
+                    self._journal_size += 1
+                    end = position
+                if position > end:
+                    file.truncate(end)
+        except FileNotFoundError:
+            pass
+
+    def _apply_record(self, record):
+        if record['op'] == 'delete':
+            self._remove(record['driver_id'])
+            return
+        driver = self._from_storage(record['driver'])
+        self._put(driver)
+        self._next_id = max(self._next_id, driver.get_driver_id() + 1)
+
+    # Поместить водителя в хранилище (замена сохраняет позицию) и обновить индексы
+    def _put(self, driver):
+        driver_id = driver.get_driver_id()
+        for index in chain(self._indexes.values(), (self._unique_indexes or {}).values()):
+            index.remove(driver_id)
+            index.add(driver)
+        if self._name_index is not None:
+            self._name_index.remove(driver_id)
+            self._name_index.add(driver)
+        self._drivers[driver_id] = driver
+
+    # Убрать водителя из хранилища и индексов
+    def _remove(self, driver_id):
+        driver = self._drivers.pop(driver_id, None)
+        if driver is not None:
+            for index in chain(self._indexes.values(), (self._unique_indexes or {}).values()):
+                index.remove(driver_id)
+            if self._name_index is not None:
+                self._name_index.remove(driver_id)
+        return driver
+
+    # Фиксация изменения: дописать запись в журнал или переписать файл целиком
+    def _commit(self, record):
+        if not self.journal:
+            self.compact()
+            return
+        with open(self.journal_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal_size += 1
+        if self._journal_size >= self.compact_threshold:
+            self.compact()
+
+    # Свернуть журнал в новый снимок основного файла
+    def compact(self):
+        self._write_to_file()
+        if self._journal_size:
+            open(self.journal_path, 'w', encoding='utf-8').close()
+        self._journal_size = 0
 
     # Получить объект по ID.
     def get_by_id(self, driver_id):
-        for driver in self.drivers:
-            if driver.get_driver_id() == driver_id:
-                return driver
+        driver = self._drivers.get(driver_id)
+        if driver is not None:
+            return driver
         raise ValueError(f"Driver с ID {driver_id} не найден.")
     
     # Получить список k по счету n объектов класса short
     def get_k_n_short_list(self, k, n):
         start_index = (k - 1) * n
         end_index = start_index + n
-        return [driver.short_version for driver in self.drivers[start_index:end_index]]
+        return [driver.short_version for driver in islice(self._drivers.values(), start_index, end_index)]
     
+    # Создать отсортированный вторичный индекс по полю
+    def create_index(self, field):
+        if not hasattr(Driver, f'get_{field}'):
+            raise ValueError(f"Поле {field} не существует в объекте Driver.")
+        if field not in self._indexes:
+            index = SortedIndex(field)
+            index.build(self._field_items(field))
+            self._indexes[field] = index
+
+    # Удалить вторичный индекс по полю
+    def drop_index(self, field):
+        self._indexes.pop(field, None)
+
+    def _get_index(self, field):
+        index = self._indexes.get(field)
+        if index is None:
+            raise ValueError(f"Индекс по полю {field} не создан.")
+        return index
+
+    # Получить водителей, у которых значение поля лежит в [low, high], в порядке поля
+    def get_range(self, field, low=None, high=None):
+        return [self._drivers[driver_id] for driver_id in self._get_index(field).ids_in_range(low, high)]
+
+    # Получить список k по счету n объектов класса short в порядке индексированного поля
+    # (с необязательным диапазоном значений) без сортировки всей коллекции
+    def get_k_n_sorted_short_list(self, field, k, n, low=None, high=None, reverse=False):
+        start_index = (k - 1) * n
+        ids = self._get_index(field).ids_in_range(low, high, start_index, start_index + n, reverse)
+        return [self._drivers[driver_id].short_version for driver_id in ids]
+
+    # Индексы уникальных полей; при первом обращении строятся по всей коллекции
+    def _get_unique_indexes(self):
+        if self._unique_indexes is None:
+            indexes = {}
+            for field in UNIQUE_FIELDS:
+                indexes[field] = UniqueIndex(field)
+                indexes[field].build(self._field_items(field))
+            self._unique_indexes = indexes
+        return self._unique_indexes
+
+    # Проверка, что значения уникальных полей driver не заняты другими водителями
+    def _check_unique(self, driver, driver_id=None):
+        for field, index in self._get_unique_indexes().items():
+            holder = index.conflict(driver, driver_id)
+            if holder is not None:
+                raise ValueError(f"Driver с {field} {index.value(driver)} уже существует (ID {holder}).")
+
+    # Получить объект по значению уникального поля
+    def _get_by_unique(self, field, value):
+        driver_id = self._get_unique_indexes()[field].get(value)
+        if driver_id is not None:
+            return self._drivers[driver_id]
+        raise ValueError(f"Driver с {field} {value} не найден.")
+
+    # Получить объект по госномеру
+    def get_by_license_plate(self, license_plate):
+        return self._get_by_unique('license_plate', license_plate)
+
+    # Получить объект по номеру водительского удостоверения
+    def get_by_driver_license(self, driver_license):
+        return self._get_by_unique('driver_license', driver_license)
+
+    # Получить объект по номеру страхового полиса
+    def get_by_insurance_policy(self, insurance_policy):
+        return self._get_by_unique('insurance_policy', insurance_policy)
+
     # Сортировать элементы по выбранному полю
     def sort_by_field(self, field):
         if not hasattr(Driver, f'get_{field}'):
             raise ValueError(f"Поле {field} не существует в объекте Driver.")
-        self.drivers.sort(key=lambda driver: getattr(driver, f'get_{field}')())
+        if isinstance(self._drivers, DriverTable):
+            self._drivers.sort_by(field)
+            return
+        ordered = sorted(self._drivers.values(), key=lambda driver: getattr(driver, f'get_{field}')())
+        close = getattr(self._drivers, 'close', None)
+        self._drivers = {driver.get_driver_id(): driver for driver in ordered}
+        if close is not None:
+            close()  # Отображённый в память файл больше не нужен, а открытым его нельзя подменять при сжатии
 
     # Добавить объект в список (при добавлении сформировать новый ID)
     def add_driver(self, driver):
-        new_id = max((driver.get_driver_id() for driver in self.drivers if driver.get_driver_id()), default=0) + 1
-        driver.set_driver_id(new_id)
-        self.drivers.append(driver)
-        self._write_to_file()
+        self._check_unique(driver)
+        driver.set_driver_id(self._allocate_id())
+        self._put(driver)
+        self._commit({'op': 'add', 'driver': driver.to_dict()})
 
     # Заменить элемент списка по ID.
     def update_driver(self, driver_id, new_driver):
-        for i, driver in enumerate(self.drivers):
-            if driver.get_driver_id() == driver_id:
-                new_driver.set_driver_id(driver_id)  # Сохраняем ID
-                self.drivers[i] = new_driver
-                self._write_to_file()
-                return
+        if driver_id in self._drivers:
+            self._check_unique(new_driver, driver_id)
+            new_driver.set_driver_id(driver_id)  # Сохраняем ID
+            self._put(new_driver)
+            self._commit({'op': 'update', 'driver': new_driver.to_dict()})
+            return
         raise ValueError(f"Driver с ID {driver_id} не найден.")
     
     # Удалить элемент списка по ID
     def delete_driver(self, driver_id):
-        self.drivers = [driver for driver in self.drivers if driver.get_driver_id() != driver_id]
-        self._write_to_file()
+        deleted = self._remove(driver_id)
+        if not self.journal or deleted is not None:
+            self._commit({'op': 'delete', 'driver_id': driver_id})
+
+    # Поиск водителей по началу слов фамилии, имени и отчества (без учёта регистра).
+    # Каждое слово запроса должно совпасть с началом какого-либо слова ФИО; результаты
+    # упорядочены по качеству совпадения (сначала фамилия и полные слова).
+    def search(self, query, limit=20):
+        if self._name_index is None:
+            self._name_index = NameIndex()
+            self._name_index.build({field: self._field_items(field) for field in NAME_FIELDS})
+        return [self._drivers[driver_id] for driver_id in self._name_index.search(query, limit)]
 
     # Получить количество элементов
     def get_count(self):
-        return len(self.drivers)
+        return len(self._drivers)
     
 
+# Адаптер DriverRepDB к интерфейсу DriverRep.
+# При cache_size > 0 включается кэш: LRU водителей по ID, запомненное количество и LRU страниц
+# кратких списков. Записи через адаптер точно сбрасывают затронутые элементы кэша.
 class DriverRepDBAdapter:
-    def __init__(self, driver_rep_db: DriverRepDB): # Загружаем или инициализируем репозиторий
+    def __init__(self, driver_rep_db: DriverRepDB, cache_size=0, page_cache_size=256): # Загружаем или инициализируем репозиторий
         self._driver_rep_db = driver_rep_db
+        self._drivers_cache = LRUCache(cache_size) if cache_size else None
+        self._pages_cache = LRUCache(page_cache_size) if cache_size else None
+        self._count = None
+        self._count_hits = 0
+        self._count_misses = 0
+        self._generation = 0  # Увеличивается каждой записью; устаревший результат чтения не кэшируется
+        self._lock = threading.Lock()
 
     def get_by_id(self, driver_id):
-        return self._driver_rep_db.get_by_id(driver_id)
-    
+        if self._drivers_cache is None:
+            return self._driver_rep_db.get_by_id(driver_id)
+        row = self._drivers_cache.get(driver_id)
+        if row is not None:
+            return Driver.from_row(row)  # Каждый раз новый объект: изменения вызывающего не портят кэш
+        generation = self._generation
+        driver = self._driver_rep_db.get_by_id(driver_id)
+        self._cache_put(self._drivers_cache, driver_id, tuple(driver.to_dict().values()), generation)
+        return driver
+
     def get_k_n_short_list(self, k, n):
-        return self._driver_rep_db.get_k_n_short_list(k, n)
+        return list(self._cached_page(('kn', k, n), lambda: self._driver_rep_db.get_k_n_short_list(k, n)))
+
+    def get_short_list_page(self, n, token=None, order_by='driver_id'):
+        items, next_token = self._cached_page(
+            ('keyset', n, token, order_by), lambda: self._driver_rep_db.get_short_list_page(n, token, order_by)
+        )
+        return list(items), next_token
+
+    def iter_drivers(self, where=None, order_by='driver_id', batch_size=1000, as_tuples=False):
+        return self._driver_rep_db.iter_drivers(where, order_by, batch_size, as_tuples)
+
+    def search(self, query, limit=20):
+        return self._driver_rep_db.search(query, limit)
+
+    def get_by_license_plate(self, license_plate):
+        return self._driver_rep_db.get_by_license_plate(license_plate)
+
+    def get_by_driver_license(self, driver_license):
+        return self._driver_rep_db.get_by_driver_license(driver_license)
+
+    def get_by_insurance_policy(self, insurance_policy):
+        return self._driver_rep_db.get_by_insurance_policy(insurance_policy)
 
     def add_driver(self, driver):
-        self._driver_rep_db.add_driver(driver)
+        with self._invalidating() as change:
+            count = self._count
+            self._driver_rep_db.add_driver(driver)
+            change.count_delta = 1
+            # Новый водитель получает наибольший ID, поэтому в порядке driver_id меняется только хвост
+            change.pages = lambda key, value: self._page_touches_tail(key, value, count)
 
     def update_driver(self, driver_id, new_driver):
-        self._driver_rep_db.update_driver(driver_id, new_driver)        
+        with self._invalidating() as change:
+            change.driver_ids = (driver_id,)
+            self._driver_rep_db.update_driver(driver_id, new_driver)
+            change.count_delta = 0
 
     def delete_driver(self, driver_id):
-        self._driver_rep_db.delete_driver(driver_id)
+        with self._invalidating() as change:
+            change.driver_ids = (driver_id,)
+            self._driver_rep_db.delete_driver(driver_id)
+            change.count_delta = -1
+
+    def add_many(self, drivers, chunk_size=1000, commit_every_chunk=False):
+        with self._invalidating():
+            self._driver_rep_db.add_many(drivers, chunk_size, commit_every_chunk)
+
+    def update_many(self, updates, chunk_size=1000, commit_every_chunk=False):
+        updates = list(updates)
+        with self._invalidating() as change:
+            change.driver_ids = [driver_id for driver_id, _ in updates]
+            self._driver_rep_db.update_many(updates, chunk_size, commit_every_chunk)
+            change.count_delta = 0
+
+    def delete_many(self, driver_ids, chunk_size=1000, commit_every_chunk=False):
+        driver_ids = list(driver_ids)
+        with self._invalidating() as change:
+            change.driver_ids = driver_ids
+            self._driver_rep_db.delete_many(driver_ids, chunk_size, commit_every_chunk)
+            change.count_delta = -len(set(driver_ids))  # Повтор ID удаляет одну строку
 
     def get_count(self):
-        return self._driver_rep_db.get_count()
\ No newline at end of file
+        if self._drivers_cache is None:
+            return self._driver_rep_db.get_count()
+        count = self._count
+        if count is not None:
+            self._count_hits += 1
+            return count
+        self._count_misses += 1
+        generation = self._generation
+        count = self._driver_rep_db.get_count()
+        with self._lock:
+            if generation == self._generation:
+                self._count = count
+        return count
+
+    # Счётчики кэша для подбора его размера
+    def cache_stats(self):
+        if self._drivers_cache is None:
+            return None
+        return {
+            'drivers': self._drivers_cache.stats(),
+            'pages': self._pages_cache.stats(),
+            'count': {'hits': self._count_hits, 'misses': self._count_misses},
+        }
+
+    def _cache_put(self, cache, key, value, generation):
+        with self._lock:
+            if generation == self._generation:
+                cache.put(key, value)
+
+    def _cached_page(self, key, load):
+        if self._pages_cache is None:
+            return load()
+        page = self._pages_cache.get(key)
+        if page is None:
+            generation = self._generation
+            page = load()
+            self._cache_put(self._pages_cache, key, page, generation)
+        return page
+
+    # Затрагивает ли добавление в конец (при count строк до него) страницу из кэша
+    @staticmethod
+    def _page_touches_tail(key, value, count):
+        if key[0] == 'kn':
+            return count is None or key[1] * key[2] > count
+        return key[3] != 'driver_id' or value[1] is None  # Последняя страница по driver_id
+
+    # Сброс кэша после записи. Описание изменения заполняется внутри блока with:
+    # driver_ids - изменённые водители, count_delta - изменение количества (None - неизвестно),
+    # pages - условие сброса страниц (по умолчанию сбрасываются все).
+    @contextmanager
+    def _invalidating(self):
+        change = SimpleNamespace(driver_ids=(), count_delta=None, pages=None)
+        try:
+            yield change
+        finally:
+            if self._drivers_cache is not None:
+                with self._lock:
+                    self._generation += 1
+                    if self._count is not None and change.count_delta is not None:
+                        self._count += change.count_delta
+                    else:
+                        self._count = None
+                for driver_id in change.driver_ids:
+                    self._drivers_cache.discard(driver_id)
+                if change.pages is None:
+                    self._pages_cache.clear()
+                else:
+                    self._pages_cache.discard_where(change.pages)
+
+
+# Замер времени всех открытых методов (см. Metrics)
+instrument(DriverRep)
+instrument(DriverRepDBAdapter)
@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import tempfile
+from Driver import Driver
+from DriverRep import DriverRep, DriverRepDBAdapter, JSONStrategy, YAMLStrategy
+from DriverRepBinary import BinaryStrategy
+from DriverRepDB import DriverRepDB
+from DatabaseConnection import DatabaseConnection
+
+# Замеры DriverRep (JSON, YAML, бинарный формат) и DriverRepDB на синтетических данных.
+# Пример: python DriverRepBenchmark.py --sizes 1000,10000 --output report.json
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+BACKENDS = ('json', 'yaml', 'binary', 'db')
+# Запись YAML на миллионе водителей занимает десятки минут, поэтому по умолчанию
+# YAML замеряется только до этого размера (см. --yaml-max)
+YAML_MAX_SIZE = 100000
+
+LAST_NAMES = (
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов',
+    'Новиков', 'Фёдоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семёнов', 'Егоров',
+)
+FIRST_NAMES = (
+    'Александр', 'Дмитрий', 'Максим', 'Сергей', 'Андрей', 'Алексей', 'Артём', 'Илья',
+    'Кирилл', 'Михаил', 'Никита', 'Матвей', 'Роман', 'Егор', 'Арсений', 'Иван',
+)
+PATRONYMICS = (
+    'Александрович', 'Дмитриевич', 'Сергеевич', 'Андреевич', 'Алексеевич', 'Михайлович',
+    'Иванович', 'Николаевич', 'Владимирович', 'Петрович',
+)
+# Буквы, допустимые в российских номерах (совпадают по написанию с латинскими)
+PLATE_LETTERS = 'АВЕКМНОРСТУХ'
+PLATE_REGIONS = ('77', '97', '177', '50', '150', '78', '178', '23', '123', '16')
+
+
+# Госномер водителя с номером i (у разных i не совпадает)
+def license_plate(i):
+    letters = i // 1000
+    return (
+        PLATE_LETTERS[letters % 12]
+        + f"{i % 1000:03d}"
+        + PLATE_LETTERS[letters // 12 % 12]
+        + PLATE_LETTERS[letters // 144 % 12]
+        + PLATE_REGIONS[letters // 1728 % len(PLATE_REGIONS)]
+    )
+
+
+# Словарь водителя с корректными значениями всех полей для номера i (i >= 1).
+# Номера удостоверения, ПТС, полиса и госномер однозначно выводятся из i, поэтому у разных
+# водителей не совпадают; остальные поля берутся из генератора rng.
+def generate_driver_dict(i, rng):
+    return {
+        'driver_id': i,
+        'last_name': rng.choice(LAST_NAMES),
+        'first_name': rng.choice(FIRST_NAMES),
+        'patronymic': rng.choice(PATRONYMICS),
+        'experience': rng.randrange(0, 50),
+        'phone_number': f"+7 (9{rng.randrange(100):02d}) {rng.randrange(1000):03d}-{rng.randrange(100):02d}-{rng.randrange(100):02d}",
+        'birthday': f"{rng.randrange(1, 29):02d}.{rng.randrange(1, 13):02d}.{rng.randrange(1950, 2006)}",
+        'driver_license': f"{i // 10 ** 6 % 100:02d} {rng.randrange(100):02d} {i % 10 ** 6:06d}",
+        'vehicle_title': f"{rng.randrange(100):02d} {i // 10 ** 6 % 100:02d} {i % 10 ** 6:06d}",
+        'insurance_policy': f"{rng.randrange(1000):03d} {i:012d}",
+        'license_plate': license_plate(i),
+    }
+
+
+# Детерминированная последовательность count словарей водителей с ID start_id, start_id + 1, ...
+def generate_drivers(count, seed=0, start_id=1):
+    rng = random.Random(seed * 1000003 + start_id)
+    for i in range(start_id, start_id + count):
+        yield generate_driver_dict(i, rng)
+
+
+# Время выполнения action() repeat раз
+def _measure(action, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return time.perf_counter() - start
+
+
+def _storage_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+# Подготовка хранилища из size водителей; возвращает функцию открытия репозитория
+def _prepare(backend, size, directory, seed, journal):
+    if backend == 'db':
+        path = os.path.join(directory, 'drivers.db')
+        DriverRepDB(path).add_many(Driver.from_trusted_dict(data) for data in generate_drivers(size, seed))
+        return lambda: DriverRepDBAdapter(DriverRepDB(path))
+    strategy = {'json': JSONStrategy, 'yaml': YAMLStrategy, 'binary': BinaryStrategy}[backend]()
+    path = os.path.join(directory, f'drivers.{backend}')
+    strategy.write(path, list(generate_drivers(size, seed)))
+    return lambda: DriverRep(path, strategy, journal=journal)
+
+
+# Замеры всех операций для одного хранилища и размера
+def run_backend(backend, size, seed=0, lookups=1000, pages=100, page_size=20, write_ops=5, journal=False):
+    rng = random.Random(seed)
+    results = []
+
+    def record(operation, total, repeat):
+        results.append({
+            'backend': backend, 'size': size, 'operation': operation,
+            'repeat': repeat, 'total_s': total, 'per_op_s': total / repeat if repeat else None,
+        })
+
+    # Неподдерживаемая операция: run_benchmarks переносит её в список skipped отчёта
+    def skip(operation, reason):
+        results.append({'backend': backend, 'size': size, 'operation': operation, 'skipped': reason})
+
+    repository = None
+    with tempfile.TemporaryDirectory(prefix='driver-bench-') as directory:
+        try:
+            open_repository = _prepare(backend, size, directory, seed, journal)
+
+            def load():
+                nonlocal repository
+                repository = open_repository()
+
+            record('load', _measure(load), 1)
+            ids = [rng.randrange(1, size + 1) for _ in range(lookups)]
+            record('get_by_id', _measure(lambda: [repository.get_by_id(driver_id) for driver_id in ids]), lookups)
+            # Первый поиск по госномеру отдельно: DriverRep строит в нём индексы уникальных полей
+            plates = [license_plate(driver_id) for driver_id in ids]
+            record('get_by_license_plate_first', _measure(lambda: repository.get_by_license_plate(plates[0])), 1)
+            record('get_by_license_plate', _measure(
+                lambda: [repository.get_by_license_plate(plate) for plate in plates]), lookups)
+            page_numbers = [rng.randrange(1, max(size // page_size, 1) + 1) for _ in range(pages)]
+            record('get_k_n_short_list', _measure(
+                lambda: [repository.get_k_n_short_list(k, page_size) for k in page_numbers]), pages)
+            record('get_count', _measure(repository.get_count, lookups), lookups)
+            if hasattr(repository, 'sort_by_field'):
+                record('sort_by_field', _measure(lambda: repository.sort_by_field('last_name')), 1)
+            else:
+                skip('sort_by_field', 'не поддерживается хранилищем (порядок задаётся запросом)')
+
+            new_drivers = [Driver.from_trusted_dict(data) for data in generate_drivers(write_ops, seed + 1, size + 1)]
+            record('add_driver', _measure(lambda: [repository.add_driver(driver) for driver in new_drivers]), write_ops)
+            targets = rng.sample(range(1, size + 1), min(write_ops, size))
+            replacements = [Driver.from_trusted_dict(data) for data in generate_drivers(len(targets), seed + 2, size + write_ops + 1)]
+            record('update_driver', _measure(
+                lambda: [repository.update_driver(driver_id, driver) for driver_id, driver in zip(targets, replacements)]),
+                len(targets))
+            record('delete_driver', _measure(lambda: [repository.delete_driver(driver_id) for driver_id in targets]),
+                   len(targets))
+            results.append({'backend': backend, 'size': size, 'operation': 'storage_bytes',
+                            'value': _storage_size(directory)})
+        finally:
+            if backend == 'db':
+                DatabaseConnection.close_all()
+            else:
+                close = getattr(getattr(repository, '_drivers', None), 'close', None)
+                if close is not None:
+                    close()  # mmap бинарного файла должен быть закрыт до удаления каталога
+    return results
+
+
+# Полный набор замеров; отчёт - словарь, пригодный для json.dump
+def run_benchmarks(sizes=DEFAULT_SIZES, backends=BACKENDS, seed=0, yaml_max=YAML_MAX_SIZE, label=None, log=None, **options):
+    report = {
+        'label': label,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        'seed': seed,
+        'options': options,
+        'results': [],
+        'skipped': [],
+    }
+    for size in sizes:
+        for backend in backends:
+            if backend == 'yaml' and size > yaml_max:
+                report['skipped'].append({'backend': backend, 'size': size, 'reason': f'size > yaml_max ({yaml_max})'})
+                continue
+            if log:
+                log(f"{backend} x {size}...")
+            for r in run_backend(backend, size, seed, **options):
+                if 'skipped' in r:
+                    report['skipped'].append({'backend': backend, 'size': size, 'operation': r['operation'],
+                                              'reason': r['skipped']})
+                else:
+                    report['results'].append(r)
+    return report
+
+
+# Отношение времени (новое / старое) по одинаковым замерам двух отчётов
+def compare_reports(old, new):
+    def timings(report):
+        return {(r['backend'], r['size'], r['operation']): r['per_op_s']
+                for r in report['results'] if r.get('per_op_s')}
+    old_timings = timings(old)
+    return [
+        {'backend': key[0], 'size': key[1], 'operation': key[2], 'old_s': old_timings[key], 'new_s': value,
+         'ratio': value / old_timings[key]}
+        for key, value in timings(new).items() if key in old_timings
+    ]
+
+
+def _print_report(report):
+    print(f"{'backend':8} {'size':>8} {'operation':26} {'per op, ms':>12} {'total, s':>10}")
+    for r in report['results']:
+        if 'per_op_s' in r:
+            print(f"{r['backend']:8} {r['size']:>8} {r['operation']:26} {r['per_op_s'] * 1000:>12.4f} {r['total_s']:>10.3f}")
+    for r in report['skipped']:
+        print(f"{r['backend']:8} {r['size']:>8} {r.get('operation', '*'):26} пропущено: {r['reason']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры производительности репозиториев водителей")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="размеры через запятую")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help=f"хранилища через запятую: {', '.join(BACKENDS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lookups", type=int, default=1000, help="число вызовов get_by_id и get_count")
+    parser.add_argument("--pages", type=int, default=100, help="число вызовов get_k_n_short_list")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--write-ops", type=int, default=5, help="число добавлений, изменений и удалений")
+    parser.add_argument("--journal", action="store_true", help="файловые репозитории с журналом изменений")
+    parser.add_argument("--yaml-max", type=int, default=YAML_MAX_SIZE, help="наибольший размер для YAML")
+    parser.add_argument("--label", help="метка отчёта (например, версия)")
+    parser.add_argument("--output", default="benchmark_report.json", help="файл JSON-отчёта")
+    parser.add_argument("--compare", help="предыдущий JSON-отчёт для сравнения")
+    args = parser.parse_args()
+
+    backends = args.backends.split(",")
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"неизвестные хранилища: {', '.join(sorted(unknown))}")
+    report = run_benchmarks(
+        [int(size) for size in args.sizes.split(",")], backends, args.seed, args.yaml_max, args.label,
+        log=lambda message: print(message, file=sys.stderr),
+        lookups=args.lookups, pages=args.pages, page_size=args.page_size, write_ops=args.write_ops, journal=args.journal,
+    )
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    _print_report(report)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            old_report = json.load(file)
+        print()
+        for row in compare_reports(old_report, report):
+            print(f"{row['backend']:8} {row['size']:>8} {row['operation']:26} x{row['ratio']:.2f}")
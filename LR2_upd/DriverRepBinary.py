@@ -0,0 +1,196 @@
+import os
+import sys
+import mmap
+import struct
+from bisect import bisect_left
+from Driver import Driver
+from DriverRep import DriverRep, DriverRepStrategy, JSONStrategy, YAMLStrategy
+
+# Формат файла:
+#   заголовок    - сигнатура, версия, число записей, смещения таблицы строк и индекса ID;
+#   записи       - фиксированной длины: driver_id, experience и 9 ссылок (смещение, длина)
+#                  на строки в таблице строк;
+#   таблица строк - UTF-8 без повторов (одинаковые имена и т.п. хранятся один раз);
+#   индекс ID    - пары (driver_id, номер записи), отсортированные по driver_id.
+MAGIC = b'DRVB'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQQ')
+RECORD = struct.Struct('<qq18I')
+INDEX_ENTRY = struct.Struct('<qq')
+
+STRING_FIELDS = (
+    'last_name', 'first_name', 'patronymic', 'phone_number', 'birthday',
+    'driver_license', 'vehicle_title', 'insurance_policy', 'license_plate',
+)
+
+
+# Столбец ID из индекса, доступный для бисекции без чтения всего файла
+class _IdColumn:
+    def __init__(self, buffer, offset, count):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        return INDEX_ENTRY.unpack_from(self._buffer, self._offset + i * INDEX_ENTRY.size)[0]
+
+
+# Отображённый в память файл водителей. Ведёт себя как упорядоченный словарь
+# driver_id -> Driver, которым пользуется DriverRep: записи декодируются только при
+# обращении, а изменения хранятся поверх файла до следующего снимка.
+class MappedDriverTable:
+    def __init__(self, file_path, factory=Driver.from_dict):
+        self._factory = factory
+        with open(file_path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._strings_offset, self._index_offset = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self._buffer.close()
+            raise ValueError(f"Файл {file_path} не является бинарным файлом водителей.")
+        self._ids = _IdColumn(self._buffer, self._index_offset, self._count)
+        self._decoded = {}   # Уже декодированные записи файла
+        self._replaced = {}  # Заменённые записи файла (остаются на своём месте)
+        self._deleted = set()
+        self._added = {}     # Новые водители (в конце, в порядке добавления)
+
+    def close(self):
+        self._buffer.close()
+
+    # Максимальный ID в файле (последний элемент отсортированного индекса)
+    def max_id(self):
+        return self._ids[self._count - 1] if self._count else 0
+
+    # Номер записи файла по ID или None
+    def _find(self, driver_id):
+        i = bisect_left(self._ids, driver_id)
+        if i < self._count and self._ids[i] == driver_id:
+            offset = self._index_offset + i * INDEX_ENTRY.size
+            return INDEX_ENTRY.unpack_from(self._buffer, offset)[1]
+        return None
+
+    def _decode(self, record_no):
+        fields = RECORD.unpack_from(self._buffer, HEADER.size + record_no * RECORD.size)
+        data = {'driver_id': fields[0], 'experience': fields[1]}
+        for i, name in enumerate(STRING_FIELDS):
+            start = self._strings_offset + fields[2 + 2 * i]
+            data[name] = self._buffer[start:start + fields[3 + 2 * i]].decode('utf-8')
+        return data
+
+    def _load(self, record_no, driver_id):
+        driver = self._decoded.get(driver_id)
+        if driver is None:
+            driver = self._factory(self._decode(record_no))
+            self._decoded[driver_id] = driver
+        return driver
+
+    def _in_file(self, driver_id):
+        return driver_id not in self._deleted and self._find(driver_id) is not None
+
+    def get(self, driver_id, default=None):
+        if driver_id in self._added:
+            return self._added[driver_id]
+        if driver_id in self._replaced:
+            return self._replaced[driver_id]
+        if driver_id in self._deleted:
+            return default
+        record_no = self._find(driver_id)
+        return default if record_no is None else self._load(record_no, driver_id)
+
+    def __getitem__(self, driver_id):
+        driver = self.get(driver_id)
+        if driver is None:
+            raise KeyError(driver_id)
+        return driver
+
+    def __contains__(self, driver_id):
+        return driver_id in self._added or self._in_file(driver_id)
+
+    def __setitem__(self, driver_id, driver):
+        if driver_id not in self._added and self._in_file(driver_id):
+            self._replaced[driver_id] = driver
+        else:
+            self._added[driver_id] = driver
+
+    def pop(self, driver_id, default=None):
+        if driver_id in self._added:
+            return self._added.pop(driver_id)
+        if not self._in_file(driver_id):
+            return default
+        driver = self.get(driver_id)
+        self._deleted.add(driver_id)
+        self._replaced.pop(driver_id, None)
+        self._decoded.pop(driver_id, None)
+        return driver
+
+    def __len__(self):
+        return self._count - len(self._deleted) + len(self._added)
+
+    # Водители в порядке файла, затем добавленные
+    def values(self):
+        for record_no in range(self._count):
+            driver_id = RECORD.unpack_from(self._buffer, HEADER.size + record_no * RECORD.size)[0]
+            if driver_id in self._deleted:
+                continue
+            yield self._replaced.get(driver_id) or self._load(record_no, driver_id)
+        yield from self._added.values()
+
+
+# Стратегия обработки компактных бинарных файлов, читаемых через mmap
+class BinaryStrategy(DriverRepStrategy):
+    def read(self, file_path):
+        table = self.open_table(file_path)
+        if table is None:
+            return []
+        try:
+            return [table._decode(record_no) for record_no in range(table._count)]
+        finally:
+            table.close()
+
+    def write(self, file_path, data):
+        strings = {}
+        string_table = bytearray()
+        records = bytearray()
+        index = []
+        for record_no, item in enumerate(data):
+            refs = []
+            for name in STRING_FIELDS:
+                value = item[name]
+                ref = strings.get(value)
+                if ref is None:
+                    encoded = value.encode('utf-8')
+                    ref = strings[value] = (len(string_table), len(encoded))
+                    string_table += encoded
+                refs.extend(ref)
+            records += RECORD.pack(item['driver_id'], item['experience'], *refs)
+            index.append((item['driver_id'], record_no))
+        index.sort()
+        strings_offset = HEADER.size + len(records)
+        index_offset = strings_offset + len(string_table)
+        with open(file_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(index), strings_offset, index_offset))
+            file.write(records)
+            file.write(string_table)
+            file.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in index))
+
+    def open_table(self, file_path, factory=Driver.from_dict):
+        if not os.path.exists(file_path):
+            return None
+        return MappedDriverTable(file_path, factory)
+
+
+# Конвертация JSON/YAML файла водителей в бинарный формат
+def convert_to_binary(source_path, target_path, source_strategy: DriverRepStrategy = None):
+    if source_strategy is None:
+        source_strategy = YAMLStrategy() if source_path.endswith(('.yaml', '.yml')) else JSONStrategy()
+    source = DriverRep(source_path, source_strategy)  # Проигрывает журнал и выдаёт ID записям без них
+    BinaryStrategy().write(target_path, [driver.to_dict() for driver in source.drivers])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Использование: python DriverRepBinary.py <drivers.json|drivers.yaml> <drivers.bin>")
+        sys.exit(1)
+    convert_to_binary(sys.argv[1], sys.argv[2])
@@ -1,10 +1,134 @@
+import json
+import base64
 import sqlite3
+import warnings
+from itertools import islice
 from DatabaseConnection import DatabaseConnection
 from Driver import Driver
+from DriverIndex import name_tokens, UNIQUE_FIELDS
+from Metrics import instrument
+
+INSERT_SQL = '''
+    INSERT INTO drivers (
+        last_name, first_name, patronymic, experience, phone_number, birthday,
+        driver_license, vehicle_title, insurance_policy, license_plate
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+UPDATE_SQL = '''
+    UPDATE drivers SET
+        last_name = ?, first_name = ?, patronymic = ?, experience = ?,
+        phone_number = ?, birthday = ?, driver_license = ?, vehicle_title = ?,
+        insurance_policy = ?, license_plate = ?
+    WHERE driver_id = ?
+'''
+
+# Столбцы таблицы drivers в порядке их следования
+COLUMNS = (
+    'driver_id', 'last_name', 'first_name', 'patronymic', 'experience', 'phone_number',
+    'birthday', 'driver_license', 'vehicle_title', 'insurance_policy', 'license_plate',
+)
+
+# Столбцы, по которым доступна постраничная выборка по ключу (keyset), и индексы для них.
+# driver_id в конце ключа делает порядок однозначным при равных значениях столбца.
+PAGE_ORDERS = ('driver_id', 'last_name', 'experience')
+INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_drivers_last_name ON drivers (last_name, driver_id)",
+    "CREATE INDEX IF NOT EXISTS idx_drivers_experience ON drivers (experience, driver_id)",
+)
+
+# Уникальные поля ищутся по UNIQUE-индексам, которые и не дают записать повторяющееся значение.
+# Если в базе повторы уже есть, создаётся обычный индекс, а новые значения проверяются перед записью.
+def _unique_index_sql(field, unique=True):
+    if unique:
+        return f"CREATE UNIQUE INDEX IF NOT EXISTS idx_drivers_{field} ON drivers ({field})"
+    return f"CREATE INDEX IF NOT EXISTS idx_drivers_{field}_lookup ON drivers ({field})"
+
+# Полнотекстовый индекс ФИО (FTS5). Таблица без собственного содержимого (content=''):
+# триггеры кладут в неё ФИО с заменой «ё» на «е», а строки берутся из drivers по rowid.
+# Вставка в FTS5 из триггера на порядок дороже прямой, поэтому add_many внутри своей
+# транзакции отключает триггер вставки (drivers_fts_state) и индексирует порцию одним запросом.
+def _normalized(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+def _fts_values(row):
+    return ", ".join(_normalized(f"{row}.{column}") for column in ('last_name', 'first_name', 'patronymic'))
+
+# Условие перебора без FTS5 для одного слова запроса: начало любого поля ФИО (с той же заменой «ё»)
+LIKE_CONDITION = "(" + " OR ".join(f"{_normalized(column)} LIKE ?" for column in ('last_name', 'first_name', 'patronymic')) + ")"
+
+FTS_SQL = (
+    """CREATE VIRTUAL TABLE drivers_fts USING fts5(
+        last_name, first_name, patronymic,
+        content='', tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )""",
+    "CREATE TABLE IF NOT EXISTS drivers_fts_state (id INTEGER PRIMARY KEY CHECK (id = 1), deferred INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO drivers_fts_state (id, deferred) VALUES (1, 0)",
+    f"INSERT INTO drivers_fts (rowid, last_name, first_name, patronymic) SELECT driver_id, {_fts_values('drivers')} FROM drivers",
+)
+# Индексация строк с driver_id >= ? одним запросом (после вставки с отключённым триггером)
+FTS_INDEX_FROM_SQL = (
+    f"INSERT INTO drivers_fts (rowid, last_name, first_name, patronymic) "
+    f"SELECT driver_id, {_fts_values('drivers')} FROM drivers WHERE driver_id >= ?"
+)
+FTS_TRIGGERS_SQL = (
+    f"""CREATE TRIGGER IF NOT EXISTS drivers_fts_insert AFTER INSERT ON drivers
+    WHEN (SELECT deferred FROM drivers_fts_state) = 0 BEGIN
+        INSERT INTO drivers_fts (rowid, last_name, first_name, patronymic) VALUES (new.driver_id, {_fts_values('new')});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS drivers_fts_delete AFTER DELETE ON drivers BEGIN
+        INSERT INTO drivers_fts (drivers_fts, rowid, last_name, first_name, patronymic)
+        VALUES ('delete', old.driver_id, {_fts_values('old')});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS drivers_fts_update AFTER UPDATE OF last_name, first_name, patronymic ON drivers BEGIN
+        INSERT INTO drivers_fts (drivers_fts, rowid, last_name, first_name, patronymic)
+        VALUES ('delete', old.driver_id, {_fts_values('old')});
+        INSERT INTO drivers_fts (rowid, last_name, first_name, patronymic) VALUES (new.driver_id, {_fts_values('new')});
+    END""",
+)
+
+# Запросы FTS5 по ступеням ранжирования (каждая следующая включает предыдущую):
+# первое слово - фамилия целиком, первое слово - начало фамилии, любое совпадение.
+# Остальные слова - префиксы ("слово"*) в любом поле, все слова обязательны.
+# Ранжирование по bm25 пришлось бы считать для всех совпадений (десятки тысяч строк
+# для частой фамилии), а ступени читаются в порядке rowid и останавливаются на LIMIT.
+def _fts_tiers(query):
+    tokens = name_tokens(query)
+    if not tokens:
+        return []
+    rest = "".join(f' "{token}"*' for token in tokens[1:])
+    return [
+        f'last_name : "{tokens[0]}"{rest}',
+        f'last_name : "{tokens[0]}"*{rest}',
+        f'"{tokens[0]}"*{rest}',
+    ]
+
+# Наибольшее число параметров одного запроса (SQLITE_MAX_VARIABLE_NUMBER в сборках SQLite до 3.32)
+MAX_VARIABLES = 999
+
+# Разбиение последовательности на списки не длиннее size (None - без разбиения)
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Значения полей водителя в порядке столбцов INSERT/UPDATE
+def _driver_values(driver):
+    return (
+        driver.get_last_name(), driver.get_first_name(), driver.get_patronymic(), driver.get_experience(),
+        driver.get_phone_number(), driver.get_birthday(), driver.get_driver_license(),
+        driver.get_vehicle_title(), driver.get_insurance_policy(), driver.get_license_plate()
+    )
 
 class DriverRepDB:
-    def __init__(self, db_path):
+    # Строки таблицы уже проверены при вставке, поэтому по умолчанию объекты Driver
+    # создаются из них без повторной проверки; verify_on_load=True включает её.
+    def __init__(self, db_path, verify_on_load=False):
         self.db_path = db_path
+        self.verify_on_load = verify_on_load
         self._initialize_database()
 
     # Инициализация базы данных
@@ -26,7 +150,46 @@ class DriverRepDB:
                 license_plate TEXT NOT NULL
             )
         ''')
-        db.commit()
+        try:
+            for sql in INDEXES_SQL:
+                cursor.execute(sql)
+            self.unchecked_fields = self._initialize_unique_indexes(cursor)
+            self.full_text = self._initialize_full_text(cursor)
+            db.commit()
+        except BaseException:
+            db.rollback()  # Заполнение индекса FTS открывает транзакцию: не оставляем её на подключении
+            raise
+
+    # Создание UNIQUE-индексов; возвращает поля, для которых это не удалось из-за повторов
+    # в уже записанных данных (уникальность новых значений в них проверяется запросом).
+    # Предупреждение об этом выдаётся через warnings, то есть один раз на поле за процесс.
+    @staticmethod
+    def _initialize_unique_indexes(cursor):
+        unchecked = []
+        for field in UNIQUE_FIELDS:
+            try:
+                cursor.execute(_unique_index_sql(field))
+            except sqlite3.IntegrityError:
+                cursor.execute(_unique_index_sql(field, unique=False))
+                unchecked.append(field)
+                warnings.warn(f"В поле {field} есть повторяющиеся значения: UNIQUE-индекс не создан.")
+        return tuple(unchecked)
+
+    # Создание полнотекстового индекса (при первом открытии - с заполнением из drivers).
+    # Если SQLite собран без FTS5, поиск работает перебором (см. search).
+    @staticmethod
+    def _initialize_full_text(cursor):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'drivers_fts'")
+        if cursor.fetchone() is None:
+            try:
+                cursor.execute(FTS_SQL[0])
+            except sqlite3.OperationalError:
+                return False
+            for sql in FTS_SQL[1:]:
+                cursor.execute(sql)
+        for sql in FTS_TRIGGERS_SQL:
+            cursor.execute(sql)
+        return True
 
     # Получить объект по ID
     def get_by_id(self, driver_id):
@@ -35,75 +198,339 @@ class DriverRepDB:
             cursor.execute("SELECT * FROM drivers WHERE driver_id = ?", (driver_id,))
             row = cursor.fetchone()
             if row:
-                # Создание объекта Driver с правильным использованием геттеров
-                return Driver(
-                    driver_id=row[0],
-                    last_name=row[1],
-                    first_name=row[2],
-                    patronymic=row[3],
-                    experience=row[4],
-                    phone_number=row[5],
-                    birthday=row[6],
-                    driver_license=row[7],
-                    vehicle_title=row[8],
-                    insurance_policy=row[9],
-                    license_plate=row[10]
-                )
+                return self._driver_from_row(row)
             raise ValueError(f"Driver с ID {driver_id} не найден.")
 
+    # Объект Driver из строки таблицы (с проверкой полей при verify_on_load)
+    def _driver_from_row(self, row):
+            if not self.verify_on_load:
+                return Driver.from_row(tuple(row))
+            # Создание объекта Driver с правильным использованием геттеров
+            return Driver(
+                driver_id=row[0],
+                last_name=row[1],
+                first_name=row[2],
+                patronymic=row[3],
+                experience=row[4],
+                phone_number=row[5],
+                birthday=row[6],
+                driver_license=row[7],
+                vehicle_title=row[8],
+                insurance_policy=row[9],
+                license_plate=row[10]
+            )
+
+    # Получить объект по значению уникального поля
+    def _get_by_unique(self, field, value):
+            db = DatabaseConnection(self.db_path)
+            cursor = db.get_cursor()
+            cursor.execute(f"SELECT * FROM drivers WHERE {field} = ? ORDER BY driver_id LIMIT 1", (value,))
+            row = cursor.fetchone()
+            if row:
+                return self._driver_from_row(row)
+            raise ValueError(f"Driver с {field} {value} не найден.")
+
+    # Получить объект по госномеру
+    def get_by_license_plate(self, license_plate):
+            return self._get_by_unique('license_plate', license_plate)
+
+    # Получить объект по номеру водительского удостоверения
+    def get_by_driver_license(self, driver_license):
+            return self._get_by_unique('driver_license', driver_license)
+
+    # Получить объект по номеру страхового полиса
+    def get_by_insurance_policy(self, insurance_policy):
+            return self._get_by_unique('insurance_policy', insurance_policy)
+
     # Получить список k по счету n объектов класса short
     def get_k_n_short_list(self, k, n):
             offset = (k - 1) * n
             db = DatabaseConnection(self.db_path)
             cursor = db.get_cursor()
-            cursor.execute("SELECT last_name, first_name, patronymic, experience FROM drivers LIMIT ? OFFSET ?", (n, offset))
+            cursor.execute("SELECT last_name, first_name, patronymic, experience FROM drivers ORDER BY driver_id LIMIT ? OFFSET ?", (n, offset))
             return [f"{row[0]} {row[1]} {row[2]} ({row[3]} лет стажа)" for row in cursor.fetchall()]
+
+    # Получить следующие n объектов класса short в порядке столбца order_by, начиная
+    # после позиции из token. Возвращает (список, token следующей страницы или None).
+    # Страница ищется по индексу от последнего ключа, поэтому её цена не зависит от номера.
+    def get_short_list_page(self, n, token=None, order_by='driver_id'):
+            if n <= 0:
+                raise ValueError("Размер страницы должен быть положительным.")
+            if order_by not in PAGE_ORDERS:
+                raise ValueError(f"Постраничная выборка по полю {order_by} не поддерживается.")
+            params = []
+            where = ""
+            if token is not None:
+                last_value, last_id = self._decode_page_token(token, order_by)
+                if order_by == 'driver_id':
+                    where, params = "WHERE driver_id > ?", [last_id]
+                else:
+                    where, params = f"WHERE ({order_by}, driver_id) > (?, ?)", [last_value, last_id]
+            order = "driver_id" if order_by == 'driver_id' else f"{order_by}, driver_id"
+            db = DatabaseConnection(self.db_path)
+            cursor = db.get_cursor()
+            cursor.execute(f'''
+                SELECT last_name, first_name, patronymic, experience, driver_id, {order_by} FROM drivers
+                {where} ORDER BY {order} LIMIT ?
+            ''', params + [n + 1])
+            rows = cursor.fetchall()
+            next_token = None
+            if len(rows) > n:
+                rows = rows[:n]
+                next_token = self._encode_page_token(order_by, rows[-1][5], rows[-1][4])
+            return [f"{row[0]} {row[1]} {row[2]} ({row[3]} лет стажа)" for row in rows], next_token
+
+    # Поочерёдная выдача водителей одним запросом: строки читаются порциями по batch_size
+    # через fetchmany, поэтому обход всей таблицы идёт в постоянной памяти.
+    # where - условия равенства {столбец: значение}, order_by - столбец или список столбцов.
+    # При as_tuples=True выдаются кортежи в порядке COLUMNS вместо объектов Driver.
+    # Аргументы проверяются при вызове, а запрос выполняется при первом обращении к итератору.
+    def iter_drivers(self, where=None, order_by='driver_id', batch_size=1000, as_tuples=False):
+            where = where or {}
+            order_columns = [order_by] if isinstance(order_by, str) else list(order_by)
+            for column in list(where) + order_columns:
+                if column not in COLUMNS:
+                    raise ValueError(f"Поле {column} не существует в таблице drivers.")
+            if batch_size <= 0:
+                raise ValueError("Размер порции должен быть положительным.")
+            conditions = " AND ".join(f"{column} = ?" for column in where)
+            sql = f"SELECT {', '.join(COLUMNS)} FROM drivers"
+            if conditions:
+                sql += f" WHERE {conditions}"
+            if order_columns:
+                sql += f" ORDER BY {', '.join(order_columns)}"
+            return self._iter_rows(sql, tuple(where.values()), batch_size, as_tuples)
+
+    def _iter_rows(self, sql, params, batch_size, as_tuples):
+            db = DatabaseConnection(self.db_path)
+            cursor = db.get_cursor()
+            try:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield tuple(row) if as_tuples else self._driver_from_row(row)
+            finally:
+                cursor.close()
+
+    # Поиск водителей по началу слов фамилии, имени и отчества (без учёта регистра, «ё» = «е»).
+    # Каждое слово запроса обязательно. Порядок: сначала водители, у которых первое слово
+    # запроса - фамилия целиком, затем - начало фамилии, затем остальные; внутри ступени - по ID.
+    def search(self, query, limit=20):
+            if limit <= 0:
+                raise ValueError("Число результатов поиска должно быть положительным.")
+            tiers = _fts_tiers(query)
+            if not tiers:
+                return []
+            db = DatabaseConnection(self.db_path)
+            cursor = db.get_cursor()
+            if not self.full_text:
+                # Без FTS5: перебор с LIKE (регистр не учитывается только для латиницы, а ФИО пишутся с заглавной)
+                tokens = [token.capitalize() for token in name_tokens(query)]
+                conditions = " AND ".join([LIKE_CONDITION] * len(tokens))
+                params = [f"{token}%" for token in tokens for _ in range(3)]
+                cursor.execute(f"SELECT {', '.join(COLUMNS)} FROM drivers WHERE {conditions} ORDER BY driver_id LIMIT ?",
+                               params + [limit])
+                rows = cursor.fetchall()
+            else:
+                rows = []
+                found = set()
+                for match in tiers:
+                    # Ступени вложены: найденные раньше строки попадутся снова, поэтому берём с запасом
+                    cursor.execute(f'''
+                        SELECT {', '.join(COLUMNS)} FROM drivers WHERE driver_id IN (
+                            SELECT rowid FROM drivers_fts WHERE drivers_fts MATCH ? ORDER BY rowid LIMIT ?
+                        ) ORDER BY driver_id
+                    ''', (match, limit + len(found)))
+                    for row in cursor.fetchall():
+                        if row[0] not in found and len(rows) < limit:
+                            found.add(row[0])
+                            rows.append(row)
+                    if len(rows) >= limit:
+                        break
+            return [self._driver_from_row(row) for row in rows]
+
+    # Непрозрачный token страницы: поле сортировки и ключ последней выданной строки
+    @staticmethod
+    def _encode_page_token(order_by, last_value, last_id):
+            data = json.dumps([order_by, last_value, last_id], ensure_ascii=False).encode('utf-8')
+            return base64.urlsafe_b64encode(data).decode('ascii')
+
+    @staticmethod
+    def _decode_page_token(token, order_by):
+            try:
+                token_order, last_value, last_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            except (ValueError, TypeError, UnicodeError):
+                raise ValueError("Некорректный token страницы.")
+            if token_order != order_by:
+                raise ValueError(f"Token страницы выдан для сортировки по полю {token_order}.")
+            return last_value, last_id
     
-    # Добавить объект в список (при добавлении сформировать новый ID)
-    def add_driver(self, driver):
+    # Повтор значения уникального поля у водителей из pairs - пар (driver_id или None, driver):
+    # ValueError с описанием или None. Значение, которое в базе принадлежит тому же
+    # водителю, повтором не считается. Поиск идёт по индексам полей, порциями значений.
+    @staticmethod
+    def _unique_error(cursor, pairs, fields=UNIQUE_FIELDS):
+            for field in fields:
+                getter = f'get_{field}'
+                owners = {}  # значение -> driver_id водителя из pairs
+                for driver_id, driver in pairs:
+                    value = getattr(driver, getter)()
+                    if value in owners and (driver_id is None or owners[value] != driver_id):
+                        return ValueError(f"Значение {field} {value} повторяется в записываемых данных.")
+                    owners[value] = driver_id
+                for values in _chunks(owners, MAX_VARIABLES):
+                    cursor.execute(
+                        f"SELECT driver_id, {field} FROM drivers WHERE {field} IN ({', '.join('?' * len(values))})",
+                        values
+                    )
+                    holders = {}
+                    for row in cursor.fetchall():
+                        holders.setdefault(row[1], set()).add(row[0])
+                    for value, ids in holders.items():
+                        if owners[value] not in ids:
+                            return ValueError(f"Driver с {field} {value} уже существует (ID {min(ids)}).")
+            return None
+
+    # Проверка уникальности перед записью для полей без UNIQUE-индекса
+    def _check_unchecked_fields(self, cursor, pairs):
+            if self.unchecked_fields:
+                error = self._unique_error(cursor, pairs, self.unchecked_fields)
+                if error is not None:
+                    raise error
+
+    # Запись одного водителя: sql с params в транзакции BEGIN IMMEDIATE вместе с проверкой полей
+    # без UNIQUE-индекса - иначе другое подключение могло бы записать то же значение между
+    # проверкой и записью. Нарушение UNIQUE-индекса переводится в ValueError. Если задан driver_id,
+    # а запрос не затронул ни одной строки - ValueError «не найден». При любой ошибке транзакция
+    # откатывается: подключение потока живёт долго, и оставленная открытой транзакция держала бы
+    # блокировку записи. Возвращает курсор после фиксации.
+    def _write_one(self, sql, params, pairs, driver_id=None):
             db = DatabaseConnection(self.db_path)
             cursor = db.get_cursor()
-            cursor.execute('''
-                INSERT INTO drivers (
-                    last_name, first_name, patronymic, experience, phone_number, birthday,
-                    driver_license, vehicle_title, insurance_policy, license_plate
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                driver.get_last_name(), driver.get_first_name(), driver.get_patronymic(), driver.get_experience(),
-                driver.get_phone_number(), driver.get_birthday(), driver.get_driver_license(),
-                driver.get_vehicle_title(), driver.get_insurance_policy(), driver.get_license_plate()
-            ))
-            db.commit()
+            db.begin_immediate()
+            try:
+                self._check_unchecked_fields(cursor, pairs)
+                cursor.execute(sql, params)
+                if driver_id is not None and cursor.rowcount == 0:
+                    raise ValueError(f"Driver с ID {driver_id} не найден.")
+                db.commit()
+            except sqlite3.IntegrityError:
+                db.rollback()
+                error = self._unique_error(cursor, pairs)
+                if error is None:
+                    raise
+                raise error from None
+            except BaseException:
+                db.rollback()
+                raise
+            return cursor
+
+    # Добавить объект в список (при добавлении сформировать новый ID)
+    def add_driver(self, driver):
+            cursor = self._write_one(INSERT_SQL, _driver_values(driver), [(None, driver)])
             driver.set_driver_id(cursor.lastrowid)
     
     # Заменить элемент списка по ID
     def update_driver(self, driver_id, new_driver):
-            db = DatabaseConnection(self.db_path)
-            cursor = db.get_cursor()
-            cursor.execute('''
-                UPDATE drivers SET
-                    last_name = ?, first_name = ?, patronymic = ?, experience = ?,
-                    phone_number = ?, birthday = ?, driver_license = ?, vehicle_title = ?,
-                    insurance_policy = ?, license_plate = ?
-                WHERE driver_id = ?
-            ''', (
-                new_driver.get_last_name(), new_driver.get_first_name(), new_driver.get_patronymic(),
-                new_driver.get_experience(), new_driver.get_phone_number(), new_driver.get_birthday(),
-                new_driver.get_driver_license(), new_driver.get_vehicle_title(),
-                new_driver.get_insurance_policy(), new_driver.get_license_plate(), driver_id
-            ))
-            if cursor.rowcount == 0:
-                raise ValueError(f"Driver с ID {driver_id} не найден.")
-            db.commit()
+            self._write_one(UPDATE_SQL, _driver_values(new_driver) + (driver_id,), [(driver_id, new_driver)], driver_id)
 
     # Удалить элемент списка по ID
     def delete_driver(self, driver_id):
+            self._write_one("DELETE FROM drivers WHERE driver_id = ?", (driver_id,), [], driver_id)
+
+    # Пакетная операция в одной транзакции: apply(cursor, chunk) выполняется для каждой
+    # порции из chunk_size элементов. При commit_every_chunk=True каждая порция фиксируется
+    # отдельно, что ограничивает длину транзакции. on_commit() вызывается после каждой
+    # успешной фиксации (при откате - нет).
+    def _run_in_chunks(self, items, chunk_size, commit_every_chunk, apply, on_commit=None):
             db = DatabaseConnection(self.db_path)
             cursor = db.get_cursor()
-            cursor.execute("DELETE FROM drivers WHERE driver_id = ?", (driver_id,))
-            if cursor.rowcount == 0:
-                raise ValueError(f"Driver с ID {driver_id} не найден.")
-            db.commit()
+            db.begin_immediate()
+            try:
+                for chunk in _chunks(items, chunk_size):
+                    apply(cursor, chunk)
+                    if commit_every_chunk:
+                        db.commit()
+                        if on_commit is not None:
+                            on_commit()
+                        db.begin_immediate()
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+            if on_commit is not None:
+                on_commit()
+
+    # ID из списка, которых нет в таблице
+    @staticmethod
+    def _missing_ids(cursor, driver_ids):
+            found = set()
+            for ids in _chunks(driver_ids, MAX_VARIABLES):
+                placeholders = ", ".join("?" * len(ids))
+                cursor.execute(f"SELECT driver_id FROM drivers WHERE driver_id IN ({placeholders})", ids)
+                found.update(row[0] for row in cursor.fetchall())
+            return [driver_id for driver_id in driver_ids if driver_id not in found]
+
+    # Добавить несколько объектов через executemany. Сформированные ID присваиваются объектам
+    # только после фиксации: при откате у водителей не остаётся ID, которых нет в базе.
+    def add_many(self, drivers, chunk_size=1000, commit_every_chunk=False):
+            pending = []  # (водитель, ID) ещё не зафиксированных порций
+
+            def assign_ids():
+                for driver, driver_id in pending:
+                    driver.set_driver_id(driver_id)
+                pending.clear()
+
+            def apply(cursor, chunk):
+                # Транзакция открыта через BEGIN IMMEDIATE, поэтому AUTOINCREMENT выдаёт
+                # порции подряд идущие ID, начиная со следующего значения sqlite_sequence
+                cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'drivers'")
+                row = cursor.fetchone()
+                first_id = (row[0] if row else 0) + 1
+                self._check_unchecked_fields(cursor, [(None, driver) for driver in chunk])
+                if self.full_text:
+                    cursor.execute("UPDATE drivers_fts_state SET deferred = 1")
+                try:
+                    cursor.executemany(INSERT_SQL, [_driver_values(driver) for driver in chunk])
+                except sqlite3.IntegrityError:
+                    # Строки порции до ошибочной уже вставлены с ID first_id, first_id + 1, ...
+                    error = self._unique_error(cursor, [(first_id + offset, driver) for offset, driver in enumerate(chunk)])
+                    if error is None:
+                        raise
+                    raise error from None
+                if self.full_text:
+                    cursor.execute(FTS_INDEX_FROM_SQL, (first_id,))
+                    cursor.execute("UPDATE drivers_fts_state SET deferred = 0")
+                pending.extend((driver, first_id + offset) for offset, driver in enumerate(chunk))
+            self._run_in_chunks(drivers, chunk_size, commit_every_chunk, apply, assign_ids)
+
+    # Заменить несколько элементов; updates - пары (driver_id, new_driver)
+    def update_many(self, updates, chunk_size=1000, commit_every_chunk=False):
+            def apply(cursor, chunk):
+                self._check_unchecked_fields(cursor, chunk)
+                try:
+                    cursor.executemany(UPDATE_SQL, [_driver_values(driver) + (driver_id,) for driver_id, driver in chunk])
+                except sqlite3.IntegrityError:
+                    error = self._unique_error(cursor, chunk)
+                    if error is None:
+                        raise
+                    raise error from None
+                if cursor.rowcount != len(chunk):
+                    missing = self._missing_ids(cursor, [driver_id for driver_id, _ in chunk])
+                    raise ValueError(f"Driver с ID {missing} не найден.")
+            self._run_in_chunks(updates, chunk_size, commit_every_chunk, apply)
+
+    # Удалить несколько элементов по ID
+    def delete_many(self, driver_ids, chunk_size=1000, commit_every_chunk=False):
+            def apply(cursor, chunk):
+                missing = self._missing_ids(cursor, chunk)
+                if missing:
+                    raise ValueError(f"Driver с ID {missing} не найден.")
+                cursor.executemany("DELETE FROM drivers WHERE driver_id = ?", [(driver_id,) for driver_id in chunk])
+            self._run_in_chunks(driver_ids, chunk_size, commit_every_chunk, apply)
 
     # Получить количество элементов
     def get_count(self):
@@ -111,3 +538,7 @@ class DriverRepDB:
             cursor = db.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM drivers")
             return cursor.fetchone()[0]
+
+
+# Замер времени всех открытых методов (см. Metrics)
+instrument(DriverRepDB)
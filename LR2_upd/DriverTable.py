@@ -0,0 +1,140 @@
+import sys
+from array import array
+from Driver import Driver
+
+# Поля фиксированного формата хранятся упакованными ASCII-строками известной длины
+PACKED_FIELDS = {
+    'birthday': 10,          # ДД.ММ.ГГГГ
+    'driver_license': 12,    # XX XX XXXXXX
+    'vehicle_title': 12,     # XX XX XXXXXX
+    'insurance_policy': 16,  # XXX XXXXXXXXXXXX
+}
+
+# Остальные строковые поля хранятся списками интернированных строк:
+# повторяющиеся имена, отчества и т.п. занимают память один раз
+INTERNED_FIELDS = ('last_name', 'first_name', 'patronymic', 'phone_number', 'license_plate')
+
+
+# Колоночное хранилище водителей. Ведёт себя как упорядоченный словарь
+# driver_id -> Driver, которым пользуется DriverRep, но хранит данные по столбцам:
+# array('q') для ID и стажа, упакованные и интернированные строки для остального.
+# Объекты Driver создаются только при обращении, без повторной проверки полей,
+# и являются копиями строки таблицы.
+class DriverTable:
+    def __init__(self, drivers=()):
+        self._ids = array('q')
+        self._experience = array('q')
+        self._packed = {field: bytearray() for field in PACKED_FIELDS}
+        self._interned = {field: [] for field in INTERNED_FIELDS}
+        self._rows = {}  # driver_id -> номер строки
+        self._dead = 0   # Удалённые строки (ID = 0) до следующего уплотнения
+        for driver in drivers:
+            self[driver.get_driver_id()] = driver
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, driver_id):
+        return driver_id in self._rows
+
+    # Значение поля в строке таблицы
+    def _value(self, field, row):
+        if field == 'driver_id':
+            return self._ids[row]
+        if field == 'experience':
+            return self._experience[row]
+        width = PACKED_FIELDS.get(field)
+        if width is not None:
+            return self._packed[field][row * width:(row + 1) * width].decode('ascii')
+        return self._interned[field][row]
+
+    def _packed_value(self, field, value):
+        encoded = value.encode('ascii', errors='replace')
+        if len(encoded) != PACKED_FIELDS[field] or not value.isascii():
+            raise ValueError(f"Значение '{value}' поля {field} не подходит для колоночного хранения.")
+        return encoded
+
+    def _view(self, row):
+        return Driver.from_row((
+            self._ids[row],
+            self._value('last_name', row),
+            self._value('first_name', row),
+            self._value('patronymic', row),
+            self._experience[row],
+            self._value('phone_number', row),
+            self._value('birthday', row),
+            self._value('driver_license', row),
+            self._value('vehicle_title', row),
+            self._value('insurance_policy', row),
+            self._value('license_plate', row),
+        ))
+
+    def get(self, driver_id, default=None):
+        row = self._rows.get(driver_id)
+        return default if row is None else self._view(row)
+
+    def __getitem__(self, driver_id):
+        return self._view(self._rows[driver_id])
+
+    # Добавление в конец или замена строки на месте
+    def __setitem__(self, driver_id, driver):
+        packed = {field: self._packed_value(field, getattr(driver, f'get_{field}')()) for field in PACKED_FIELDS}
+        row = self._rows.get(driver_id)
+        if row is None:
+            self._rows[driver_id] = len(self._ids)
+            self._ids.append(driver_id)
+            self._experience.append(driver.get_experience())
+            for field, value in packed.items():
+                self._packed[field] += value
+            for field in INTERNED_FIELDS:
+                self._interned[field].append(sys.intern(getattr(driver, f'get_{field}')()))
+            return
+        self._experience[row] = driver.get_experience()
+        for field, value in packed.items():
+            width = PACKED_FIELDS[field]
+            self._packed[field][row * width:(row + 1) * width] = value
+        for field in INTERNED_FIELDS:
+            self._interned[field][row] = sys.intern(getattr(driver, f'get_{field}')())
+
+    def pop(self, driver_id, default=None):
+        row = self._rows.pop(driver_id, None)
+        if row is None:
+            return default
+        driver = self._view(row)
+        self._ids[row] = 0
+        self._dead += 1
+        if self._dead > len(self._ids) // 2:
+            self._reorder([r for r in range(len(self._ids)) if self._ids[r]])
+        return driver
+
+    # Живые строки в порядке таблицы
+    def _live_rows(self):
+        return (row for row in range(len(self._ids)) if self._ids[row])
+
+    def values(self):
+        for row in self._live_rows():
+            yield self._view(row)
+
+    # Пары (driver_id, значение поля) без создания объектов Driver
+    def field_items(self, field):
+        for row in self._live_rows():
+            yield self._ids[row], self._value(field, row)
+
+    # Сортировка строк по полю без создания объектов Driver
+    def sort_by(self, field):
+        rows = list(self._live_rows())
+        rows.sort(key=lambda row: self._value(field, row))
+        self._reorder(rows)
+
+    # Перестроить столбцы в заданном порядке строк (заодно выбрасывает удалённые)
+    def _reorder(self, rows):
+        self._ids = array('q', (self._ids[row] for row in rows))
+        self._experience = array('q', (self._experience[row] for row in rows))
+        for field, width in PACKED_FIELDS.items():
+            column = self._packed[field]
+            self._packed[field] = bytearray(b''.join(column[row * width:(row + 1) * width] for row in rows))
+        for field in INTERNED_FIELDS:
+            column = self._interned[field]
+            self._interned[field] = [column[row] for row in rows]
+        self._rows = {driver_id: row for row, driver_id in enumerate(self._ids)}
+        self._dead = 0
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+
+# Ограниченный по размеру кэш с вытеснением давно не использованных записей (LRU)
+# и счётчиками попаданий, промахов и вытеснений
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    # Значение по ключу или default (попадание переносит запись в конец очереди)
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    # Удалить записи, для ключа и значения которых predicate(key, value) истинно
+    def discard_where(self, predicate):
+        with self._lock:
+            for key in [key for key, value in self._items.items() if predicate(key, value)]:
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,210 @@
+import inspect
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+
+# Лёгкие метрики (счётчики и гистограммы задержек) с выводом в текстовом формате Prometheus.
+# Замер одного вызова - два perf_counter() и одно обновление гистограммы под блокировкой,
+# поэтому инструментирование можно не выключать; при необходимости Metrics.enabled = False.
+enabled = True
+
+# Границы корзин гистограмм задержек, секунды
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value, quote=True):
+    value = str(value).replace('\\', '\\\\').replace('\n', '\\n')
+    return value.replace('"', '\\"') if quote else value
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Общая основа метрик: имя, описание и значения по наборам меток
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [
+            f"# HELP {self.name} {_escape(self.documentation, quote=False)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+# Монотонно растущий счётчик
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._children[label_values] = self._children.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._children.get(label_values, 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._children.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_number(value)}")
+        return lines
+
+
+# Гистограмма: число наблюдений по корзинам, их сумма и количество
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        super(Histogram, self).__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        i = bisect_left(self.buckets, value)  # Первая корзина с границей >= value (последняя - +Inf)
+        with self._lock:
+            child = self._children.get(label_values)
+            if child is None:
+                child = self._children[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            child[0][i] += 1
+            child[1] += value
+            child[2] += 1
+
+    # (сумма, количество) наблюдений для набора меток
+    def totals(self, *label_values):
+        child = self._children.get(label_values)
+        return (child[1], child[2]) if child else (0.0, 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted((label_values, (list(child[0]), child[1], child[2]))
+                           for label_values, child in self._children.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, label_values, [('le', _format_number(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# Набор метрик процесса
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    # Метрика по имени; при первом обращении создаётся вызовом factory()
+    def get_or_create(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.get_or_create(name, lambda: Counter(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        return self.get_or_create(name, lambda: Histogram(name, documentation, label_names, buckets))
+
+    # Все метрики в текстовом формате Prometheus (version 0.0.4)
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return ''.join(line + '\n' for _, metric in metrics for line in metric.render())
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+OPERATION_SECONDS = REGISTRY.histogram(
+    'driver_operation_seconds', 'Время вызова методов репозиториев, модели и представления',
+    ('component', 'operation'))
+OPERATION_ERRORS = REGISTRY.counter(
+    'driver_operation_errors_total', 'Вызовы, завершившиеся исключением', ('component', 'operation'))
+
+
+# Обёртка, замеряющая каждый вызов function в OPERATION_SECONDS.
+# Если вызов вернул генератор, замер продолжается до конца обхода (или закрытия генератора)
+# и учитывает только время внутри генератора, без времени обработки элементов вызывающим.
+def timed(function, component, operation=None):
+    operation = operation or function.__name__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        observe = True
+        try:
+            result = function(*args, **kwargs)
+            if inspect.isgenerator(result):
+                observe = False
+                return _timed_iteration(result, perf_counter() - start, component, operation)
+            return result
+        except Exception:
+            OPERATION_ERRORS.inc(component, operation)
+            raise
+        finally:
+            if observe:
+                OPERATION_SECONDS.observe(perf_counter() - start, component, operation)
+    return wrapper
+
+
+# Обход генератора с суммированием времени вызовов next(); elapsed - время создания генератора
+def _timed_iteration(generator, elapsed, component, operation):
+    try:
+        while True:
+            start = perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            except Exception:
+                OPERATION_ERRORS.inc(component, operation)
+                raise
+            finally:
+                elapsed += perf_counter() - start
+            yield item
+    finally:
+        start = perf_counter()
+        generator.close()  # Брошенный обход: генератор освобождает ресурсы (курсор и т.п.) сразу
+        OPERATION_SECONDS.observe(elapsed + perf_counter() - start, component, operation)
+
+
+# Замер всех открытых методов класса (включая статические и методы класса и генераторы,
+# см. timed). Асинхронные функции не оборачиваются.
+def instrument(cls, component=None):
+    component = component or cls.__name__
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith('_'):
+            continue
+        wrapper_type = type(attribute) if isinstance(attribute, (staticmethod, classmethod)) else None
+        function = attribute.__func__ if wrapper_type else attribute
+        if not inspect.isfunction(function) \
+                or inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function):
+            continue
+        wrapped = timed(function, component, name)
+        setattr(cls, name, wrapper_type(wrapped) if wrapper_type else wrapped)
+    return cls
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Driver import Driver  # noqa: E402
+from DriverRepBenchmark import generate_drivers  # noqa: E402
+from DatabaseConnection import DatabaseConnection  # noqa: E402
+
+
+# Объекты Driver с ID start_id, start_id + 1, ... (значения уникальных полей не повторяются)
+def make_drivers(count, start_id=1, seed=0):
+    return [Driver.from_trusted_dict(data) for data in generate_drivers(count, seed, start_id)]
+
+
+# Новый водитель без ID (для add_driver)
+def new_driver(i, **changes):
+    data = dict(next(generate_drivers(1, 0, i)), driver_id=None)
+    data.update(changes)
+    return Driver.from_trusted_dict(data)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "drivers.db")
+    DatabaseConnection.close_all()
@@ -0,0 +1,78 @@
+import pytest
+
+from DriverRep import DriverRepDBAdapter
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers, new_driver
+
+
+@pytest.fixture
+def adapter(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(20))
+    return DriverRepDBAdapter(repository, cache_size=100)
+
+
+def test_cached_driver_is_a_fresh_copy(adapter):
+    adapter.get_by_id(1).set_driver_id(999)
+    assert adapter.get_by_id(1).get_driver_id() == 1
+    assert adapter.cache_stats()["drivers"]["hits"] == 1
+
+
+def test_update_invalidates_driver_and_pages(adapter):
+    adapter.get_by_id(3)
+    page = adapter.get_k_n_short_list(1, 5)
+    adapter.update_driver(3, new_driver(100, last_name="Петров"))
+    assert adapter.get_by_id(3).get_last_name() == "Петров"
+    assert adapter.get_k_n_short_list(1, 5) != page
+    assert adapter.get_k_n_short_list(1, 5)[2].startswith("Петров ")
+
+
+def test_delete_invalidates_driver_count_and_keyset_pages(adapter):
+    adapter.get_by_id(20)
+    assert adapter.get_count() == 20
+    _, token = adapter.get_short_list_page(10)
+    last_page, _ = adapter.get_short_list_page(10, token)
+    adapter.delete_driver(20)
+    with pytest.raises(ValueError):
+        adapter.get_by_id(20)
+    assert adapter.get_count() == 19
+    assert len(adapter.get_short_list_page(10, token)[0]) == len(last_page) - 1
+
+
+def test_add_invalidates_tail_pages_only(adapter):
+    adapter.get_count()  # Без известного количества сбрасываются все страницы
+    first = adapter.get_k_n_short_list(1, 5)
+    tail = adapter.get_k_n_short_list(4, 6)  # Записи 19-24: хвост таблицы
+    adapter.add_driver(new_driver(100))
+    assert adapter.get_count() == 21
+    assert adapter.get_k_n_short_list(1, 5) == first
+    assert len(adapter.get_k_n_short_list(4, 6)) == len(tail) + 1
+    stats = adapter.cache_stats()["pages"]
+    assert stats["hits"] == 1
+
+
+def test_bulk_writes_invalidate_cache(adapter):
+    assert adapter.get_count() == 20
+    adapter.get_by_id(1)
+    adapter.update_many([(1, new_driver(101, last_name="Сидоров"))])
+    assert adapter.get_by_id(1).get_last_name() == "Сидоров"
+    adapter.delete_many([1, 2])
+    assert adapter.get_count() == 18
+    drivers = [new_driver(200 + i) for i in range(3)]
+    adapter.add_many(drivers)
+    assert adapter.get_count() == 21
+    assert adapter.get_by_id(drivers[0].get_driver_id()).get_last_name() == drivers[0].get_last_name()
+
+
+def test_delete_many_with_repeated_ids_keeps_count(adapter):
+    assert adapter.get_count() == 20
+    adapter.delete_many([1, 1, 2])
+    assert adapter.get_count() == 18 == adapter._driver_rep_db.get_count()
+
+
+def test_failed_write_still_invalidates(adapter):
+    adapter.get_by_id(1)
+    with pytest.raises(ValueError):
+        adapter.update_driver(1, new_driver(1, license_plate=adapter.get_by_id(2).get_license_plate()))
+    assert adapter.get_by_id(1).to_dict() == make_drivers(20)[0].to_dict()
+    assert adapter.get_count() == 20
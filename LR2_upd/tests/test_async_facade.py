@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+
+from AsyncDriverRep import AsyncDriverRep, AsyncDriverRepDB
+from DriverRep import DriverRep, JSONStrategy
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers, new_driver
+
+
+@pytest.fixture
+def repository(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(50))
+    return repository
+
+
+def test_coalesced_reads_get_own_copies(repository):
+    async def main():
+        async with AsyncDriverRepDB(repository) as facade:
+            return await asyncio.gather(*(facade.get_by_id(7) for _ in range(20)))
+
+    drivers = asyncio.run(main())
+    assert len({id(driver) for driver in drivers}) == len(drivers)
+    assert all(driver.to_dict() == drivers[0].to_dict() for driver in drivers)
+
+
+def test_write_is_visible_to_later_reads(repository):
+    async def main():
+        async with AsyncDriverRepDB(repository) as facade:
+            await facade.update_driver(1, new_driver(100, last_name="Петров"))
+            return await facade.get_by_id(1), await facade.get_count()
+
+    driver, count = asyncio.run(main())
+    assert driver.get_last_name() == "Петров" and count == 50
+
+
+def test_iteration_runs_on_one_thread_and_closes_generator():
+    threads, closed = set(), []
+
+    def generate():
+        try:
+            for i in range(100):
+                threads.add(threading.get_ident())
+                yield i
+        finally:
+            closed.append(threading.get_ident())
+
+    async def main():
+        async with AsyncDriverRepDB(None, max_workers=4) as facade:
+            iterator = facade._iterate(generate(), 3)
+            items = []
+            async for item in iterator:
+                items.append(item)
+                if len(items) == 10:
+                    break
+            await iterator.aclose()
+            return items
+
+    assert asyncio.run(main()) == list(range(10))
+    assert len(threads) == 1 and closed == list(threads)
+
+
+def test_async_iter_drivers(repository):
+    async def main():
+        async with AsyncDriverRepDB(repository) as facade:
+            with pytest.raises(ValueError):
+                facade.iter_drivers(order_by="no_such_column")
+            return [driver.get_driver_id() async for driver in facade.iter_drivers(batch_size=7)]
+
+    assert asyncio.run(main()) == list(range(1, 51))
+
+
+def test_concurrent_iterations_share_bounded_threads(repository):
+    async def consume(facade):
+        ids = []
+        async for driver in facade.iter_drivers(batch_size=5):
+            ids.append(driver.get_driver_id())
+            await asyncio.sleep(0)
+        return ids
+
+    async def main():
+        async with AsyncDriverRepDB(repository, max_iterations=2) as facade:
+            results = await asyncio.gather(*(consume(facade) for _ in range(10)))
+            iteration_threads = {thread.ident for executor in facade._iteration_executors
+                                 for thread in executor._threads}
+            return results, iteration_threads
+
+    results, iteration_threads = asyncio.run(main())
+    assert all(ids == list(range(1, 51)) for ids in results)
+    assert len(iteration_threads) == 2
+
+
+def test_file_repository_facade(tmp_path):
+    rep = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+
+    async def main():
+        async with AsyncDriverRep(rep) as facade:
+            await asyncio.gather(*(facade.add_driver(new_driver(i)) for i in range(1, 6)))
+            return await facade.get_count(), await facade.search(rep.get_by_id(1).get_last_name())
+
+    count, found = asyncio.run(main())
+    assert count == 5 and found
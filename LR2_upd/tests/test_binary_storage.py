@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from DriverRep import DriverRep, JSONStrategy
+from DriverRepBinary import BinaryStrategy, MappedDriverTable, convert_to_binary
+from conftest import make_drivers, new_driver
+
+
+def snapshot(rep):
+    return [driver.to_dict() for driver in rep.drivers]
+
+
+@pytest.fixture
+def binary_path(tmp_path):
+    path = str(tmp_path / "drivers.bin")
+    BinaryStrategy().write(path, [driver.to_dict() for driver in make_drivers(20)])
+    return path
+
+
+def open_binary(path, **options):
+    return DriverRep(path, BinaryStrategy(), **options)
+
+
+def test_binary_file_round_trip(binary_path):
+    rep = open_binary(binary_path)
+    assert isinstance(rep._drivers, MappedDriverTable)
+    assert snapshot(rep) == [driver.to_dict() for driver in make_drivers(20)]
+    assert rep.get_by_id(7).to_dict() == make_drivers(20)[6].to_dict()
+    with pytest.raises(ValueError):
+        rep.get_by_id(21)
+    rep._drivers.close()
+
+
+def test_binary_delete_and_compaction(binary_path):
+    rep = open_binary(binary_path, journal=True)
+    rep.delete_driver(3)
+    rep.delete_driver(20)
+    rep.update_driver(5, new_driver(100, last_name="Петров"))
+    rep.add_driver(new_driver(101))
+    expected = snapshot(rep)
+    assert rep.get_count() == 19
+    assert [driver["driver_id"] for driver in expected][-1] == 21  # Новый ID после удалённого последнего
+
+    reopened = open_binary(binary_path, journal=True)  # Журнал поверх неизменённого файла
+    assert snapshot(reopened) == expected
+    reopened._drivers.close()
+
+    size = os.path.getsize(binary_path)
+    rep.compact()
+    assert os.path.getsize(f"{binary_path}.journal") == 0
+    assert os.path.getsize(binary_path) != size
+    compacted = open_binary(binary_path)
+    assert snapshot(compacted) == expected
+    assert 3 not in compacted._drivers and 21 in compacted._drivers
+    for repository in (rep, compacted):
+        repository._drivers.close()
+
+
+def test_sort_then_compact_binary(binary_path):
+    rep = open_binary(binary_path)
+    rep.sort_by_field("last_name")
+    rep.compact()  # Отображение файла закрыто сортировкой, поэтому файл можно подменить
+    names = [driver.get_last_name() for driver in open_binary(binary_path).drivers]
+    assert names == sorted(names)
+
+
+def test_convert_json_to_binary(tmp_path):
+    source = str(tmp_path / "drivers.json")
+    target = str(tmp_path / "drivers.bin")
+    JSONStrategy().write(source, [driver.to_dict() for driver in make_drivers(5)])
+    convert_to_binary(source, target)
+    assert snapshot(open_binary(target)) == [driver.to_dict() for driver in make_drivers(5)]
+
+
+def test_non_binary_file_is_rejected(tmp_path):
+    path = tmp_path / "drivers.bin"
+    path.write_bytes(b"not a driver file" * 4)
+    with pytest.raises(ValueError):
+        MappedDriverTable(str(path))
@@ -0,0 +1,100 @@
+import pytest
+
+from DatabaseConnection import DatabaseConnection
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers, new_driver
+
+
+def ids(repository):
+    return [driver.get_driver_id() for driver in repository.iter_drivers()]
+
+
+def test_add_many_assigns_consecutive_ids(db_path):
+    repository = DriverRepDB(db_path)
+    drivers = make_drivers(25)
+    for driver in drivers:
+        driver.set_driver_id(None)
+    repository.add_many(drivers, chunk_size=10)
+    assert [driver.get_driver_id() for driver in drivers] == list(range(1, 26))
+    assert ids(repository) == list(range(1, 26))
+
+
+def test_add_many_rolls_back_whole_batch(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(3))
+    drivers = make_drivers(10, start_id=10)
+    for driver in drivers:
+        driver.set_driver_id(None)
+    drivers.append(new_driver(100, license_plate=drivers[0].get_license_plate()))
+
+    with pytest.raises(ValueError, match="license_plate"):
+        repository.add_many(drivers, chunk_size=4)
+    assert ids(repository) == [1, 2, 3]
+    assert all(driver.get_driver_id() is None for driver in drivers)  # ID выдаются только после фиксации
+    # Полнотекстовый индекс откатывается вместе с таблицей
+    assert all(driver.get_driver_id() <= 3 for driver in repository.search(drivers[0].get_last_name(), 100))
+
+
+def test_add_many_with_chunk_commits_keeps_committed_chunks(db_path):
+    repository = DriverRepDB(db_path)
+    drivers = make_drivers(10)
+    for driver in drivers:
+        driver.set_driver_id(None)
+    drivers[7] = new_driver(100, license_plate=drivers[1].get_license_plate())
+
+    with pytest.raises(ValueError):
+        repository.add_many(drivers, chunk_size=3, commit_every_chunk=True)
+    assert ids(repository) == [1, 2, 3, 4, 5, 6]
+    assert [driver.get_driver_id() for driver in drivers[:6]] == [1, 2, 3, 4, 5, 6]
+    assert all(driver.get_driver_id() is None for driver in drivers[6:])
+
+
+def test_duplicate_inside_one_batch_is_reported(db_path):
+    repository = DriverRepDB(db_path)
+    drivers = [new_driver(1), new_driver(2)]
+    drivers.append(new_driver(3, insurance_policy=drivers[0].get_insurance_policy()))
+    with pytest.raises(ValueError, match="повторяется в записываемых данных"):
+        repository.add_many(drivers)
+    assert repository.get_count() == 0
+
+
+def test_update_many_and_delete_many(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(5))
+    repository.update_many([(2, new_driver(20, last_name="Петров")), (4, new_driver(40, last_name="Сидоров"))])
+    assert [repository.get_by_id(i).get_last_name() for i in (2, 4)] == ["Петров", "Сидоров"]
+
+    with pytest.raises(ValueError, match=r"ID \[99\]"):
+        repository.update_many([(1, new_driver(10)), (99, new_driver(99))])
+    assert repository.get_by_id(1).to_dict() == make_drivers(5)[0].to_dict()  # Откат всей пачки
+
+    repository.delete_many([1, 3])
+    assert ids(repository) == [2, 4, 5]
+    with pytest.raises(ValueError, match=r"ID \[3\]"):
+        repository.delete_many([2, 3])
+    assert ids(repository) == [2, 4, 5]
+
+
+def test_missing_ids_with_more_than_999_parameters(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(5))
+    with pytest.raises(ValueError) as error:
+        repository.delete_many(list(range(1, 3000)), chunk_size=5000)
+    assert str(error.value) == f"Driver с ID {list(range(6, 3000))} не найден."
+    assert repository.get_count() == 5
+
+
+@pytest.mark.parametrize("write", [
+    lambda repository: repository.add_many([new_driver(100)]),
+    lambda repository: repository.update_many([(1, new_driver(100))]),
+    lambda repository: repository.delete_many([1]),
+    lambda repository: repository.add_driver(new_driver(100)),
+])
+def test_write_after_unfinished_transaction(db_path, write):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(3))
+    # Незавершённая транзакция на подключении потока (например, после сбоя) откатывается
+    DatabaseConnection(db_path).get_cursor().execute("DELETE FROM drivers WHERE driver_id = 3")
+    write(repository)
+    assert 3 in ids(repository)
+    assert not DatabaseConnection(db_path).connection.in_transaction
@@ -0,0 +1,42 @@
+import os
+
+from DriverRep import DriverRep, JSONStrategy
+from DriverTable import DriverTable
+from conftest import make_drivers, new_driver
+
+
+def snapshot(rep):
+    return [driver.to_dict() for driver in rep.drivers]
+
+
+def test_columnar_delete_and_compaction(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    JSONStrategy().write(path, [driver.to_dict() for driver in make_drivers(20)])
+    rep = DriverRep(path, JSONStrategy(), journal=True, columnar=True)
+    assert isinstance(rep._drivers, DriverTable)
+    rep.delete_driver(1)
+    rep.delete_driver(10)
+    rep.update_driver(2, new_driver(100, experience=33))
+    rep.add_driver(new_driver(101))
+    expected = snapshot(rep)
+    assert len(expected) == 19 and rep.get_by_id(2).get_experience() == 33
+
+    assert snapshot(DriverRep(path, JSONStrategy(), journal=True, columnar=True)) == expected
+    rep.compact()
+    assert os.path.getsize(f"{path}.journal") == 0
+    reopened = DriverRep(path, JSONStrategy(), columnar=True)
+    assert snapshot(reopened) == expected
+    # Колоночное и построчное хранилища дают одинаковые данные
+    assert snapshot(DriverRep(path, JSONStrategy())) == expected
+
+
+def test_columnar_sort_and_range_index(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    JSONStrategy().write(path, [driver.to_dict() for driver in make_drivers(50)])
+    columnar = DriverRep(path, JSONStrategy(), columnar=True, indexes=("experience",))
+    plain = DriverRep(path, JSONStrategy(), indexes=("experience",))
+    assert [d.get_driver_id() for d in columnar.get_range("experience", 5, 25)] == \
+        [d.get_driver_id() for d in plain.get_range("experience", 5, 25)]
+    columnar.sort_by_field("first_name")
+    plain.sort_by_field("first_name")
+    assert [d.get_first_name() for d in columnar.drivers] == [d.get_first_name() for d in plain.drivers]
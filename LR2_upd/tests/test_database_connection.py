@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from DatabaseConnection import DatabaseConnection
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers, new_driver
+
+
+def in_thread(function):
+    # Результат или исключение function(), выполненной в отдельном потоке
+    result = {}
+
+    def run():
+        try:
+            result["value"] = function()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def test_connection_per_thread(db_path):
+    pool = DatabaseConnection(db_path)
+    assert pool.connection is pool.connection
+    other = []
+    barrier = threading.Barrier(2)
+
+    def hold():
+        other.append(pool.connection)
+        barrier.wait()  # Поток жив, пока основной поток берёт своё подключение
+        barrier.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    barrier.wait()
+    assert other[0] is not pool.connection
+    barrier.wait()
+    thread.join()
+
+
+def test_pool_per_database(tmp_path, monkeypatch):
+    first = DatabaseConnection(str(tmp_path / "a.db"))
+    second = DatabaseConnection(str(tmp_path / "b.db"))
+    try:
+        assert first is not second
+        assert first.connection is not second.connection
+        monkeypatch.chdir(tmp_path)
+        assert DatabaseConnection("a.db") is first  # Один файл - один пул
+        first.get_cursor().execute("CREATE TABLE t (x)")
+        assert not second.table_exists("t")
+    finally:
+        DatabaseConnection.close_all()
+
+
+def test_dead_thread_connection_is_reused_after_rollback(db_path):
+    pool = DatabaseConnection(db_path)
+    pool.get_cursor().execute("CREATE TABLE t (x)")
+
+    def leave_open_transaction():
+        pool.get_cursor().execute("INSERT INTO t VALUES (1)")
+        return pool.connection
+
+    connection = in_thread(leave_open_transaction)
+    assert in_thread(lambda: pool.connection) is connection
+    assert not connection.in_transaction
+    assert pool.get_cursor().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_pragmas(db_path):
+    cursor = DatabaseConnection(db_path).get_cursor()
+    assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert cursor.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert cursor.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_close_all_forgets_pools(db_path):
+    pool = DatabaseConnection(db_path)
+    connection = pool.connection
+    DatabaseConnection.close_all()
+    assert DatabaseConnection(db_path) is not pool
+    assert DatabaseConnection(db_path).connection is not connection
+
+
+@pytest.fixture
+def repository(db_path, monkeypatch):
+    # Короткое ожидание блокировки: оставленная открытая транзакция проявится сразу
+    pragmas = tuple(p for p in DatabaseConnection.PRAGMAS if "busy_timeout" not in p)
+    monkeypatch.setattr(DatabaseConnection, "PRAGMAS", pragmas + ("PRAGMA busy_timeout=200",))
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(3))
+    return repository
+
+
+@pytest.mark.parametrize("fail", [
+    lambda repository: repository.delete_driver(999),
+    lambda repository: repository.update_driver(999, new_driver(100)),
+    lambda repository: repository.add_driver(new_driver(100, license_plate=make_drivers(1)[0].get_license_plate())),
+    lambda repository: repository.delete_many([1, 999]),
+    lambda repository: repository.update_many([(999, new_driver(100))]),
+])
+def test_failed_write_leaves_no_transaction(repository, db_path, fail):
+    with pytest.raises(ValueError):
+        fail(repository)
+    assert not DatabaseConnection(db_path).connection.in_transaction
+    # Запись из другого потока не ждёт блокировки, запись из этого потока начинает новую транзакцию
+    in_thread(lambda: repository.add_driver(new_driver(101)))
+    repository.add_driver(new_driver(102))
+    repository.add_many([new_driver(103)])
+    assert repository.get_count() == 6
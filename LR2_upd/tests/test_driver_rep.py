@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from DriverRep import DriverRep, JSONStrategy
+from conftest import make_drivers, new_driver
+
+
+def test_next_id_survives_deleting_the_last_driver(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    rep = DriverRep(path, JSONStrategy())
+    for i in range(3):
+        rep.add_driver(new_driver(i + 1))
+    rep.delete_driver(3)
+
+    reopened = DriverRep(path, JSONStrategy())
+    driver = new_driver(4)
+    reopened.add_driver(driver)
+    assert driver.get_driver_id() == 4  # ID удалённого водителя не выдаётся повторно
+    with open(f"{path}.meta", encoding="utf-8") as file:
+        assert json.load(file) == {"next_id": 5}
+
+
+def test_next_id_is_restored_from_journal(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    rep = DriverRep(path, JSONStrategy(), journal=True)
+    rep.add_driver(new_driver(1))
+    rep.add_driver(new_driver(2))
+    rep.delete_driver(2)
+
+    driver = new_driver(3)
+    DriverRep(path, JSONStrategy(), journal=True).add_driver(driver)
+    assert driver.get_driver_id() == 3
+
+
+def test_records_without_id_get_new_ids(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    data = [driver.to_dict() for driver in make_drivers(3)]
+    del data[1]["driver_id"]
+    JSONStrategy().write(path, data)
+
+    rep = DriverRep(path, JSONStrategy())
+    assert sorted(driver.get_driver_id() for driver in rep.drivers) == [1, 3, 4]
+
+
+def test_get_update_delete_by_id(tmp_path):
+    rep = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+    for i in range(3):
+        rep.add_driver(new_driver(i + 1))
+
+    rep.update_driver(2, new_driver(10, last_name="Петров"))
+    assert rep.get_by_id(2).get_last_name() == "Петров"
+    assert [driver.get_driver_id() for driver in rep.drivers] == [1, 2, 3]  # Замена сохраняет позицию
+    rep.delete_driver(2)
+    with pytest.raises(ValueError):
+        rep.get_by_id(2)
+    with pytest.raises(ValueError):
+        rep.update_driver(2, new_driver(11))
+    assert rep.get_count() == 2
+
+
+def test_drivers_cannot_be_mutated(tmp_path):
+    rep = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+    rep.add_driver(new_driver(1))
+    with pytest.raises(AttributeError):
+        rep.drivers.append(new_driver(2))
@@ -0,0 +1,44 @@
+import pytest
+
+from DriverRepDB import COLUMNS, DriverRepDB
+from conftest import make_drivers
+
+
+@pytest.fixture
+def repository(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(30))
+    return repository
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_streams_whole_table(repository, batch_size):
+    drivers = list(repository.iter_drivers(batch_size=batch_size))
+    assert [driver.to_dict() for driver in drivers] == [driver.to_dict() for driver in make_drivers(30)]
+
+
+def test_filter_order_and_tuples(repository):
+    experience = repository.get_by_id(5).get_experience()
+    expected = sorted((d for d in make_drivers(30) if d.get_experience() == experience),
+                      key=lambda d: (d.get_last_name(), d.get_driver_id()))
+    rows = list(repository.iter_drivers({"experience": experience}, ["last_name", "driver_id"], as_tuples=True))
+    assert [row[0] for row in rows] == [driver.get_driver_id() for driver in expected]
+    assert all(len(row) == len(COLUMNS) for row in rows)
+
+
+def test_arguments_are_checked_when_called(repository):
+    # Ошибка возникает при вызове, а не при первом next()
+    with pytest.raises(ValueError):
+        repository.iter_drivers(order_by="no_such_column")
+    with pytest.raises(ValueError):
+        repository.iter_drivers(where={"1 = 1 OR driver_id": 1})
+    with pytest.raises(ValueError):
+        repository.iter_drivers(batch_size=0)
+
+
+def test_abandoned_iteration_does_not_block_writes(repository):
+    iterator = repository.iter_drivers(batch_size=5)
+    next(iterator)
+    iterator.close()
+    repository.delete_driver(1)
+    assert repository.get_count() == 29
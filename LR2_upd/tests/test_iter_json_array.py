@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from DriverRep import DriverRep, JSONStrategy, iter_json_array
+from conftest import make_drivers
+
+ITEMS = [1, -2.5, 1e10, "строка, с ] и [", {"a": [1, {"b": "}"}]}, [], None, True, 123456789]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_items_split_across_chunks(chunk_size, indent):
+    text = json.dumps(ITEMS, ensure_ascii=False, indent=indent)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_number_cut_at_chunk_boundary_is_read_whole(chunk_size):
+    # Число на границе порции нельзя разбирать, пока не дочитан следующий символ
+    assert list(iter_json_array(io.StringIO("[12345,678]"), chunk_size)) == [12345, 678]
+    assert list(iter_json_array(io.StringIO("[12345]"), chunk_size)) == [12345]
+
+
+@pytest.mark.parametrize("text", ["", "  \n"])
+def test_empty_file(text):
+    assert list(iter_json_array(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] "])
+def test_empty_array(text):
+    assert list(iter_json_array(io.StringIO(text), 1)) == []
+
+
+@pytest.mark.parametrize("text", ["{}", "[1 2]", "[1,", "[1", '["abc'])
+def test_malformed_input(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 2))
+
+
+def test_json_strategy_streams_drivers(tmp_path):
+    path = str(tmp_path / "drivers.json")
+    drivers = make_drivers(50)
+    JSONStrategy().write(path, [driver.to_dict() for driver in drivers])
+
+    loaded = list(JSONStrategy().iter_drivers(path, chunk_size=17))
+    assert [driver.to_dict() for driver in loaded] == [driver.to_dict() for driver in drivers]
+
+
+def test_corrupted_file_loads_as_empty(tmp_path):
+    path = tmp_path / "drivers.json"
+    text = json.dumps([driver.to_dict() for driver in make_drivers(3)], ensure_ascii=False)
+    path.write_text(text[:-20], encoding="utf-8")
+    assert DriverRep(str(path), JSONStrategy()).get_count() == 0
@@ -0,0 +1,110 @@
+import json
+
+from DriverRep import DriverRep, JSONStrategy
+from conftest import make_drivers, new_driver
+
+
+def open_rep(path, **options):
+    return DriverRep(str(path), JSONStrategy(), journal=True, **options)
+
+
+def snapshot(rep):
+    return [driver.to_dict() for driver in rep.drivers]
+
+
+def test_changes_are_appended_to_journal_not_snapshot(tmp_path):
+    path = tmp_path / "drivers.json"
+    JSONStrategy().write(str(path), [driver.to_dict() for driver in make_drivers(3)])
+    before = path.read_text(encoding="utf-8")
+
+    rep = open_rep(path)
+    rep.add_driver(new_driver(10))
+    rep.update_driver(1, new_driver(11, last_name="Петров"))
+    rep.delete_driver(2)
+
+    assert path.read_text(encoding="utf-8") == before
+    records = [json.loads(line) for line in (tmp_path / "drivers.json.journal").read_text(encoding="utf-8").splitlines()]
+    assert [record["op"] for record in records] == ["add", "update", "delete"]
+
+
+def test_journal_is_replayed_on_load(tmp_path):
+    path = tmp_path / "drivers.json"
+    JSONStrategy().write(str(path), [driver.to_dict() for driver in make_drivers(3)])
+    rep = open_rep(path)
+    rep.add_driver(new_driver(10))
+    rep.update_driver(1, new_driver(11, last_name="Петров"))
+    rep.delete_driver(2)
+
+    reopened = open_rep(path)
+    assert snapshot(reopened) == snapshot(rep)
+    assert reopened.get_by_id(1).get_last_name() == "Петров"
+    # Журнал проигрывается и тогда, когда репозиторий открыт без него
+    assert snapshot(DriverRep(str(path), JSONStrategy())) == snapshot(rep)
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    path = tmp_path / "drivers.json"
+    JSONStrategy().write(str(path), [driver.to_dict() for driver in make_drivers(2)])
+    rep = open_rep(path)
+    rep.delete_driver(1)
+    with open(tmp_path / "drivers.json.journal", "a", encoding="utf-8") as file:
+        file.write('{"op": "delete", "dri')
+
+    assert [driver.get_driver_id() for driver in open_rep(path).drivers] == [2]
+
+
+def test_write_after_torn_record_survives_reload(tmp_path):
+    path = tmp_path / "drivers.json"
+    journal = tmp_path / "drivers.json.journal"
+    JSONStrategy().write(str(path), [driver.to_dict() for driver in make_drivers(1)])
+    journal.write_text('{"op": "add", "dri', encoding="utf-8")
+
+    rep = open_rep(path)
+    assert journal.read_text(encoding="utf-8") == ""  # Оборванная запись отрезана при загрузке
+    rep.add_driver(new_driver(10))
+    assert rep.get_count() == 2
+    assert snapshot(open_rep(path)) == snapshot(rep)
+
+
+def test_record_without_newline_is_cut(tmp_path):
+    # Запись без завершающего перевода строки не была дописана до конца
+    path = tmp_path / "drivers.json"
+    journal = tmp_path / "drivers.json.journal"
+    rep = open_rep(path)
+    rep.add_driver(new_driver(1))
+    complete = journal.read_bytes()
+    with open(journal, "ab") as file:
+        file.write(json.dumps({"op": "delete", "driver_id": 1}).encode())
+
+    reopened = open_rep(path)
+    assert journal.read_bytes() == complete
+    reopened.add_driver(new_driver(2))
+    assert [driver.get_driver_id() for driver in open_rep(path).drivers] == [1, 2]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / "drivers.json"
+    journal = tmp_path / "drivers.json.journal"
+    rep = open_rep(path, compact_threshold=3)
+    rep.add_driver(new_driver(1))
+    rep.add_driver(new_driver(2))
+    assert journal.read_text(encoding="utf-8").count("\n") == 2
+
+    rep.add_driver(new_driver(3))  # Третья запись достигает порога
+    assert journal.read_text(encoding="utf-8") == ""
+    assert [item["driver_id"] for item in json.loads(path.read_text(encoding="utf-8"))] == [1, 2, 3]
+    assert snapshot(open_rep(path)) == snapshot(rep)
+
+
+def test_replaying_journal_twice_gives_same_state(tmp_path):
+    # Сбой между записью снимка и очисткой журнала: журнал проигрывается поверх уже учтённых изменений
+    path = tmp_path / "drivers.json"
+    rep = open_rep(path)
+    rep.add_driver(new_driver(1))
+    rep.add_driver(new_driver(2))
+    rep.delete_driver(1)
+    journal = (tmp_path / "drivers.json.journal").read_text(encoding="utf-8")
+    rep.compact()
+    (tmp_path / "drivers.json.journal").write_text(journal, encoding="utf-8")
+
+    assert snapshot(open_rep(path)) == snapshot(rep)
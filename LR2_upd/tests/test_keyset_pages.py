@@ -0,0 +1,65 @@
+import pytest
+
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers
+
+
+@pytest.fixture
+def repository(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(53))
+    return repository
+
+
+def short(driver):
+    return f"{driver.get_last_name()} {driver.get_first_name()} {driver.get_patronymic()} ({driver.get_experience()} лет стажа)"
+
+
+def all_pages(repository, n, order_by="driver_id"):
+    pages, token = [], None
+    while True:
+        page, token = repository.get_short_list_page(n, token, order_by)
+        pages.append(page)
+        if token is None:
+            return pages
+
+
+@pytest.mark.parametrize("order_by", ["driver_id", "last_name", "experience"])
+def test_pages_cover_table_in_order(repository, order_by):
+    drivers = sorted(repository.iter_drivers(), key=lambda d: (getattr(d, f"get_{order_by}")(), d.get_driver_id()))
+    pages = all_pages(repository, 10, order_by)
+    assert [len(page) for page in pages] == [10, 10, 10, 10, 10, 3]
+    assert [item for page in pages for item in page] == [short(driver) for driver in drivers]
+
+
+def test_last_full_page_has_no_token(repository):
+    repository.delete_many([51, 52, 53])
+    pages = all_pages(repository, 10)
+    assert [len(page) for page in pages] == [10, 10, 10, 10, 10]
+
+
+def test_pages_match_offset_pagination(repository):
+    token = None
+    for k in range(1, 4):
+        page, token = repository.get_short_list_page(7, token)
+        assert page == repository.get_k_n_short_list(k, 7)
+
+
+def test_token_stays_valid_after_earlier_rows_are_deleted(repository):
+    _, token = repository.get_short_list_page(10)
+    repository.delete_many([1, 2, 3])
+    second, _ = repository.get_short_list_page(10, token)
+    assert second == [short(driver) for driver in repository.iter_drivers()][7:17]
+
+
+def test_invalid_tokens_and_arguments(repository):
+    _, token = repository.get_short_list_page(10, order_by="last_name")
+    with pytest.raises(ValueError):
+        repository.get_short_list_page(10, token, "experience")  # Token другой сортировки
+    with pytest.raises(ValueError):
+        repository.get_short_list_page(10, "не token")
+    with pytest.raises(ValueError):
+        repository.get_short_list_page(10, order_by="phone_number")
+    for n in (0, -1):
+        with pytest.raises(ValueError):
+            repository.get_short_list_page(n)
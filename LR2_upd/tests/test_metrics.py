@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+import Metrics
+from DriverRepDB import DriverRepDB
+from conftest import make_drivers
+
+
+def counted(operation):
+    return Metrics.OPERATION_SECONDS.totals("test", operation)[1]
+
+
+def test_plain_call_is_observed_and_errors_counted():
+    def fail():
+        raise KeyError("x")
+
+    add = Metrics.timed(lambda a, b: a + b, "test", "add")
+    fail = Metrics.timed(fail, "test", "fail")
+    before = counted("add")
+    assert add(1, 2) == 3
+    assert counted("add") == before + 1
+    with pytest.raises(KeyError):
+        fail()
+    assert Metrics.OPERATION_ERRORS.value("test", "fail") >= 1
+
+
+def test_generator_is_observed_once_without_consumer_time():
+    def numbers():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    numbers = Metrics.timed(numbers, "test", "numbers")
+    before_total, before_count = Metrics.OPERATION_SECONDS.totals("test", "numbers")
+    iterator = numbers()
+    assert counted("numbers") == before_count  # Замер идёт до конца обхода
+    for _ in iterator:
+        time.sleep(0.05)  # Время вызывающего не учитывается
+    total, count = Metrics.OPERATION_SECONDS.totals("test", "numbers")
+    assert count == before_count + 1
+    assert 0.03 <= total - before_total < 0.15
+
+
+def test_abandoned_generator_is_closed_and_observed():
+    closed = []
+
+    def numbers():
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    numbers = Metrics.timed(numbers, "test", "abandoned")
+    before = counted("abandoned")
+    iterator = numbers()
+    next(iterator)
+    iterator.close()
+    assert closed == [True]
+    assert counted("abandoned") == before + 1
+
+
+def test_disabled_metrics_are_not_observed(monkeypatch):
+    monkeypatch.setattr(Metrics, "enabled", False)
+    square = Metrics.timed(lambda x: x * x, "test", "square")
+    assert square(3) == 9
+    assert counted("square") == 0
+
+
+def test_repository_iteration_is_instrumented(db_path):
+    repository = DriverRepDB(db_path)
+    repository.add_many(make_drivers(10))
+    before = Metrics.OPERATION_SECONDS.totals("DriverRepDB", "iter_drivers")[1]
+    assert len(list(repository.iter_drivers(batch_size=3))) == 10
+    assert Metrics.OPERATION_SECONDS.totals("DriverRepDB", "iter_drivers")[1] == before + 1
+    assert 'driver_operation_seconds_count{component="DriverRepDB",operation="iter_drivers"}' \
+        in Metrics.REGISTRY.render()
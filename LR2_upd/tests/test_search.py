@@ -0,0 +1,96 @@
+import pytest
+
+from DriverIndex import NameIndex
+from DriverRep import DriverRep, JSONStrategy
+from DriverRepDB import DriverRepDB
+from conftest import new_driver
+
+NAMES = [
+    ("Иванов", "Пётр", "Семёнович"),
+    ("Семёнов", "Иван", "Петрович"),
+    ("Иванова", "Мария", "Ивановна"),
+    ("Петров", "Иван", "Иванович"),
+    ("Семенова", "Анна", "Сергеевна"),
+    ("Ивановский", "Олег", "Петрович"),
+]
+
+
+def drivers():
+    return [new_driver(i + 1, last_name=last, first_name=first, patronymic=patronymic)
+            for i, (last, first, patronymic) in enumerate(NAMES)]
+
+
+@pytest.fixture(params=["file", "db", "db-like"])
+def repository(request, tmp_path, db_path):
+    if request.param == "file":
+        repository = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+        for driver in drivers():
+            repository.add_driver(driver)
+        return repository
+    repository = DriverRepDB(db_path)
+    repository.add_many(drivers())
+    repository.full_text = request.param == "db"  # db-like: перебор с LIKE, как без FTS5
+    return repository
+
+
+def found(repository, query, limit=20):
+    return [driver.get_driver_id() for driver in repository.search(query, limit)]
+
+
+def test_tiers_exact_last_name_then_prefix_then_other_fields():
+    index = NameIndex()
+    index.build({
+        "last_name": [(i + 1, names[0]) for i, names in enumerate(NAMES)],
+        "first_name": [(i + 1, names[1]) for i, names in enumerate(NAMES)],
+        "patronymic": [(i + 1, names[2]) for i, names in enumerate(NAMES)],
+    })
+    # Фамилия целиком (1), начало фамилии (3, 6), затем совпадения в имени и отчестве (2, 4)
+    assert index.search("иванов") == [1, 3, 6, 4]
+    assert index.search("иванов", 2) == [1, 3]
+
+
+def test_every_word_must_match(repository):
+    # Слова совпадают с началом любого поля: «петров» - и фамилия Петров, и отчество Петрович
+    assert set(found(repository, "петров")) == {2, 4, 6}
+    assert set(found(repository, "петров иван")) == {2, 4, 6}
+    assert set(found(repository, "иван петрович")) == {2, 6}
+    assert found(repository, "иванов олег") == [6]
+    assert found(repository, "иванов нет") == []
+
+
+def test_case_and_yo_are_ignored(repository):
+    assert set(found(repository, "СЕМЕНОВ")) == {1, 2, 5}
+    assert set(found(repository, "семёнов")) == {1, 2, 5}
+    assert set(found(repository, "Пётр")) == {1, 2, 4, 6}
+
+
+def test_empty_query_and_limit(repository):
+    assert found(repository, "  ,. ") == []
+    assert len(found(repository, "и", 2)) == 2
+    for limit in (0, -1):
+        with pytest.raises(ValueError):
+            repository.search("иванов", limit)
+
+
+def test_index_follows_writes(tmp_path, db_path):
+    file_repository = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+    db_repository = DriverRepDB(db_path)
+    for repository in (file_repository, db_repository):
+        for driver in drivers():
+            repository.add_driver(driver)
+        assert found(repository, "петров") == [4, 2, 6]
+        repository.update_driver(4, new_driver(40, last_name="Сидоров", first_name="Иван", patronymic="Иванович"))
+        repository.delete_driver(1)
+        assert found(repository, "петров") == [2, 6]
+        assert found(repository, "сидоров") == [4]
+        assert found(repository, "иванов") == [3, 6, 4]
+
+
+def test_file_and_db_rank_the_same(tmp_path, db_path):
+    file_repository = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy())
+    db_repository = DriverRepDB(db_path)
+    for driver in drivers():
+        file_repository.add_driver(driver)
+    db_repository.add_many(drivers())
+    for query in ("иванов", "и", "сем", "петров иван", "иван петрович", "семенов", "анна"):
+        assert found(file_repository, query) == found(db_repository, query)
@@ -0,0 +1,59 @@
+import pytest
+
+from DriverIndex import SortedIndex
+from DriverRep import DriverRep, JSONStrategy
+from conftest import make_drivers, new_driver
+
+
+def build(drivers, field):
+    index = SortedIndex(field)
+    index.build((driver.get_driver_id(), getattr(driver, f"get_{field}")()) for driver in drivers)
+    return index
+
+
+def expected(drivers, field, low=None, high=None):
+    key = lambda driver: (getattr(driver, f"get_{field}")(), driver.get_driver_id())
+    return [driver.get_driver_id() for driver in sorted(drivers, key=key)
+            if (low is None or key(driver)[0] >= low) and (high is None or key(driver)[0] <= high)]
+
+
+def test_range_bounds_are_inclusive():
+    drivers = make_drivers(200)
+    index = build(drivers, "experience")
+    assert index.ids_in_range() == expected(drivers, "experience")
+    assert index.ids_in_range(10, 20) == expected(drivers, "experience", 10, 20)
+    assert index.ids_in_range(low=45) == expected(drivers, "experience", low=45)
+    assert index.ids_in_range(high=0) == expected(drivers, "experience", high=0)
+    assert index.ids_in_range(30, 20) == []
+
+
+def test_slices_and_reverse_order():
+    drivers = make_drivers(200)
+    index = build(drivers, "experience")
+    full = expected(drivers, "experience", 10, 20)
+    assert index.ids_in_range(10, 20, 5, 15) == full[5:15]
+    assert index.ids_in_range(10, 20, reverse=True) == full[::-1]
+    assert index.ids_in_range(10, 20, 5, 15, reverse=True) == full[::-1][5:15]
+
+
+def test_birthday_is_compared_chronologically():
+    drivers = make_drivers(100)
+    index = build(drivers, "birthday")
+    years = [int(next(d for d in drivers if d.get_driver_id() == driver_id).get_birthday()[-4:])
+             for driver_id in index.ids_in_range("01.01.1970", "31.12.1979")]
+    assert years and all(1970 <= year <= 1979 for year in years)
+    assert years == sorted(years)
+
+
+def test_index_follows_repository_changes(tmp_path):
+    rep = DriverRep(str(tmp_path / "drivers.json"), JSONStrategy(), indexes=("experience",))
+    for i in range(1, 6):
+        rep.add_driver(new_driver(i, experience=i * 10))
+    rep.update_driver(1, new_driver(10, experience=45))
+    rep.delete_driver(3)
+
+    assert [driver.get_driver_id() for driver in rep.get_range("experience", 15, 50)] == [2, 4, 1, 5]
+    assert rep.get_k_n_sorted_short_list("experience", 2, 2) == [
+        rep.get_by_id(1).short_version, rep.get_by_id(5).short_version]
+    with pytest.raises(ValueError):
+        rep.get_range("last_name")
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+
+import pytest
+
+from Driver import Driver
+from DriverRep import DriverRep, JSONStrategy
+from DriverRepBinary import BinaryStrategy
+from DriverRepDB import COLUMNS, DriverRepDB
+from conftest import make_drivers
+
+BAD_PLATE = "не номер"
+
+
+def test_from_row_skips_validation():
+    driver = make_drivers(1)[0]
+    row = tuple(driver.to_dict().values())
+    assert Driver.from_row(row) == driver
+    assert Driver.from_row(row[:10] + (BAD_PLATE,)).get_license_plate() == BAD_PLATE
+    with pytest.raises(ValueError):
+        Driver.from_dict(dict(driver.to_dict(), license_plate=BAD_PLATE))
+
+
+def test_from_trusted_dict():
+    data = make_drivers(1)[0].to_dict()
+    assert Driver.from_trusted_dict(dict(data, experience=-1)).get_experience() == -1
+    del data["driver_id"]
+    assert Driver.from_trusted_dict(data).get_driver_id() is None  # ID необязателен
+    del data["birthday"]
+    with pytest.raises(ValueError, match="birthday"):
+        Driver.from_trusted_dict(data)
+
+
+def stored_records():
+    records = [driver.to_dict() for driver in make_drivers(3)]
+    records[1]["license_plate"] = BAD_PLATE  # Испорчено вне репозитория
+    return records
+
+
+@pytest.mark.parametrize("strategy, columnar", [(JSONStrategy, False), (JSONStrategy, True), (BinaryStrategy, False)])
+def test_file_repository(tmp_path, strategy, columnar):
+    path = str(tmp_path / "drivers.dat")
+    strategy().write(path, stored_records())
+
+    rep = DriverRep(path, strategy(), columnar=columnar)
+    assert rep.get_by_id(2).get_license_plate() == BAD_PLATE
+    close = getattr(rep._drivers, "close", None)
+    if close is not None:
+        close()
+    with pytest.raises(ValueError):
+        # Двоичный файл отображается в память, и записи разбираются при первом обращении
+        DriverRep(path, strategy(), columnar=columnar, verify_on_load=True).get_by_id(2)
+
+
+def test_journal_is_verified_on_load(tmp_path):
+    path = tmp_path / "drivers.json"
+    JSONStrategy().write(str(path), [driver.to_dict() for driver in make_drivers(1)])
+    record = {"op": "add", "driver": dict(make_drivers(2)[1].to_dict(), experience=-3)}
+    (tmp_path / "drivers.json.journal").write_text(
+        json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
+    assert DriverRep(str(path), JSONStrategy()).get_by_id(2).get_experience() == -3
+    with pytest.raises(ValueError):
+        DriverRep(str(path), JSONStrategy(), verify_on_load=True)
+
+
+def test_database_repository(db_path):
+    DriverRepDB(db_path)
+    connection = sqlite3.connect(db_path)
+    for record in stored_records():
+        connection.execute(f"INSERT INTO drivers ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                           [record[column] for column in COLUMNS])
+    connection.commit()
+    connection.close()
+
+    trusted = DriverRepDB(db_path)
+    assert trusted.get_by_id(2).get_license_plate() == BAD_PLATE
+    assert len(list(trusted.iter_drivers())) == 3
+    verified = DriverRepDB(db_path, verify_on_load=True)
+    assert verified.get_by_id(1) == make_drivers(1)[0]
+    with pytest.raises(ValueError):
+        verified.get_by_id(2)
+    with pytest.raises(ValueError):
+        list(verified.iter_drivers())
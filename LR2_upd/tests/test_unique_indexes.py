@@ -0,0 +1,104 @@
+import sqlite3
+import warnings
+
+import pytest
+
+from DatabaseConnection import DatabaseConnection
+from DriverRep import DriverRep, JSONStrategy
+from DriverRepBinary import BinaryStrategy
+from DriverRepDB import COLUMNS, DriverRepDB
+from conftest import make_drivers, new_driver
+
+FIELDS = ["license_plate", "driver_license", "insurance_policy"]
+
+
+@pytest.fixture(params=["json", "columnar", "binary", "db"])
+def repository(request, tmp_path, db_path):
+    if request.param == "db":
+        repository = DriverRepDB(db_path)
+        repository.add_many(make_drivers(5))
+        yield repository
+        return
+    strategy = BinaryStrategy() if request.param == "binary" else JSONStrategy()
+    path = str(tmp_path / f"drivers.{request.param}")
+    strategy.write(path, [driver.to_dict() for driver in make_drivers(5)])
+    repository = DriverRep(path, strategy, columnar=request.param == "columnar")
+    yield repository
+    close = getattr(repository._drivers, "close", None)
+    if close is not None:
+        close()
+
+
+@pytest.mark.parametrize("field", FIELDS)
+def test_lookup_by_unique_field(repository, field):
+    driver = make_drivers(5)[2]
+    found = getattr(repository, f"get_by_{field}")(getattr(driver, f"get_{field}")())
+    assert found.get_driver_id() == 3
+    with pytest.raises(ValueError, match="не найден"):
+        getattr(repository, f"get_by_{field}")("нет такого")
+
+
+@pytest.mark.parametrize("field", FIELDS)
+def test_duplicates_are_rejected(repository, field):
+    taken = getattr(make_drivers(5)[0], f"get_{field}")()
+    with pytest.raises(ValueError, match=rf"{field} .* уже существует \(ID 1\)"):
+        repository.add_driver(new_driver(100, **{field: taken}))
+    with pytest.raises(ValueError, match="уже существует"):
+        repository.update_driver(2, new_driver(101, **{field: taken}))
+    assert repository.get_count() == 5
+    repository.update_driver(1, new_driver(102, **{field: taken}))  # Своё значение можно оставить
+
+
+def test_value_is_released_by_update_and_delete(repository):
+    plate = make_drivers(5)[0].get_license_plate()
+    repository.update_driver(1, new_driver(100))
+    repository.add_driver(new_driver(101, license_plate=plate))
+    repository.delete_driver(6)
+    repository.add_driver(new_driver(102, license_plate=plate))
+    assert repository.get_by_license_plate(plate).get_driver_id() == 7
+
+
+def legacy_database(path):
+    # База, записанная до появления UNIQUE-индексов: госномер повторяется
+    connection = sqlite3.connect(path)
+    connection.execute(f"CREATE TABLE drivers (driver_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                       f"{', '.join(f'{column} TEXT' for column in COLUMNS[1:])})")
+    drivers = make_drivers(3)
+    drivers[2].set_license_plate(drivers[0].get_license_plate())
+    for driver in drivers:
+        data = driver.to_dict()
+        connection.execute(f"INSERT INTO drivers ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                           [data[column] for column in COLUMNS])
+    connection.commit()
+    connection.close()
+    return drivers
+
+
+def test_legacy_duplicates_are_checked_by_query(db_path):
+    drivers = legacy_database(db_path)
+    with pytest.warns(UserWarning, match="license_plate"):
+        repository = DriverRepDB(db_path)
+    assert repository.unchecked_fields == ("license_plate",)
+    with pytest.raises(ValueError, match="уже существует"):
+        repository.add_driver(new_driver(100, license_plate=drivers[0].get_license_plate()))
+    repository.add_driver(new_driver(101))
+    assert repository.get_count() == 4
+    # Остальные поля защищены UNIQUE-индексом
+    with pytest.raises(ValueError, match="driver_license"):
+        repository.add_driver(new_driver(102, driver_license=drivers[1].get_driver_license()))
+
+
+def test_legacy_warning_is_reported_once(db_path):
+    legacy_database(db_path)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("default")
+        DriverRepDB(db_path)
+        DriverRepDB(db_path)
+    assert len([w for w in caught if "license_plate" in str(w.message)]) == 1
+
+
+def test_new_tables_get_unique_indexes(db_path):
+    DatabaseConnection(db_path).ensure_table_exists()
+    names = {row[0] for row in DatabaseConnection(db_path).get_cursor().execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {f"idx_drivers_{field}" for field in FIELDS} <= names
@@ -0,0 +1,80 @@
+import pytest
+
+from BaseDriver import BaseDriver
+from Driver import Driver
+from conftest import make_drivers
+
+BAD_VALUES = [
+    ("driver_id", 0),
+    ("driver_id", "7"),
+    ("last_name", "  "),
+    ("first_name", 5),
+    ("patronymic", None),
+    ("experience", -1),
+    ("experience", "10"),
+    ("phone_number", "12"),
+    ("phone_number", None),  # Не строка: столбец проверяется по одному значению
+    ("birthday", "1990-01-01"),
+    ("driver_license", 1234),
+    ("vehicle_title", "12 34 56"),
+    ("insurance_policy", "123 45"),
+    ("license_plate", "A123BC 77"),  # Латинские буквы
+]
+
+
+def valid_records(count=3):
+    return [driver.to_dict() for driver in make_drivers(count)]
+
+
+def constructor_error(record):
+    with pytest.raises(ValueError) as error:
+        Driver(**record)
+    return str(error.value)
+
+
+def test_valid_records_have_empty_report():
+    records = valid_records(5)
+    records[0]["driver_id"] = None  # ID необязателен
+    del records[1]["driver_id"]
+    assert Driver.validate_many(records) == {}
+
+
+@pytest.mark.parametrize("field, value", BAD_VALUES)
+def test_report_matches_constructor_error(field, value):
+    records = valid_records()
+    records[1][field] = value
+    assert Driver.validate_many(records) == {1: {field: constructor_error(records[1])}}
+
+
+def test_several_fields_and_rows():
+    records = valid_records(4)
+    records[0]["experience"] = -5
+    records[0]["license_plate"] = "bad"
+    records[3]["birthday"] = None
+    report = Driver.validate_many(records)
+    assert set(report) == {0, 3}
+    assert set(report[0]) == {"experience", "license_plate"}
+    assert set(report[3]) == {"birthday"}
+
+
+@pytest.mark.parametrize("field", ["last_name", "experience", "license_plate"])
+def test_missing_required_key(field):
+    records = valid_records()
+    del records[2][field]
+    assert Driver.validate_many(records) == {2: {field: f"Отсутствует обязательный ключ: '{field}'."}}
+
+
+def test_non_dict_records():
+    records = valid_records(2)
+    records[1:1] = [None, ["Иванов"]]
+    report = Driver.validate_many(iter(records))  # Подходит любая последовательность, в том числе итератор
+    assert report == {1: {"record": "Запись должна быть словарём."}, 2: {"record": "Запись должна быть словарём."}}
+
+
+def test_base_driver_fields_only():
+    record = {"driver_id": 1, "last_name": "Иванов", "first_name": "Иван", "patronymic": "Иванович", "experience": 3}
+    assert BaseDriver.validate_many([record]) == {}
+    record["experience"] = -1
+    with pytest.raises(ValueError) as error:
+        BaseDriver(**record)
+    assert BaseDriver.validate_many([record]) == {0: {"experience": str(error.value)}}
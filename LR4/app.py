@@ -1,40 +1,166 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import argparse
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+import metrics
 from controller import Controller
-from urllib.parse import parse_qs, unquote
+from model import Model
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Поддерживаемые сжатия ответов (в порядке предпочтения) и параметр wbits zlib для каждого
+ENCODINGS = {"gzip": 31, "deflate": 15}
+COMPRESS_MIN_SIZE = 1024  # Тела меньше этого размера не сжимаются
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson")
+
+
+HTTP_REQUEST_SECONDS = metrics.REGISTRY.histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запросов по маршрутам", ("method", "route", "status"))
+
+# Маршруты с ID в пути; остальные известные маршруты считаются по пути целиком
+ID_ROUTES = ("details", "edit", "delete")
+ROUTES = ("/", "/add", "/search", "/api/drivers", "/metrics")
+
+
+def route_name(path):
+    """Маршрут для меток метрик: /details/15 -> /details/<id>, неизвестные пути -> other"""
+    path = urlsplit(path).path
+    first = path.split("/")[1] if path.count("/") >= 2 else None
+    if first in ID_ROUTES:
+        return f"/{first}/<id>"
+    return path if path in ROUTES else "other"
+
+
+def timed_route(handler):
+    """Замер времени обработки запроса (до конца записи ответа) с меткой статуса"""
+    @wraps(handler)
+    def wrapper(self):
+        self._status = None
+        start = time.perf_counter()
+        try:
+            handler(self)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, self.command, route_name(self.path), str(self._status))
+    return wrapper
+
+
+class PageCache:
+    """Отрисованные страницы: путь -> (версия данных, варианты). Варианты - словарь
+    сжатие -> байты тела (None - без сжатия). Страница другой версии не выдаётся.
+    Выданный словарь вариантов не изменяется: новый вариант заменяет его копией (add_variant)."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, version):
+        with self._lock:
+            page = self._pages.get(path)
+            if page is None or page[0] != version:
+                return None
+            self._pages.move_to_end(path)
+            return page[1]
+
+    def put(self, path, version, variants):
+        with self._lock:
+            self._pages[path] = (version, variants)
+            self._pages.move_to_end(path)
+            while len(self._pages) > self.max_size:
+                self._pages.popitem(last=False)
+
+    def add_variant(self, path, version, encoding, body):
+        with self._lock:
+            page = self._pages.get(path)
+            if page is not None and page[0] == version:
+                self._pages[path] = (version, {**page[1], encoding: body})
 
 
 class RequestHandler(BaseHTTPRequestHandler):
-    controller = Controller()
+    protocol_version = "HTTP/1.1"  # Поддержка keep-alive: каждый ответ содержит Content-Length
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY алгоритм Нейгла вместе с отложенным
+    # подтверждением клиента задерживал каждый ответ с телом примерно на 40 мс
+    disable_nagle_algorithm = True
+    db_name = "database.db"
+    _local = threading.local()
+    page_cache = PageCache()
+    # ETag = запуск сервера + версия данных: после перезапуска (и возможной смены шаблонов) теги меняются
+    etag_prefix = format(time.time_ns(), "x")
+
+    @property
+    def controller(self):
+        """Контроллер текущего потока: у каждого потока своё подключение Model к базе"""
+        controller = getattr(self._local, "controller", None)
+        if controller is None:
+            controller = Controller(Model(self.db_name))
+            self._local.controller = controller
+        return controller
 
+    @timed_route
     def do_GET(self):
         try:
-            if self.path == "/":
-                self._send_response(200, self.controller.index())
+            url = urlsplit(self.path)
+            if url.path == "/metrics":
+                self._send_response(200, metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+            elif url.path == "/":
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if query.get("all", "").lower() in ("1", "true"):
+                    etag = self._etag(self.controller.model.get_version(), self._accepted_encoding())
+                    if not self._not_modified(etag):
+                        self._send_chunked(200, self.controller.index_stream(), headers=self._cache_headers(etag))
+                else:
+                    self._send_cached(lambda: self.controller.index(
+                        query.get("page", 1), query.get("size", Controller.DEFAULT_PAGE_SIZE), query.get("after")))
+            elif url.path == "/search":
+                text = parse_qs(url.query).get("q", [""])[0]
+                self._send_cached(lambda: self.controller.search(text))
             elif self.path.startswith("/details/"):
                 record_id = int(unquote(self.path.split("/")[-1]))
-                self._send_response(200, self.controller.details(record_id))
+                self._send_cached(lambda: self.controller.details(record_id))
             elif self.path == "/add":
                 self._send_response(200, self.controller.add_form())
             elif self.path.startswith("/edit/"):
                 record_id = int(unquote(self.path.split("/")[-1]))
                 self._send_response(200, self.controller.edit_form(record_id))
+            elif url.path == "/api/drivers":
+                self._send_chunked(200, self.controller.export_records(), content_type="application/x-ndjson")
             elif self.path.startswith("/delete/"):
                 record_id = int(unquote(self.path.split("/")[-1]))
                 self.controller.delete_record(record_id)
                 self._redirect("/")
             else:
                 self._send_response(404, "<h1>404</h1><p>Страница не найдена.</p>")
+        except ValueError as e:
+            self._send_response(400, f"<h1>Ошибка</h1><p>Некорректный запрос: {e}</p>")
         except Exception as e:
             self._send_response(500, f"<h1>Ошибка сервера</h1><p>{e}</p>")
 
+    @timed_route
     def do_POST(self):
         """Обработка POST-запросов"""
+        if self.path == "/api/drivers":
+            try:
+                self._import_drivers()
+            except Exception as e:
+                self.close_connection = True  # Тело запроса могло остаться непрочитанным
+                self._send_json(500, {"error": f"Ошибка сервера: {e}"})
+            return
         try:
             content_length = int(self.headers["Content-Length"])
+            if content_length < 0:
+                raise ValueError(content_length)
+        except (TypeError, ValueError):
+            # Тело осталось непрочитанным: следующий запрос в этом соединении начался бы с него
+            self.close_connection = True
+            self._send_response(400, "<h1>Ошибка</h1><p>Некорректный заголовок Content-Length.</p>")
+            return
+        try:
             post_data = self.rfile.read(content_length).decode()
 
-            print(f"Обработка POST-запроса: {self.path}, данные: {post_data}")  # Отладка
-
             if self.path == "/add":
                 response = self.controller.add_record(post_data)
                 if "Ошибка" in response:
@@ -47,8 +173,6 @@ class RequestHandler(BaseHTTPRequestHandler):
                 record_id = record_id.strip("{}")  # Убираем фигурные скобки, если есть
                 record_id = int(record_id)
 
-                print(f"Редактирование записи с ID: {record_id}")  # Отладка
-
                 response = self.controller.update_record(record_id, post_data)
                 if "Ошибка" in response:
                     self._send_response(400, f"<h1>Ошибка редактирования</h1><p>{response}</p>")
@@ -59,27 +183,261 @@ class RequestHandler(BaseHTTPRequestHandler):
         except ValueError as e:
             self._send_response(400, f"<h1>Ошибка</h1><p>Некорректный ввод данных: {e}</p>")
         except Exception as e:
+            self.close_connection = True  # Тело запроса могло остаться непрочитанным
             self._send_response(500, f"<h1>Ошибка сервера</h1><p>{e}</p>")
 
 
-    def _send_response(self, status, content, content_type="text/html"):
+    def send_response(self, code, message=None):
+        self._status = code  # Для метки status в метриках
+        super().send_response(code, message)
+
+    def _import_drivers(self):
+        """Пакетный импорт NDJSON: тело читается построчно, без загрузки целиком в память"""
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            if self.headers.get("Content-Length") is None:
+                self.close_connection = True
+                self._send_json(411, {"error": "Нужен заголовок Content-Length или Transfer-Encoding: chunked."})
+                return
+            try:
+                content_length = int(self.headers["Content-Length"])
+            except ValueError:
+                content_length = -1
+            if content_length < 0:
+                self.close_connection = True  # Тело осталось непрочитанным
+                self._send_json(400, {"error": "Некорректный заголовок Content-Length."})
+                return
+        try:
+            # Строки декодируются при разборе: ошибка кодировки попадает в список ошибок с номером строки
+            result = self.controller.import_records(self._iter_body_lines())
+        except ValueError as e:
+            # Тело оборвано или закодировано неверно; сохранённые пакеты остаются в базе
+            self.close_connection = True
+            self._send_json(400, {"error": f"Некорректное тело запроса: {e}"})
+            return
+        self._send_json(200, result)
+
+    def _iter_body(self):
+        """Тело запроса блоками: по Content-Length или в кодировке chunked"""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass  # Пропускаем трейлеры
+                    return
+                yield self._read_exactly(size)
+                self.rfile.readline()
+        else:
+            remaining = int(self.headers["Content-Length"])
+            while remaining > 0:
+                block = self._read_exactly(min(remaining, 64 * 1024))
+                remaining -= len(block)
+                yield block
+
+    def _read_exactly(self, size):
+        data = self.rfile.read(size)
+        if len(data) != size:
+            raise ValueError("соединение закрыто до конца тела запроса")
+        return data
+
+    def _iter_body_lines(self):
+        tail = b""
+        for block in self._iter_body():
+            lines = (tail + block).split(b"\n")
+            tail = lines.pop()
+            yield from lines
+        if tail:
+            yield tail
+
+    def _send_json(self, status, data):
+        self._send_response(status, json.dumps(data, ensure_ascii=False), content_type="application/json")
+
+    def _etag(self, version, encoding=None):
+        # У сжатого и несжатого представления страницы разные ETag; encoding - фактически
+        # отправляемое сжатие (Content-Encoding), а не просто принимаемое клиентом
+        suffix = f"-{encoding}" if encoding else ""
+        return f'"{self.etag_prefix}-{version}{suffix}"'
+
+    @staticmethod
+    def _cache_headers(etag):
+        # no-cache: браузер хранит страницу, но каждый раз сверяет ETag с сервером
+        return {"ETag": etag, "Cache-Control": "no-cache"}
+
+    def _not_modified(self, etag):
+        """Ответить 304, если у клиента уже есть страница с этим ETag"""
+        header = self.headers.get("If-None-Match")
+        if header is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag not in tags and "*" not in tags:
+            return False
+        self.send_response(304)
+        for name, value in self._cache_headers(etag).items():
+            self.send_header(name, value)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return True
+
+    def _send_cached(self, render):
+        """Страница, зависящая только от данных: 304 по ETag или отрисовка с кэшем по версии данных"""
+        # Версия читается до отрисовки: если данные изменятся между ними, страница окажется
+        # новее своей версии и будет просто отрисована заново при следующем запросе
+        # Сжатие зависит от размера страницы, поэтому ETag определяется после получения страницы из кэша
+        version = self.controller.model.get_version()
+        variants = self.page_cache.get(self.path, version)
+        if variants is None:
+            variants = {None: render().encode()}
+            self.page_cache.put(self.path, version, variants)
+        encoding = self._accepted_encoding() if len(variants[None]) >= COMPRESS_MIN_SIZE else None
+        etag = self._etag(version, encoding)
+        if self._not_modified(etag):
+            return
+        body = variants.get(encoding)
+        if body is None:
+            body = self._compress(variants[None], encoding)  # Сжимаем один раз на версию
+            self.page_cache.add_variant(self.path, version, encoding, body)
+        self._write_body(200, body, "text/html", self._cache_headers(etag), encoding)
+
+    def _accepted_encoding(self):
+        """Предпочтительное из поддерживаемых сжатий, которые принимает клиент (Accept-Encoding), или None"""
+        accepted = {}
+        for item in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        best, best_quality = None, 0.0
+        for encoding in ENCODINGS:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    @staticmethod
+    def _compressor(encoding):
+        return zlib.compressobj(6, zlib.DEFLATED, ENCODINGS[encoding])
+
+    @classmethod
+    def _compress(cls, data, encoding):
+        compressor = cls._compressor(encoding)
+        return compressor.compress(data) + compressor.flush()
+
+    def _send_response(self, status, content, content_type="text/html", headers=None):
+        if isinstance(content, str):
+            content = content.encode()
+        elif not isinstance(content, bytes):
+            content = b""
+        encoding = None
+        if len(content) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            encoding = self._accepted_encoding()
+            if encoding:
+                content = self._compress(content, encoding)
+        self._write_body(status, content, content_type, headers, encoding)
+
+    def _write_body(self, status, body, content_type, headers=None, encoding=None):
+        """Отправка готового (при необходимости уже сжатого) тела ответа"""
         self.send_response(status)
         self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
-        if isinstance(content, str):
-            self.wfile.write(content.encode())
-        elif isinstance(content, bytes):
-            self.wfile.write(content)
+        self.wfile.write(body)
+
+    CHUNK_SIZE = 16 * 1024
+
+    def _send_chunked(self, status, parts, content_type="text/html", headers=None):
+        """Ответ частями (Transfer-Encoding: chunked) по мере получения строк из parts.
+        Мелкие части собираются в куски по CHUNK_SIZE байт, чтобы не писать в сокет по строке.
+        Размер тела заранее неизвестен, поэтому сжатие (если клиент его принимает) включается всегда."""
+        parts = iter(parts)
+        first = next(parts, "")  # Ошибки до отправки заголовков ещё можно вернуть как 500
+        chunked = self.request_version != "HTTP/1.0"
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        encoding = self._accepted_encoding() if compressible else None
+        compressor = self._compressor(encoding) if encoding else None
+        self.send_response(status)
+        self.send_header("Content-type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.close_connection = True  # HTTP/1.0: конец тела - закрытие соединения
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        def write(data):
+            if compressor:
+                data = compressor.compress(data)
+                if not data:
+                    return  # Сжатые данные накапливаются в компрессоре
+            if chunked:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            else:
+                self.wfile.write(data)
+
+        buffer = bytearray(first.encode())
+        try:
+            for part in parts:
+                buffer += part.encode()
+                if len(buffer) >= self.CHUNK_SIZE:
+                    write(bytes(buffer))
+                    buffer.clear()
+        except Exception as e:
+            # Заголовки уже отправлены: обрываем ответ без завершающего куска
+            self.close_connection = True
+            self.log_error("Ответ прерван: %s", e)
+            return
+        if buffer:
+            write(bytes(buffer))
+        if compressor:
+            tail = compressor.flush()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(tail), tail) if chunked else tail)
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
 
     def _redirect(self, location):
         self.send_response(302)
         self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
 
+class ConcurrentHTTPServer(ThreadingHTTPServer):
+    """Сервер, обслуживающий каждое подключение в отдельном потоке"""
+    request_queue_size = 128
+
+
+def create_server(host="localhost", port=8080, threaded=True, db_name="database.db"):
+    """Создание сервера: многопоточного (по умолчанию) или однопоточного"""
+    RequestHandler.db_name = db_name
+    server_class = ConcurrentHTTPServer if threaded else HTTPServer
+    return server_class((host, port), RequestHandler)
+
+
 if __name__ == "__main__":
-    server = HTTPServer(("localhost", 8080), RequestHandler)
-    print("Сервер запущен на http://localhost:8080")
+    parser = argparse.ArgumentParser(description="Веб-приложение для работы с водителями")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default="database.db", help="файл базы данных SQLite")
+    parser.add_argument("--single-thread", action="store_true", help="обрабатывать запросы в одном потоке")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, threaded=not args.single_thread, db_name=args.db)
+    print(f"Сервер запущен на http://{args.host}:{args.port}")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -1,20 +1,63 @@
+import html
+import json
 from model import Model
 from view import View
 from urllib.parse import parse_qs
 
+MAX_INTEGER = 2 ** 63 - 1  # Наибольшее целое SQLite (INTEGER - 64 бита со знаком)
+
 class Controller:
-    def __init__(self):
-        self.model = Model()
+    def __init__(self, model=None):
+        self.model = model if model is not None else Model()
         self.view = View()
 
-    def index(self):
-        records = self.model.get_all_records()
-        rows = "\n".join(
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+
+    @staticmethod
+    def _row(r):
+        return (
             f"<tr><td>{r[0]}</td><td>{r[1]}</td><td>{r[2]}</td><td>{r[3]}</td>"
             f"<td><a href='/details/{r[0]}'>Детали</a> | <a href='/edit/{r[0]}'>Редактировать</a> | <a href='/delete/{r[0]}'>Удалить</a></td></tr>"
-            for r in records
         )
-        return self.view.render_template("index.html", records=rows)
+
+    def index(self, page=1, size=DEFAULT_PAGE_SIZE, after=None):
+        """Одна страница списка; after - ID последней записи предыдущей страницы (keyset)"""
+        page = max(int(page), 1)
+        size = min(max(int(size), 1), self.MAX_PAGE_SIZE)
+        after = self.model.get_page_start(page, size) if after is None else int(after)
+        records, next_after = self.model.get_records_page(size, after) if after is not None else ([], None)
+        rows = "\n".join(self._row(r) for r in records)
+        links = []
+        if page > 1:
+            links.append(f"<a href='/?page={page - 1}&size={size}'>Назад</a>")
+        links.append(f"Страница {page}")
+        if next_after is not None:
+            links.append(f"<a href='/?page={page + 1}&size={size}&after={next_after}'>Вперёд</a>")
+        links.append("<a href='/?all=1'>Показать все</a>")
+        return self.view.render_template("index.html", records=rows, pager=" | ".join(links))
+
+    def index_stream(self):
+        """Весь список частями: строки таблицы формируются по мере чтения из курсора"""
+        rows = (self._row(r) + "\n" for r in self.model.iter_records())
+        return self.view.stream_template("index.html", records=rows, pager="<a href='/'>По страницам</a>")
+
+    SEARCH_LIMIT = 50
+
+    def search(self, query):
+        """Поиск по началу фамилии, имени и отчества"""
+        query = query.strip()
+        records = self.model.search_records(query, self.SEARCH_LIMIT) if query else []
+        rows = "\n".join(self._row(r) for r in records)
+        if not query:
+            summary = "Введите начало фамилии, имени или отчества."
+        elif not records:
+            summary = "Ничего не найдено."
+        else:
+            summary = f"Найдено: {len(records)}"
+            if len(records) >= self.SEARCH_LIMIT:
+                summary += f" (показаны первые {self.SEARCH_LIMIT})"
+        return self.view.render_template("search.html", query=html.escape(query), records=rows, summary=summary)
 
     def details(self, record_id):
         record = self.model.get_record_by_id(record_id)
@@ -84,3 +127,80 @@ class Controller:
 
     def delete_record(self, record_id):
         self.model.delete_record(record_id)
+
+    IMPORT_BATCH_SIZE = 500
+
+    @staticmethod
+    def _parse_driver(line):
+        """Строка NDJSON (str или байты UTF-8) -> кортеж для Model.save_many; ValueError с описанием ошибки"""
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise ValueError(f"Некорректная кодировка UTF-8: {e}")
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Некорректный JSON: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("Запись должна быть JSON-объектом.")
+        record_id = data.get("id")
+        if record_id is not None and (type(record_id) is not int or not 0 < record_id <= MAX_INTEGER):
+            raise ValueError(f"id должен быть целым числом от 1 до {MAX_INTEGER}.")
+        for key in ("last_name", "first_name"):
+            if not isinstance(data.get(key), str) or not data[key].strip():
+                raise ValueError(f"Поле {key} обязательно и должно быть непустой строкой.")
+        patronymic = data.get("patronymic", "")  # Отчество может быть пустым
+        if not isinstance(patronymic, str):
+            raise ValueError("Поле patronymic должно быть строкой.")
+        experience = data.get("experience")
+        if type(experience) is not int:
+            raise ValueError("Поле experience обязательно и должно быть целым числом.")
+        if experience < 0:
+            raise ValueError("Стаж не может быть отрицательным.")
+        if experience > MAX_INTEGER:
+            raise ValueError(f"Стаж не может быть больше {MAX_INTEGER}.")
+        return record_id, data["last_name"], data["first_name"], patronymic, experience
+
+    def export_records(self):
+        """Все записи строками NDJSON (по мере чтения из базы)"""
+        for r in self.model.iter_records(full=True):
+            yield json.dumps({
+                "id": r[0],
+                "last_name": r[1],
+                "first_name": r[2],
+                "patronymic": r[3],
+                "experience": r[4],
+            }, ensure_ascii=False) + "\n"
+
+    def import_records(self, lines):
+        """Импорт строк NDJSON (str или байты UTF-8) пакетами по IMPORT_BATCH_SIZE записей (каждый пакет -
+        одна транзакция). Записи с id заменяют существующие. Ошибки возвращаются по номерам строк (с 1)."""
+        saved = 0
+        errors = []
+        batch, batch_lines = [], []
+        for line_no, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(self._parse_driver(line))
+                batch_lines.append(line_no)
+            except ValueError as e:
+                errors.append({"line": line_no, "error": str(e)})
+            if len(batch) >= self.IMPORT_BATCH_SIZE:
+                saved += self._save_batch(batch, batch_lines, errors)
+        saved += self._save_batch(batch, batch_lines, errors)
+        errors.sort(key=lambda error: error["line"])
+        return {"saved": saved, "failed": len(errors), "errors": errors}
+
+    def _save_batch(self, batch, batch_lines, errors):
+        """Сохранить пакет и очистить его; возвращает число сохранённых записей"""
+        if not batch:
+            return 0
+        failed = self.model.save_many(batch)
+        for i, message in failed:
+            errors.append({"line": batch_lines[i], "error": message})
+        count = len(batch) - len(failed)
+        batch.clear()
+        batch_lines.clear()
+        return count
@@ -0,0 +1,226 @@
+"""Нагрузочный тест веб-приложения: запускает сервер на заполненной временной базе
+(или использует уже запущенный, --url) и измеряет задержки и пропускную способность по маршрутам.
+
+Пример: python loadtest.py --clients 16 --duration 10 --mix index=50,details=30,add=10,edit=10
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from app import RequestHandler, create_server
+from model import Model
+
+ROUTES = ("index", "details", "add", "edit")
+DEFAULT_MIX = "index=40,details=40,add=10,edit=10"
+
+LAST_NAMES = ("Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов")
+FIRST_NAMES = ("Александр", "Дмитрий", "Максим", "Сергей", "Андрей", "Алексей", "Артём", "Илья")
+PATRONYMICS = ("Александрович", "Дмитриевич", "Сергеевич", "Андреевич", "Иванович", "Петрович")
+
+
+def random_driver(rng):
+    return rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES), rng.choice(PATRONYMICS), rng.randrange(0, 50)
+
+
+def seed_database(db_name, rows, seed=0):
+    """Заполнение базы rows детерминированными записями (ID 1..rows в новой базе)"""
+    rng = random.Random(seed)
+    model = Model(db_name)
+    model.connection.executemany(
+        "INSERT INTO drivers (LastName, FirstName, Patronymic, Experience) VALUES (?, ?, ?, ?)",
+        (random_driver(rng) for _ in range(rows))
+    )
+    model.connection.commit()
+    model.close_connection()
+
+
+def parse_mix(text):
+    """'index=50,details=30' -> {'index': 50, 'details': 30}"""
+    mix = {}
+    for item in text.split(","):
+        route, _, weight = item.partition("=")
+        route = route.strip()
+        if route not in ROUTES:
+            raise ValueError(f"Неизвестный маршрут {route}; доступны: {', '.join(ROUTES)}")
+        mix[route] = int(weight or 1)
+    return mix
+
+
+def make_request(route, rng, max_id):
+    """Метод, путь и тело запроса для маршрута"""
+    if route == "index":
+        return "GET", "/", None
+    if route == "details":
+        return "GET", f"/details/{rng.randrange(1, max_id + 1)}", None
+    last_name, first_name, patronymic, experience = random_driver(rng)
+    body = urlencode({
+        "last_name": last_name, "first_name": first_name, "patronymic": patronymic, "experience": experience,
+    })
+    if route == "add":
+        return "POST", "/add", body
+    return "POST", f"/edit/{rng.randrange(1, max_id + 1)}", body
+
+
+class Client(threading.Thread):
+    """Клиент с постоянным (keep-alive) подключением, отправляющий запросы до остановки"""
+
+    def __init__(self, host, port, routes, weights, max_id, seed, stop, requests_left):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.routes, self.weights = routes, weights
+        self.max_id = max_id
+        self.rng = random.Random(seed)
+        self.stop = stop
+        self.requests_left = requests_left
+        self.latencies = {route: [] for route in ROUTES}
+        self.errors = {route: 0 for route in ROUTES}
+
+    def run(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        while not self.stop.is_set() and self.requests_left():
+            route = self.rng.choices(self.routes, self.weights)[0]
+            method, path, body = make_request(route, self.rng, self.max_id)
+            headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else {}
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+                if response.will_close:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()  # Следующий запрос откроет новое подключение
+            elapsed = time.perf_counter() - start
+            if ok:
+                self.latencies[route].append(elapsed)
+            else:
+                self.errors[route] += 1
+        connection.close()
+
+
+def percentile(sorted_values, p):
+    """Перцентиль p (0..100) по отсортированному списку методом ближайшего ранга"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(len(sorted_values) * p / 100))
+    return sorted_values[rank - 1]
+
+
+def summarize(route, latencies, errors, duration):
+    latencies = sorted(latencies)
+    return {
+        "route": route,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": (len(latencies) + errors) / duration if duration else None,
+        "p50_ms": None if not latencies else percentile(latencies, 50) * 1000,
+        "p95_ms": None if not latencies else percentile(latencies, 95) * 1000,
+        "p99_ms": None if not latencies else percentile(latencies, 99) * 1000,
+    }
+
+
+def run_load(host, port, clients=8, duration=10.0, total_requests=None, mix=None, max_id=1000, seed=0):
+    """Нагрузка на сервер; возвращает отчёт по маршрутам и итог"""
+    mix = mix or parse_mix(DEFAULT_MIX)
+    routes = [route for route in mix if mix[route] > 0]
+    weights = [mix[route] for route in routes]
+    stop = threading.Event()
+    counter = {"left": total_requests}
+    lock = threading.Lock()
+
+    def requests_left():
+        if total_requests is None:
+            return True
+        with lock:
+            if counter["left"] <= 0:
+                return False
+            counter["left"] -= 1
+            return True
+
+    workers = [Client(host, port, routes, weights, max_id, seed + i, stop, requests_left) for i in range(clients)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    if total_requests is None:
+        stop.wait(duration)
+        stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "clients": clients, "duration_s": elapsed, "mix": mix, "seed": seed,
+        "routes": [], "total": None,
+    }
+    all_latencies, all_errors = [], 0
+    for route in routes:
+        latencies = [value for worker in workers for value in worker.latencies[route]]
+        errors = sum(worker.errors[route] for worker in workers)
+        report["routes"].append(summarize(route, latencies, errors, elapsed))
+        all_latencies += latencies
+        all_errors += errors
+    report["total"] = summarize("total", all_latencies, all_errors, elapsed)
+    return report
+
+
+def print_report(report):
+    print(f"Клиентов: {report['clients']}, время: {report['duration_s']:.1f} с")
+    print(f"{'маршрут':10} {'запросов':>9} {'ошибок':>7} {'RPS':>9} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9}")
+
+    def ms(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    for row in report["routes"] + [report["total"]]:
+        print(f"{row['route']:10} {row['requests']:>9} {row['errors']:>7} {row['rps']:>9.1f} "
+              f"{ms(row['p50_ms']):>9} {ms(row['p95_ms']):>9} {ms(row['p99_ms']):>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест веб-приложения для работы с водителями")
+    parser.add_argument("--clients", type=int, default=8, help="число одновременных клиентов")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность теста, с")
+    parser.add_argument("--requests", type=int, help="общее число запросов (вместо --duration)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"веса маршрутов, по умолчанию {DEFAULT_MIX}")
+    parser.add_argument("--rows", type=int, default=1000, help="число записей во временной базе")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--single-thread", action="store_true", help="однопоточный сервер")
+    parser.add_argument("--url", help="адрес уже запущенного сервера (база не создаётся, ID от 1 до --rows)")
+    parser.add_argument("--json", help="файл для отчёта в формате JSON")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.url:
+        url = urlsplit(args.url)
+        report = run_load(url.hostname, url.port or 80, args.clients, args.duration, args.requests, mix, args.rows, args.seed)
+    else:
+        with tempfile.TemporaryDirectory(prefix="lr4-load-") as directory:
+            db_name = os.path.join(directory, "load.db")
+            seed_database(db_name, args.rows, args.seed)
+            server = create_server("127.0.0.1", 0, threaded=not args.single_thread, db_name=db_name)
+            RequestHandler.log_message = lambda self, format, *params: None  # Без строки журнала на каждый запрос
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address
+            print(f"Сервер запущен на http://{host}:{port}, записей: {args.rows}", file=sys.stderr)
+            report = run_load(host, port, args.clients, args.duration, args.requests, mix, args.rows, args.seed)
+            server.shutdown()
+            server.server_close()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
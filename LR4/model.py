@@ -1,10 +1,81 @@
+import re
 import sqlite3
+from metrics import instrument
+
+# Слова поискового запроса: без учёта регистра, «ё» равна «е»
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def search_tokens(text):
+    return [token.casefold().replace("ё", "е") for token in TOKEN_PATTERN.findall(text)]
+
+
+# Поля ФИО, по которым идёт поиск
+NAME_COLUMNS = ("LastName", "FirstName", "Patronymic")
+NAMES = ", ".join(NAME_COLUMNS)
+
+
+def _folded(expression):
+    """SQL-выражение с заменой «ё» на «е» (слова запроса нормализуются так же, см. search_tokens)"""
+    return f"replace(replace({expression}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _fts_values(row):
+    return ", ".join(_folded(f"{row}.{column}") for column in NAME_COLUMNS)
+
+
+# Перебор без FTS5: ФИО одной строкой с пробелом в начале, слово запроса - начало любого слова.
+# Отчество может быть NULL, поэтому coalesce.
+LIKE_NAMES = _folded("' ' || LastName || ' ' || FirstName || ' ' || coalesce(Patronymic, '')")
+
+# Полнотекстовый индекс ФИО (FTS5, без собственного содержимого): заполняется триггерами,
+# строки берутся из drivers по rowid. Префиксные индексы ускоряют поиск по 1-3 первым буквам.
+FTS_SQL = f"""
+    CREATE VIRTUAL TABLE drivers_fts USING fts5(
+        {NAMES},
+        content='', tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    );
+    INSERT INTO drivers_fts (rowid, {NAMES}) SELECT DriverId, {_fts_values("drivers")} FROM drivers;
+"""
+FTS_TRIGGERS_SQL = f"""
+    CREATE TRIGGER IF NOT EXISTS drivers_fts_insert AFTER INSERT ON drivers BEGIN
+        INSERT INTO drivers_fts (rowid, {NAMES}) VALUES (new.DriverId, {_fts_values("new")});
+    END;
+    CREATE TRIGGER IF NOT EXISTS drivers_fts_delete AFTER DELETE ON drivers BEGIN
+        INSERT INTO drivers_fts (drivers_fts, rowid, {NAMES})
+        VALUES ('delete', old.DriverId, {_fts_values("old")});
+    END;
+    CREATE TRIGGER IF NOT EXISTS drivers_fts_update AFTER UPDATE OF {NAMES} ON drivers BEGIN
+        INSERT INTO drivers_fts (drivers_fts, rowid, {NAMES})
+        VALUES ('delete', old.DriverId, {_fts_values("old")});
+        INSERT INTO drivers_fts (rowid, {NAMES}) VALUES (new.DriverId, {_fts_values("new")});
+    END;
+"""
+
+
+def match_tiers(query):
+    """Запросы FTS5 по ступеням ранжирования: первое слово - фамилия целиком, начало фамилии,
+    начало любого слова ФИО. Остальные слова - обязательные префиксы в любом поле."""
+    tokens = search_tokens(query)
+    if not tokens:
+        return []
+    rest = "".join(f' "{token}"*' for token in tokens[1:])
+    return [
+        f'LastName : "{tokens[0]}"{rest}',
+        f'LastName : "{tokens[0]}"*{rest}',
+        f'"{tokens[0]}"*{rest}',
+    ]
+
 
 class Model:
     def __init__(self, db_name="database.db"):
-        self.connection = sqlite3.connect(db_name)
+        self.connection = sqlite3.connect(db_name, timeout=10)
         self.connection.row_factory = sqlite3.Row  # Позволяет доступ по ключам
+        # WAL: чтения из других потоков/подключений не блокируются записью
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
         self.cursor = self.connection.cursor()
+        self.full_text = False
         self._initialize_table()
 
     def _initialize_table(self):
@@ -18,10 +89,44 @@ class Model:
                     Experience INTEGER NOT NULL
                 )
             """)
+            # Версия данных: увеличивается триггерами при любом изменении таблицы drivers,
+            # в том числе из других подключений и процессов
+            self.cursor.executescript("""
+                CREATE TABLE IF NOT EXISTS drivers_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO drivers_version (id, version) VALUES (1, 0);
+                CREATE TRIGGER IF NOT EXISTS drivers_version_insert AFTER INSERT ON drivers
+                BEGIN UPDATE drivers_version SET version = version + 1 WHERE id = 1; END;
+                CREATE TRIGGER IF NOT EXISTS drivers_version_update AFTER UPDATE ON drivers
+                BEGIN UPDATE drivers_version SET version = version + 1 WHERE id = 1; END;
+                CREATE TRIGGER IF NOT EXISTS drivers_version_delete AFTER DELETE ON drivers
+                BEGIN UPDATE drivers_version SET version = version + 1 WHERE id = 1; END;
+            """)
+            self.full_text = self._initialize_full_text()
             self.connection.commit()
         except sqlite3.Error as e:
             print(f"Ошибка при инициализации таблицы: {e}")
 
+    def _initialize_full_text(self):
+        """Полнотекстовый индекс ФИО (при первом запуске - с заполнением из drivers).
+        False, если SQLite собран без FTS5: тогда поиск работает перебором."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'drivers_fts'")
+        if self.cursor.fetchone() is None:
+            try:
+                self.cursor.executescript(FTS_SQL)
+            except sqlite3.OperationalError as e:
+                print(f"Полнотекстовый поиск недоступен: {e}")
+                return False
+        self.cursor.executescript(FTS_TRIGGERS_SQL)
+        return True
+
+    def get_version(self):
+        """Текущая версия данных таблицы drivers (меняется при каждом изменении)"""
+        self.cursor.execute("SELECT version FROM drivers_version WHERE id = 1")
+        return self.cursor.fetchone()[0]
+
     def get_all_records(self):
         try:
             self.cursor.execute("SELECT DriverId, LastName, FirstName, Experience FROM drivers")
@@ -30,6 +135,93 @@ class Model:
             print(f"Ошибка при получении записей: {e}")
             return []
 
+    def get_records_page(self, size, after_id=0):
+        """Страница записей после after_id (keyset): (записи, ID для следующей страницы или None)"""
+        try:
+            self.cursor.execute(
+                "SELECT DriverId, LastName, FirstName, Experience FROM drivers "
+                "WHERE DriverId > ? ORDER BY DriverId LIMIT ?",
+                (after_id, size + 1)  # Лишняя запись показывает, есть ли следующая страница
+            )
+            records = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Ошибка при получении страницы записей: {e}")
+            return [], None
+        if len(records) > size:
+            return records[:size], records[size - 1][0]
+        return records, None
+
+    def search_records(self, query, limit=50):
+        """Не более limit записей, у которых каждое слово запроса - начало слова ФИО.
+        Сначала совпадения первого слова с фамилией целиком, затем с началом фамилии, затем остальные;
+        внутри ступени - по ID. Ступени читаются в порядке rowid и останавливаются на LIMIT,
+        поэтому время не зависит от числа совпадений (в отличие от сортировки по bm25)."""
+        if limit <= 0:
+            raise ValueError("Число результатов поиска должно быть положительным.")
+        tiers = match_tiers(query)
+        if not tiers:
+            return []
+        columns = "DriverId, LastName, FirstName, Experience"
+        try:
+            if not self.full_text:
+                # Перебор с LIKE: он не учитывает регистр только для латиницы, а ФИО пишутся с заглавной
+                tokens = [token.capitalize() for token in search_tokens(query)]
+                conditions = " AND ".join([f"{LIKE_NAMES} LIKE ?"] * len(tokens))
+                self.cursor.execute(
+                    f"SELECT {columns} FROM drivers WHERE {conditions} ORDER BY DriverId LIMIT ?",
+                    [f"% {token}%" for token in tokens] + [limit]
+                )
+                return self.cursor.fetchall()
+            records, found = [], set()
+            for match in tiers:
+                # Ступени вложены: найденные раньше записи попадутся снова, поэтому берём с запасом
+                self.cursor.execute(
+                    f"SELECT {columns} FROM drivers WHERE DriverId IN ("
+                    "SELECT rowid FROM drivers_fts WHERE drivers_fts MATCH ? ORDER BY rowid LIMIT ?"
+                    ") ORDER BY DriverId",
+                    (match, limit + len(found))
+                )
+                for record in self.cursor.fetchall():
+                    if record[0] not in found and len(records) < limit:
+                        found.add(record[0])
+                        records.append(record)
+                if len(records) >= limit:
+                    break
+            return records
+        except sqlite3.Error as e:
+            print(f"Ошибка при поиске записей: {e}")
+            return []
+
+    def get_page_start(self, page, size):
+        """ID, после которого начинается страница page (для перехода по номеру страницы)"""
+        if page <= 1:
+            return 0
+        try:
+            self.cursor.execute(
+                "SELECT DriverId FROM drivers ORDER BY DriverId LIMIT 1 OFFSET ?",
+                ((page - 1) * size - 1,)
+            )
+            row = self.cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Ошибка при поиске начала страницы: {e}")
+            return None
+        return row[0] if row else None
+
+    def iter_records(self, batch_size=500, full=False):
+        """Все записи по порядку ID, порциями из курсора, без загрузки таблицы в память.
+        full=True - все столбцы, иначе как в get_all_records"""
+        columns = "*" if full else "DriverId, LastName, FirstName, Experience"
+        cursor = self.connection.cursor()  # Отдельный курсор: self.cursor может понадобиться во время обхода
+        try:
+            cursor.execute(f"SELECT {columns} FROM drivers ORDER BY DriverId")
+            while True:
+                records = cursor.fetchmany(batch_size)
+                if not records:
+                    return
+                yield from records
+        finally:
+            cursor.close()
+
     def get_record_by_id(self, record_id):
         try:
             self.cursor.execute("SELECT * FROM drivers WHERE DriverId = ?", (record_id,))
@@ -49,6 +241,30 @@ class Model:
             print(f"Ошибка при добавлении записи: {e}")
             self.connection.rollback()
 
+    def save_many(self, records):
+        """Пакетное сохранение в одной транзакции. records - кортежи
+        (DriverId или None, LastName, FirstName, Patronymic, Experience): запись с существующим ID
+        заменяется, без ID - добавляется. Возвращает список (номер в records, ошибка) несохранённых."""
+        sql = (
+            "INSERT INTO drivers (DriverId, LastName, FirstName, Patronymic, Experience) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(DriverId) DO UPDATE SET LastName = excluded.LastName, FirstName = excluded.FirstName, "
+            "Patronymic = excluded.Patronymic, Experience = excluded.Experience"
+        )
+        try:
+            with self.connection:
+                self.cursor.executemany(sql, records)
+            return []
+        except (sqlite3.Error, OverflowError):
+            pass  # Пакет откачен: сохраняем по одной, чтобы найти ошибочные записи
+        errors = []
+        with self.connection:
+            for i, record in enumerate(records):
+                try:
+                    self.cursor.execute(sql, record)
+                except (sqlite3.Error, OverflowError) as e:  # OverflowError - число вне диапазона INTEGER
+                    errors.append((i, str(e)))
+        return errors
+
     def update_record(self, record_id, last_name, first_name, patronymic, experience):
         try:
             record_id = int(record_id)  # Преобразуем ID в число для безопасности
@@ -77,3 +293,6 @@ class Model:
     def __del__(self):
         """Уничтожение объекта и закрытие соединения"""
         self.close_connection()
+
+
+instrument(Model)  # Замер времени всех открытых методов
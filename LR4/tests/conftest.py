@@ -0,0 +1,69 @@
+import http.client
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from model import Model  # noqa: E402
+
+
+# Записи для Model.save_many: (ID, фамилия, имя, отчество, стаж)
+def make_records(count):
+    return [(i, f"Фамилия{i}", f"Имя{i}", f"Отчество{i}", i % 40) for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def db_name(tmp_path):
+    return str(tmp_path / "database.db")
+
+
+@pytest.fixture
+def model(db_name):
+    model = Model(db_name)
+    yield model
+    model.close_connection()
+
+
+@pytest.fixture
+def server(db_name, monkeypatch):
+    """Сервер приложения на свободном порту; у каждого теста свой кэш страниц и своя база"""
+    monkeypatch.setattr(app.RequestHandler, "page_cache", app.PageCache())
+    monkeypatch.setattr(app.RequestHandler, "log_message", lambda self, format, *args: None)
+    monkeypatch.setattr(app.RequestHandler, "db_name", app.RequestHandler.db_name)
+    server = app.create_server("127.0.0.1", 0, db_name=db_name)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def connect(server):
+    """Фабрика подключений к серверу (keep-alive: одно подключение - несколько запросов)"""
+    connections = []
+
+    def connect():
+        connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+        connections.append(connection)
+        return connection
+
+    yield connect
+    for connection in connections:
+        connection.close()
+
+
+@pytest.fixture
+def fetch(connect):
+    """Запрос в новом подключении: (ответ, тело)"""
+    def fetch(method, path, body=None, headers=None):
+        connection = connect()
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+    return fetch
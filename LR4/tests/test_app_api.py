@@ -0,0 +1,143 @@
+import json
+import socket
+
+import pytest
+
+from controller import Controller
+from conftest import make_records
+from model import Model
+
+
+def ndjson(*records):
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode()
+
+
+def driver(i, **changes):
+    return dict({"last_name": f"Фамилия{i}", "first_name": f"Имя{i}", "patronymic": "", "experience": i}, **changes)
+
+
+def test_export_streams_all_records(model, fetch):
+    model.save_many(make_records(3))
+    response, body = fetch("GET", "/api/drivers")
+    assert response.getheader("Content-type") == "application/x-ndjson"
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    records = [json.loads(line) for line in body.decode().splitlines()]
+    assert [record["id"] for record in records] == [1, 2, 3]
+    assert records[0] == {"id": 1, "last_name": "Фамилия1", "first_name": "Имя1",
+                          "patronymic": "Отчество1", "experience": 1}
+
+
+def test_import_reports_errors_by_line(model, fetch):
+    model.save_many(make_records(2))
+    body = b"\n".join([
+        ndjson(driver(10)).strip(),
+        b"{not json",
+        b"",  # Пустые строки пропускаются, но учитываются в нумерации
+        ndjson(driver(11, experience=-1)).strip(),
+        '{"last_name": "\xff"}'.encode("latin-1"),
+        ndjson(driver(12, id=1)).strip(),
+        ndjson([1, 2]).strip(),
+        ndjson(driver(13, first_name=" ")).strip(),
+    ])
+    response, data = fetch("POST", "/api/drivers", body=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status == 200
+    result = json.loads(data)
+    assert result["saved"] == 2
+    assert result["failed"] == 5
+    errors = {error["line"]: error["error"] for error in result["errors"]}
+    assert list(errors) == [2, 4, 5, 7, 8]
+    assert errors[2].startswith("Некорректный JSON")
+    assert "отрицательным" in errors[4]
+    assert errors[5].startswith("Некорректная кодировка UTF-8")
+    assert "JSON-объектом" in errors[7]
+    assert "first_name" in errors[8]
+    assert model.get_record_by_id(1)["LastName"] == "Фамилия12"  # Запись с id заменена
+    assert model.get_record_by_id(3)["LastName"] == "Фамилия10"
+
+
+def test_chunked_import_across_batches(model, connect, monkeypatch):
+    monkeypatch.setattr(Controller, "IMPORT_BATCH_SIZE", 2)
+    body = ndjson(*(driver(i) for i in range(5)))
+    # Куски режут строки посередине
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    connection = connect()
+    connection.request("POST", "/api/drivers", body=iter(chunks), encode_chunked=True,
+                       headers={"Transfer-Encoding": "chunked"})
+    response = connection.getresponse()
+    assert json.loads(response.read()) == {"saved": 5, "failed": 0, "errors": []}
+    assert [record[1] for record in model.get_all_records()] == [f"Фамилия{i}" for i in range(5)]
+    # Подключение остаётся открытым
+    connection.request("GET", "/api/drivers")
+    assert connection.getresponse().read().count(b"\n") == 5
+
+
+def test_out_of_range_numbers_are_line_errors(model, fetch):
+    body = ndjson(driver(1), driver(2, id=2 ** 63), driver(3, experience=2 ** 64), driver(4, id=2 ** 63 - 1))
+    response, data = fetch("POST", "/api/drivers", body=body)
+    assert response.status == 200
+    result = json.loads(data)
+    assert result["saved"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+    assert model.get_record_by_id(2 ** 63 - 1) is not None
+
+
+def test_save_many_reports_overflow_per_record(model):
+    records = [(None, "А", "Б", "", 1), (None, "В", "Г", "", 2 ** 64), (None, "Д", "Е", "", 3)]
+    assert [i for i, _ in model.save_many(records)] == [1]
+    assert [record[1] for record in model.get_all_records()] == ["А", "Д"]
+
+
+@pytest.mark.parametrize("length", [b"-5", b"abc"])
+def test_import_with_bad_length_is_rejected(server, length):
+    with socket.create_connection(server.server_address, timeout=10) as connection:
+        connection.sendall(b"POST /api/drivers HTTP/1.1\r\nHost: test\r\nContent-Length: " + length + b"\r\n\r\n")
+        data = b""
+        while chunk := connection.recv(65536):
+            data += chunk
+    assert data.startswith(b"HTTP/1.1 400")
+    assert "Content-Length".encode() in data
+
+
+def test_import_without_length_is_rejected(server):
+    with socket.create_connection(server.server_address, timeout=10) as connection:
+        connection.sendall(b"POST /api/drivers HTTP/1.1\r\nHost: test\r\n\r\n")
+        data = connection.recv(65536)
+    assert data.startswith(b"HTTP/1.1 411")
+
+
+def test_truncated_body_is_rejected(server):
+    with socket.create_connection(server.server_address, timeout=10) as connection:
+        connection.sendall(b"POST /api/drivers HTTP/1.1\r\nHost: test\r\nContent-Length: 1000\r\n\r\n"
+                           + ndjson(driver(1)))
+        connection.shutdown(socket.SHUT_WR)
+        data = b""
+        while chunk := connection.recv(65536):
+            data += chunk
+    assert data.startswith(b"HTTP/1.1 400")
+
+
+def test_database_error_is_json_500(model, fetch, monkeypatch):
+    def save_many(self, records):
+        raise RuntimeError("диск заполнен")
+
+    monkeypatch.setattr(Model, "save_many", save_many)
+    response, data = fetch("POST", "/api/drivers", body=ndjson(driver(1)))
+    assert response.status == 500
+    assert response.getheader("Content-type") == "application/json"
+    assert "диск заполнен" in json.loads(data)["error"]
+
+
+@pytest.mark.parametrize("line, message", [
+    ('{"last_name": "А", "first_name": "Б", "experience": "5"}', "experience"),
+    ('{"id": 0, "last_name": "А", "first_name": "Б", "experience": 5}', "id"),
+    ('{"id": true, "last_name": "А", "first_name": "Б", "experience": 5}', "id"),
+    ('{"last_name": "А", "first_name": "Б", "patronymic": 1, "experience": 5}', "patronymic"),
+])
+def test_parse_driver_validation(line, message):
+    with pytest.raises(ValueError, match=message):
+        Controller._parse_driver(line)
+
+
+def test_parse_driver_defaults():
+    assert Controller._parse_driver(b'{"last_name": "\xd0\x90", "first_name": "B", "experience": 0}') == \
+        (None, "А", "B", "", 0)
@@ -0,0 +1,72 @@
+import gzip
+import zlib
+
+import pytest
+
+from conftest import make_records
+
+
+@pytest.fixture
+def records(model):
+    model.save_many(make_records(60))
+
+
+def test_large_page_is_compressed(records, fetch):
+    plain, plain_body = fetch("GET", "/")
+    assert plain.getheader("Content-Encoding") is None
+    response, body = fetch("GET", "/", headers={"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert int(response.getheader("Content-Length")) == len(body) < len(plain_body)
+    assert gzip.decompress(body) == plain_body
+    assert response.getheader("ETag") == plain.getheader("ETag")[:-1] + '-gzip"'
+
+
+@pytest.mark.parametrize("header, encoding", [
+    ("deflate", "deflate"),
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0, deflate", "deflate"),
+    ("deflate;q=0.5, gzip;q=0.4", "deflate"),
+    ("*", "gzip"),
+    ("*;q=0.1, gzip;q=0", "deflate"),
+    ("identity", None),
+    ("br", None),
+    ("gzip;q=bad", None),
+])
+def test_negotiation(records, fetch, header, encoding):
+    response, body = fetch("GET", "/", headers={"Accept-Encoding": header})
+    assert response.getheader("Content-Encoding") == encoding
+    if encoding == "deflate":
+        assert zlib.decompress(body).endswith(b"</html>\n")
+
+
+def test_small_page_is_not_compressed(records, fetch):
+    plain = fetch("GET", "/details/1")[0]
+    response, body = fetch("GET", "/details/1", headers={"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") is None
+    assert response.getheader("ETag") == plain.getheader("ETag")  # Тело то же, что и без сжатия
+    assert fetch("GET", "/details/1", headers={"Accept-Encoding": "gzip",
+                                                "If-None-Match": plain.getheader("ETag")})[0].status == 304
+
+
+def test_etag_depends_on_encoding(records, fetch):
+    etag = fetch("GET", "/", headers={"Accept-Encoding": "gzip"})[0].getheader("ETag")
+    assert fetch("GET", "/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})[0].status == 304
+    # Клиент без сжатия не может использовать сохранённое сжатое тело
+    assert fetch("GET", "/", headers={"If-None-Match": etag})[0].status == 200
+
+
+def test_streamed_list_is_compressed(model, fetch):
+    model.save_many(make_records(2000))
+    plain = fetch("GET", "/?all=1")[1]
+    response, body = fetch("GET", "/?all=1", headers={"Accept-Encoding": "gzip"})
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("ETag").endswith('-gzip"')
+    assert gzip.decompress(body) == plain
+
+
+def test_ndjson_export_is_compressed(records, fetch):
+    response, body = fetch("GET", "/api/drivers", headers={"Accept-Encoding": "deflate"})
+    assert response.getheader("Content-Encoding") == "deflate"
+    assert zlib.decompress(body).count(b"\n") == 60
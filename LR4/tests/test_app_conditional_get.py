@@ -0,0 +1,55 @@
+import app
+from conftest import make_records
+
+
+def test_not_modified_until_data_changes(model, fetch):
+    model.save_many(make_records(3))
+    response, body = fetch("GET", "/details/1")
+    etag = response.getheader("ETag")
+    assert response.status == 200 and etag
+    assert response.getheader("Cache-Control") == "no-cache"
+
+    response, body = fetch("GET", "/details/1", headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+    assert response.getheader("ETag") == etag
+
+    # Изменение из другого подключения меняет версию данных
+    model.update_record(2, "Новая", "Имя", "", 1)
+    response, body = fetch("GET", "/details/1", headers={"If-None-Match": etag})
+    assert response.status == 200
+    assert response.getheader("ETag") != etag
+
+
+def test_if_none_match_lists(model, fetch):
+    model.save_many(make_records(1))
+    etag = fetch("GET", "/")[0].getheader("ETag")
+    for header in (f'"other", W/{etag}', "*"):
+        assert fetch("GET", "/", headers={"If-None-Match": header})[0].status == 304
+    assert fetch("GET", "/", headers={"If-None-Match": '"other"'})[0].status == 200
+
+
+def test_rendered_page_is_cached_per_version(model, fetch):
+    model.save_many(make_records(1))
+    fetch("GET", "/details/1")
+    version = model.get_version()
+    assert app.RequestHandler.page_cache.get("/details/1", version) is not None
+    model.delete_record(1)
+    assert app.RequestHandler.page_cache.get("/details/1", model.get_version()) is None
+    assert "Фамилия1" not in fetch("GET", "/details/1")[1].decode()
+
+
+def test_streamed_list_is_conditional(model, fetch):
+    model.save_many(make_records(5))
+    etag = fetch("GET", "/?all=1")[0].getheader("ETag")
+    response, body = fetch("GET", "/?all=1", headers={"If-None-Match": etag})
+    assert response.status == 304 and body == b""
+
+
+def test_page_cache_is_bounded():
+    cache = app.PageCache(max_size=2)
+    for path in ("/a", "/b", "/c"):
+        cache.put(path, 1, {None: path.encode()})
+    assert cache.get("/a", 1) is None
+    assert cache.get("/c", 1) == {None: b"/c"}
+    assert cache.get("/c", 2) is None
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+import app
+import metrics
+from conftest import make_records
+
+
+def wait_for(condition, timeout=2.0):
+    # Запрос замеряется после отправки ответа: клиент может получить его раньше
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("path, route", [
+    ("/", "/"),
+    ("/?page=2", "/"),
+    ("/details/15", "/details/<id>"),
+    ("/delete/abc", "/delete/<id>"),
+    ("/api/drivers", "/api/drivers"),
+    ("/favicon.ico", "other"),
+    ("/details", "other"),
+])
+def test_route_name(path, route):
+    assert app.route_name(path) == route
+
+
+def test_metrics_endpoint(model, fetch):
+    model.save_many(make_records(2))
+    fetch("GET", "/details/1")
+    fetch("GET", "/nowhere")
+    assert wait_for(lambda: app.HTTP_REQUEST_SECONDS.totals("GET", "other", "404")[1] > 0)
+    response, body = fetch("GET", "/metrics")
+    assert response.status == 200
+    assert response.getheader("Content-type") == metrics.CONTENT_TYPE
+    text = body.decode()
+    assert 'http_request_duration_seconds_count{method="GET",route="/details/<id>",status="200"}' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="other",status="404"}' in text
+    assert 'driver_operation_seconds_count{component="Model",operation="get_record_by_id"}' in text
+    assert 'driver_operation_seconds_count{component="View",operation="render_template"}' in text
+
+
+def test_streamed_response_is_timed_to_the_end(model, fetch):
+    model.save_many(make_records(50))
+    before = app.HTTP_REQUEST_SECONDS.totals("GET", "/", "200")[1]
+    fetch("GET", "/?all=1")
+    assert wait_for(lambda: app.HTTP_REQUEST_SECONDS.totals("GET", "/", "200")[1] == before + 1)
+    # Обход курсора замерен как один вызов iter_records
+    assert metrics.OPERATION_SECONDS.totals("Model", "iter_records")[1] >= 1
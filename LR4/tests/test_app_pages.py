@@ -0,0 +1,61 @@
+import re
+import socket
+
+from conftest import make_records
+
+
+def record_ids(body):
+    return [int(i) for i in re.findall(r"<tr><td>(\d+)</td>", body.decode())]
+
+
+def test_index_is_paginated(model, fetch):
+    model.save_many(make_records(25))
+    response, body = fetch("GET", "/?size=10")
+    assert response.status == 200
+    assert record_ids(body) == list(range(1, 11))
+    assert "/?page=2&size=10&after=10" in body.decode()
+    assert record_ids(fetch("GET", "/?page=2&size=10&after=10")[1]) == list(range(11, 21))
+    # Переход по номеру страницы без after
+    assert record_ids(fetch("GET", "/?page=3&size=10")[1]) == list(range(21, 26))
+    assert "Вперёд" not in fetch("GET", "/?page=3&size=10")[1].decode()
+
+
+def test_page_size_is_limited(model, fetch):
+    model.save_many(make_records(3))
+    assert record_ids(fetch("GET", "/?size=0")[1]) == [1]
+    assert record_ids(fetch("GET", "/?page=9&size=10")[1]) == []
+
+
+def test_full_list_is_streamed(model, fetch):
+    model.save_many(make_records(1200))
+    response, body = fetch("GET", "/?all=1")
+    assert response.status == 200
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert response.getheader("Content-Length") is None
+    assert record_ids(body) == list(range(1, 1201))
+    assert body.decode().rstrip().endswith("</html>")
+
+
+def test_all_flag_values(model, fetch):
+    model.save_many(make_records(60))
+    assert len(record_ids(fetch("GET", "/?all=TRUE")[1])) == 60
+    for value in ("0", "false", ""):
+        response, body = fetch("GET", f"/?all={value}")
+        assert response.getheader("Transfer-Encoding") is None
+        assert len(record_ids(body)) == 50
+
+
+def test_http_10_stream_ends_with_connection(model, server):
+    model.save_many(make_records(5))
+    with socket.create_connection(server.server_address, timeout=10) as connection:
+        connection.sendall(b"GET /?all=1 HTTP/1.0\r\n\r\n")
+        data = b""
+        while chunk := connection.recv(65536):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding" not in head
+    assert record_ids(body) == [1, 2, 3, 4, 5]
+
+
+def test_invalid_page_parameters(fetch):
+    assert fetch("GET", "/?page=x")[0].status == 400
@@ -0,0 +1,69 @@
+import socket
+import threading
+
+from conftest import make_records
+
+
+def test_keep_alive_serves_several_requests(model, connect):
+    model.save_many(make_records(3))
+    connection = connect()
+    for path in ("/", "/details/1", "/details/2", "/add"):
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        assert response.getheader("Connection") != "close"
+
+
+def test_requests_are_served_concurrently(model, server, connect):
+    model.save_many(make_records(20))
+    # Незавершённый запрос в одном подключении не мешает другим
+    idle = socket.create_connection(server.server_address)
+    idle.sendall(b"GET / HTTP/1.1\r\nHost: test\r\n")
+    statuses = []
+
+    def fetch():
+        connection = connect()
+        connection.request("GET", "/")
+        response = connection.getresponse()
+        response.read()
+        statuses.append(response.status)
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    idle.close()
+    assert statuses == [200] * 8
+
+
+def test_each_thread_has_own_connection(model, fetch):
+    model.save_many(make_records(1))
+    seen = set()
+    original = type(model).get_version
+
+    def get_version(self):
+        seen.add(id(self.connection))
+        return original(self)
+
+    type(model).get_version = get_version
+    try:
+        for _ in range(3):
+            assert fetch("GET", "/details/1")[0].status == 200
+    finally:
+        type(model).get_version = original
+    assert len(seen) == 3  # Каждое подключение обслуживается своим потоком со своей Model
+
+
+def test_malformed_content_length_closes_connection(server):
+    for header in (b"Content-Length: abc\r\n", b"Content-Length: -5\r\n", b""):
+        with socket.create_connection(server.server_address, timeout=10) as connection:
+            connection.sendall(b"POST /add HTTP/1.1\r\nHost: test\r\n" + header + b"\r\n"
+                               b"GET / HTTP/1.1\r\nHost: test\r\n\r\n")
+            data = b""
+            while chunk := connection.recv(65536):
+                data += chunk
+        assert data.startswith(b"HTTP/1.1 400")
+        assert "Content-Length".encode() in data
+        assert data.count(b"HTTP/1.1 ") == 1  # Второй запрос не обрабатывается как продолжение тела
@@ -0,0 +1,94 @@
+import pytest
+
+from conftest import make_records
+
+NAMES = [
+    (1, "Иванов", "Пётр", "Сергеевич", 5),
+    (2, "Петров", "Иван", "Иванович", 3),
+    (3, "Иванова", "Анна", "Петровна", 7),
+    (4, "Сидоров", "Семён", "Иванович", 1),
+    (5, "Фёдоров", "Алексей", "", 10),
+    (6, "Ивановский", "Олег", "Олегович", 2),
+]
+
+
+@pytest.fixture(params=["fts", "like"])
+def names(request, model):
+    model.save_many(NAMES)
+    if request.param == "like":
+        model.full_text = False  # Как при сборке SQLite без FTS5
+    return model
+
+
+def ids(records):
+    return [record[0] for record in records]
+
+
+def test_full_text_index_is_available(model):
+    assert model.full_text
+
+
+def test_tiers(model):
+    model.save_many(NAMES)
+    # Фамилия целиком, начало фамилии, затем остальные поля
+    assert ids(model.search_records("иванов")) == [1, 3, 6, 2, 4]
+    assert ids(model.search_records("иванов", limit=2)) == [1, 3]
+
+
+def test_like_fallback_orders_by_id(model):
+    model.save_many(NAMES)
+    model.full_text = False
+    assert ids(model.search_records("иванов")) == [1, 2, 3, 4, 6]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("ИВАН", {1, 2, 3, 4, 6}),
+    ("пет", {1, 2, 3}),
+    ("федоров", {5}),
+    ("Фёд", {5}),
+    ("семен", {4}),
+    ("иван сем", {4}),
+    ("сем иван", {4}),
+    ("олег", {6}),
+    ("ов", set()),
+    ("", set()),
+    ("  ,. ", set()),
+])
+def test_every_word_is_a_prefix(names, query, expected):
+    assert set(ids(names.search_records(query))) == expected
+
+
+def test_index_follows_writes(names):
+    names.update_record(5, "Фролов", "Алексей", "", 10)
+    assert ids(names.search_records("федоров")) == []
+    assert ids(names.search_records("фролов")) == [5]
+    names.delete_record(1)
+    names.add_record("Ёлкин", "Иван", "", 1)
+    assert ids(names.search_records("елкин")) == [7]
+    assert 1 not in ids(names.search_records("иванов"))
+
+
+def test_limit_must_be_positive(model):
+    with pytest.raises(ValueError):
+        model.search_records("иван", limit=0)
+
+
+def test_search_page(model, fetch):
+    model.save_many(NAMES + make_records(60)[10:])
+    body = fetch("GET", "/search?q=%D0%B8%D0%B2%D0%B0%D0%BD%D0%BE%D0%B2")[1].decode()
+    assert "Найдено: 5" in body
+    assert body.index("<td>Иванов</td>") < body.index("<td>Иванова</td>") < body.index("<td>Петров</td>")
+    assert "Ничего не найдено" in fetch("GET", "/search?q=zzz")[1].decode()
+    assert "Фамилия" in fetch("GET", "/search?q=%D1%84%D0%B0%D0%BC")[1].decode()
+    assert "(показаны первые 50)" in fetch("GET", "/search?q=%D1%84%D0%B0%D0%BC")[1].decode()
+
+
+def test_search_query_is_escaped(fetch):
+    body = fetch("GET", "/search?q=%3Cscript%3E")[1].decode()
+    assert "<script>" not in body
+    assert "&lt;script&gt;" in body
+
+
+def test_null_patronymic_is_searchable(names):
+    names.save_many([(7, "Лебедев", "Ёжик", None, 1)])
+    assert ids(names.search_records("лебедев ежик")) == [7]
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from view import View
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    monkeypatch.setattr(View, "_templates", {})
+    monkeypatch.setattr(View, "_template_path", staticmethod(lambda name: str(tmp_path / name)))
+    path = tmp_path / "page.html"
+    path.write_text("<h1>{{ title }}</h1>{{ body }}{{ missing }}", encoding="utf-8")
+    return path
+
+
+def test_render_substitutes_known_names(template):
+    assert View.render_template("page.html", title="Т", body=5) == "<h1>Т</h1>5{{ missing }}"
+
+
+def test_values_are_not_substituted_again(template):
+    assert View.render_template("page.html", title="{{ body }}", body="x") == "<h1>{{ body }}</h1>x{{ missing }}"
+
+
+def test_template_is_compiled_once(template, monkeypatch):
+    View.render_template("page.html")
+
+    def reopen(*args, **kwargs):
+        pytest.fail("шаблон прочитан повторно")
+
+    monkeypatch.setattr("builtins.open", reopen)
+    assert View.render_template("page.html", title="снова") == "<h1>снова</h1>{{ body }}{{ missing }}"
+
+
+def test_changed_template_is_reloaded(template):
+    View.render_template("page.html", title="a")
+    template.write_text("<p>{{ title }}</p>", encoding="utf-8")
+    stat = os.stat(template)
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert View.render_template("page.html", title="a") == "<p>a</p>"
+
+
+def test_stream_matches_render(template):
+    rows = iter(["<tr>1</tr>", "<tr>2</tr>"])
+    streamed = "".join(View.stream_template("page.html", title="T", body=rows))
+    assert streamed == View.render_template("page.html", title="T", body="<tr>1</tr><tr>2</tr>")
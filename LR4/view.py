@@ -1,16 +1,62 @@
 import os
+import re
+import threading
+from metrics import instrument
+
+# Подстановка в шаблоне: {{ имя }}
+PLACEHOLDER = re.compile(r"\{\{ (\w+) \}\}")
+
 
 class View:
+    # Скомпилированные шаблоны: путь -> (mtime файла, литералы, имена подстановок)
+    _templates = {}
+    _lock = threading.Lock()
+
     @staticmethod
-    def render_template(template_name, **kwargs):
+    def _template_path(template_name):
         # Определяем абсолютный путь к файлу шаблона
         base_path = os.path.dirname(__file__)
-        template_path = os.path.join(base_path, "templates", template_name)
-        
-        # Открываем файл шаблона
-        with open(template_path, "r", encoding="utf-8") as file:
-            html = file.read()
-            # Заменяем переменные в шаблоне
-            for key, value in kwargs.items():
-                html = html.replace(f"{{{{ {key} }}}}", str(value))
-        return html
+        return os.path.join(base_path, "templates", template_name)
+
+    @classmethod
+    def compile_template(cls, template_name):
+        """Шаблон, разобранный на литералы и подстановки; перечитывается только при изменении файла"""
+        template_path = cls._template_path(template_name)
+        mtime = os.stat(template_path).st_mtime_ns
+        compiled = cls._templates.get(template_path)
+        if compiled is None or compiled[0] != mtime:
+            with open(template_path, "r", encoding="utf-8") as file:
+                html = file.read()
+            # split с группой даёт [литерал, имя, литерал, имя, ..., литерал]
+            parts = PLACEHOLDER.split(html)
+            compiled = (mtime, parts[0::2], parts[1::2])
+            with cls._lock:
+                cls._templates[template_path] = compiled
+        return compiled[1], compiled[2]
+
+    @staticmethod
+    def render_template(template_name, **kwargs):
+        literals, names = View.compile_template(template_name)
+        # Заменяем переменные в шаблоне; неизвестные подстановки остаются как есть
+        parts = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            parts.append(str(kwargs[name]) if name in kwargs else f"{{{{ {name} }}}}")
+            parts.append(literal)
+        return "".join(parts)
+
+    @staticmethod
+    def stream_template(template_name, **kwargs):
+        """Шаблон по частям: значения-итераторы (например, строки таблицы из курсора) выдаются по мере получения"""
+        literals, names = View.compile_template(template_name)
+        yield literals[0]
+        for name, literal in zip(names, literals[1:]):
+            if name not in kwargs:
+                yield f"{{{{ {name} }}}}"
+            elif isinstance(kwargs[name], str) or not hasattr(kwargs[name], "__iter__"):
+                yield str(kwargs[name])
+            else:
+                yield from kwargs[name]
+            yield literal
+
+
+instrument(View)  # Замер времени всех открытых методов